@@ -0,0 +1,72 @@
+"""Alembic environment — runs migrations against the app's configured database."""
+
+from logging.config import fileConfig
+
+from alembic import context
+from sqlalchemy import engine_from_config, pool
+
+from app.config import get_settings
+from app.database import Base
+from app.models import status_event, task, task_change, time_entry, user  # noqa: F401 — register tables on Base.metadata
+
+config = context.config
+
+if config.config_file_name is not None and config.attributes.get("configure_logger", True):
+    fileConfig(config.config_file_name)
+
+if not config.get_main_option("sqlalchemy.url"):
+    config.set_main_option("sqlalchemy.url", get_settings().DATABASE_URL.replace("%", "%%"))
+
+target_metadata = Base.metadata
+
+
+# Full-text search objects created by raw DDL (see app.models.task)
+UNMAPPED_SEARCH_OBJECTS = {"search_vector", "ix_tasks_search"}
+
+
+def include_object(obj, name, type_, reflected, compare_to):
+    """Skip dialect-specific objects (e.g. PostgreSQL partial indexes) elsewhere."""
+    if reflected and compare_to is None and (
+        name in UNMAPPED_SEARCH_OBJECTS or name.startswith("tasks_fts")
+    ):
+        return False
+    dialect = obj.info.get("dialect") if hasattr(obj, "info") else None
+    return dialect is None or dialect == context.get_context().dialect.name
+
+
+def run_migrations_offline() -> None:
+    """Emit SQL to stdout instead of connecting (alembic upgrade --sql)."""
+    context.configure(
+        url=config.get_main_option("sqlalchemy.url"),
+        target_metadata=target_metadata,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+        render_as_batch=True,
+        include_object=include_object,
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online() -> None:
+    connectable = engine_from_config(
+        config.get_section(config.config_ini_section, {}),
+        prefix="sqlalchemy.",
+        poolclass=pool.NullPool,
+    )
+    with connectable.connect() as connection:
+        # Batch mode lets ALTER-style operations work on SQLite
+        context.configure(
+            connection=connection,
+            target_metadata=target_metadata,
+            render_as_batch=True,
+            include_object=include_object,
+        )
+        with context.begin_transaction():
+            context.run_migrations()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
@@ -0,0 +1,57 @@
+"""Composite indexes for the hot task query shapes
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-17 10:00:00
+
+- (assignee_id, created_at, id): list_tasks?assignee_id=… ordered newest first,
+  the assignee side of the daily-plan OR, and the top-users grouping.
+- (status, created_at, id): list_tasks?status=… ordered newest first.
+- (created_at, id): the unfiltered listing and its keyset cursor.
+- (created_by): the creator side of the daily-plan OR.
+- PostgreSQL only: partial (assignee_id, created_at, id) over tasks that are not
+  done — boards and daily plans almost only look at open work.
+
+The single-column status/assignee indexes are prefixes of the new composites
+and are dropped to keep write amplification flat.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0002"
+down_revision: Union[str, None] = "0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_tasks_assignee_created", "tasks", ["assignee_id", "created_at", "id"])
+    op.create_index("ix_tasks_status_created", "tasks", ["status", "created_at", "id"])
+    op.create_index("ix_tasks_created_at_id", "tasks", ["created_at", "id"])
+    op.create_index("ix_tasks_created_by", "tasks", ["created_by"])
+    op.drop_index("ix_tasks_status", table_name="tasks")
+    op.drop_index("ix_tasks_assignee_id", table_name="tasks")
+
+    if op.get_bind().dialect.name == "postgresql":
+        op.create_index(
+            "ix_tasks_open_assignee_created",
+            "tasks",
+            ["assignee_id", "created_at", "id"],
+            postgresql_where=sa.text("status <> 'DONE'"),
+        )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == "postgresql":
+        op.drop_index("ix_tasks_open_assignee_created", table_name="tasks")
+
+    op.create_index("ix_tasks_assignee_id", "tasks", ["assignee_id"])
+    op.create_index("ix_tasks_status", "tasks", ["status"])
+    op.drop_index("ix_tasks_created_by", table_name="tasks")
+    op.drop_index("ix_tasks_created_at_id", table_name="tasks")
+    op.drop_index("ix_tasks_status_created", table_name="tasks")
+    op.drop_index("ix_tasks_assignee_created", table_name="tasks")
@@ -0,0 +1,74 @@
+"""Time-entry ledger and per-user daily rollups
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-17 11:00:00
+
+- time_entries: one row per log-time call (task, user, minutes, logged_at).
+- user_daily_minutes: minutes and entry counts per (UTC day, user), kept
+  current on every ledger insert; /stats/top-users reads only this table.
+
+Existing databases have no history, only ``tasks.total_minutes``. The upgrade
+seeds the ledger with one entry per task holding its current total, credited
+to the assignee (or the creator) at the task's ``updated_at``, then builds
+the rollups from it. Later repairs: ``python scripts/rebuild_time_rollups.py``.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0003"
+down_revision: Union[str, None] = "0002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "time_entries",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("task_id", sa.Integer(), nullable=True),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("minutes", sa.Integer(), nullable=False),
+        sa.Column("logged_at", sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(["task_id"], ["tasks.id"], ondelete="SET NULL"),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_time_entries_user_logged", "time_entries", ["user_id", "logged_at"])
+    op.create_index("ix_time_entries_task", "time_entries", ["task_id"])
+
+    op.create_table(
+        "user_daily_minutes",
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("minutes", sa.Integer(), nullable=False),
+        sa.Column("entry_count", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("day", "user_id"),
+    )
+
+    op.execute(
+        "INSERT INTO time_entries (task_id, user_id, minutes, logged_at) "
+        "SELECT id, COALESCE(assignee_id, created_by), total_minutes, "
+        "COALESCE(updated_at, created_at, CURRENT_TIMESTAMP) "
+        "FROM tasks WHERE total_minutes > 0"
+    )
+    day = "date(logged_at)"
+    if op.get_bind().dialect.name == "postgresql":
+        day = "date(timezone('UTC', logged_at))"
+    op.execute(
+        "INSERT INTO user_daily_minutes (day, user_id, minutes, entry_count) "
+        f"SELECT {day}, user_id, SUM(minutes), COUNT(id) "
+        f"FROM time_entries GROUP BY {day}, user_id"
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("user_daily_minutes")
+    op.drop_index("ix_time_entries_task", table_name="time_entries")
+    op.drop_index("ix_time_entries_user_logged", table_name="time_entries")
+    op.drop_table("time_entries")
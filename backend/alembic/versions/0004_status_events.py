@@ -0,0 +1,68 @@
+"""Task status history and cycle-time sketch counters
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-17 12:00:00
+
+- task_status_events: one row per accepted transition (plus one per task for
+  its initial status), indexed (task_id, id) for the latest-event lookup.
+- cycle_time_buckets: per-(status, bucket) counters of the time-in-status
+  quantile sketch behind /stats/cycle-time.
+
+Existing tasks get a single event for their current status, dated at their
+``updated_at``, so their next transition has a starting point.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0004"
+down_revision: Union[str, None] = "0003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# The type already exists on PostgreSQL (revision 0001)
+task_status = sa.Enum("TODO", "IN_PROGRESS", "REVIEW", "DONE", name="taskstatus").with_variant(
+    postgresql.ENUM(name="taskstatus", create_type=False), "postgresql"
+)
+
+
+def upgrade() -> None:
+    op.create_table(
+        "task_status_events",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("task_id", sa.Integer(), nullable=False),
+        sa.Column("from_status", task_status, nullable=True),
+        sa.Column("to_status", task_status, nullable=False),
+        sa.Column("changed_by", sa.Integer(), nullable=True),
+        sa.Column("occurred_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("duration_seconds", sa.Float(), nullable=True),
+        sa.ForeignKeyConstraint(["task_id"], ["tasks.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["changed_by"], ["users.id"], ondelete="SET NULL"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_task_status_events_task_id", "task_status_events", ["task_id", "id"])
+
+    op.create_table(
+        "cycle_time_buckets",
+        sa.Column("status", task_status, nullable=False),
+        sa.Column("bucket", sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column("count", sa.Integer(), nullable=False),
+        sa.Column("total_seconds", sa.Float(), nullable=False),
+        sa.PrimaryKeyConstraint("status", "bucket"),
+    )
+
+    op.execute(
+        "INSERT INTO task_status_events (task_id, to_status, occurred_at) "
+        "SELECT id, status, COALESCE(updated_at, created_at, CURRENT_TIMESTAMP) FROM tasks"
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("cycle_time_buckets")
+    op.drop_index("ix_task_status_events_task_id", table_name="task_status_events")
+    op.drop_table("task_status_events")
@@ -0,0 +1,48 @@
+"""Full-text search index over task titles and descriptions
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-17 13:00:00
+
+- SQLite: external-content FTS5 table ``tasks_fts`` plus insert/update/delete
+  triggers on ``tasks``, then a one-off rebuild from existing rows.
+- PostgreSQL: generated ``tasks.search_vector`` (title weighted A, description
+  B) with the GIN index ``ix_tasks_search``; existing rows are computed by the
+  ALTER itself.
+
+The DDL lives in ``app.models.task`` so ``create_all`` builds the same index.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+from app.models.task import POSTGRES_SEARCH_DDL, SQLITE_SEARCH_DDL
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0005"
+down_revision: Union[str, None] = "0004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    if dialect == "sqlite":
+        for statement in SQLITE_SEARCH_DDL:
+            op.execute(statement)
+        op.execute("INSERT INTO tasks_fts(tasks_fts) VALUES ('rebuild')")
+    elif dialect == "postgresql":
+        for statement in POSTGRES_SEARCH_DDL:
+            op.execute(statement)
+
+
+def downgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    if dialect == "sqlite":
+        for trigger in ("tasks_fts_ai", "tasks_fts_ad", "tasks_fts_au"):
+            op.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+        op.execute("DROP TABLE IF EXISTS tasks_fts")
+    elif dialect == "postgresql":
+        op.execute("DROP INDEX IF EXISTS ix_tasks_search")
+        op.execute("ALTER TABLE tasks DROP COLUMN IF EXISTS search_vector")
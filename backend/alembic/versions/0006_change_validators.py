@@ -0,0 +1,42 @@
+"""Change validators for ETags: users.updated_at and a tasks.updated_at index
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-17 14:00:00
+
+- users.updated_at, backfilled from created_at, so the user directory can
+  derive its ETag from ``max(updated_at)``.
+- ix_tasks_updated_at so ``max(tasks.updated_at)`` is a single index probe.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0006"
+down_revision: Union[str, None] = "0005"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Batch mode: SQLite cannot ADD COLUMN with a CURRENT_TIMESTAMP default
+    with op.batch_alter_table("users") as batch_op:
+        batch_op.add_column(
+            sa.Column(
+                "updated_at",
+                sa.DateTime(timezone=True),
+                server_default=sa.func.now(),
+                nullable=True,
+            )
+        )
+    op.execute("UPDATE users SET updated_at = created_at WHERE created_at IS NOT NULL")
+    op.create_index("ix_tasks_updated_at", "tasks", ["updated_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_tasks_updated_at", table_name="tasks")
+    with op.batch_alter_table("users") as batch_op:
+        batch_op.drop_column("updated_at")
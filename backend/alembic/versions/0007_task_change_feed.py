@@ -0,0 +1,46 @@
+"""Task change feed
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-17 15:00:00
+
+- task_changes: monotonic ``seq`` (AUTOINCREMENT on SQLite, so numbers are
+  never reused), task_id, op (create/update/delete), changed_at. Seeded with
+  one ``create`` per existing task so a replay from the start is complete.
+- The task list ETag now comes from ``max(task_changes.seq)``, a primary-key
+  probe, so ix_tasks_updated_at (revision 0006) is dropped again.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0007"
+down_revision: Union[str, None] = "0006"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "task_changes",
+        sa.Column("seq", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("task_id", sa.Integer(), nullable=False),
+        sa.Column("op", sa.String(length=10), nullable=False),
+        sa.Column("changed_at", sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint("seq"),
+        sqlite_autoincrement=True,
+    )
+    op.execute(
+        "INSERT INTO task_changes (task_id, op, changed_at) "
+        "SELECT id, 'create', COALESCE(updated_at, created_at, CURRENT_TIMESTAMP) "
+        "FROM tasks ORDER BY id"
+    )
+    op.drop_index("ix_tasks_updated_at", table_name="tasks")
+
+
+def downgrade() -> None:
+    op.create_index("ix_tasks_updated_at", "tasks", ["updated_at"])
+    op.drop_table("task_changes")
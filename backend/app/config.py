@@ -9,11 +9,48 @@ class Settings(BaseSettings):
 
     # Database
     DATABASE_URL: str = "sqlite:///./sprintsync.db"
+    # asyncio URL used by request handlers; derived from DATABASE_URL when empty
+    ASYNC_DATABASE_URL: str = ""
+    # Optional read replica for read-only routes; empty = read from primary
+    DATABASE_READ_URL: str = ""
+    READ_AFTER_WRITE_PIN_SECONDS: float = 5.0  # keep a writer's reads on primary
+    SQL_ECHO: bool = False  # log every statement (slow; debugging only)
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT: float = 30.0  # seconds to wait for a free connection
+    DB_POOL_RECYCLE: int = 1800  # seconds before a connection is replaced
+    DB_POOL_PRE_PING: bool = True
+    SQLITE_WAL: bool = True  # journal_mode=WAL + synchronous=NORMAL
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000
+    SQLITE_MMAP_SIZE: int = 268435456  # 256 MiB
 
     # Auth
     SECRET_KEY: str = "dev-secret-key-change-in-production"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 1440  # 24 hours
     ALGORITHM: str = "HS256"
+    PRINCIPAL_CACHE_SIZE: int = 1024
+    PRINCIPAL_CACHE_TTL_SECONDS: float = 60.0  # 0 disables the cache
+    TOKEN_CACHE_SIZE: int = 4096
+    TOKEN_CACHE_TTL_SECONDS: float = 300.0  # 0 disables the cache
+    HASH_WORKERS: int = 2  # bcrypt process pool size; 0 = single in-process thread
+    HASH_QUEUE_LIMIT: int = 32  # pending hash jobs before /auth returns 503
+
+    # Task stream (GET /tasks/stream)
+    TASK_STREAM_BACKEND: str = "memory"  # "memory" (one worker) or "polling" (many)
+    TASK_STREAM_POLL_SECONDS: float = 1.0  # polling backend: change-feed check interval
+    TASK_STREAM_HEARTBEAT_SECONDS: float = 15.0
+    TASK_STREAM_BUFFER_SIZE: int = 256  # pending tasks per subscriber before a reset
+
+    # Request metrics (/metrics)
+    METRICS_MAX_ROUTES: int = 200  # (method, route) series before folding into "<other>"
+    METRICS_DIR: str = ""  # shared by all workers on a node; empty = this process only
+    METRICS_FLUSH_SECONDS: float = 1.0  # how often each worker writes its counters there
+
+    # Idempotency-Key on task writes (in-process, per worker)
+    IDEMPOTENCY_CACHE_SIZE: int = 10000  # stored responses; least recently used evicted
+    IDEMPOTENCY_TTL_SECONDS: float = 86400.0  # 0 disables idempotency keys
+    IDEMPOTENCY_MAX_BODY_BYTES: int = 65536  # larger responses are not stored
+    IDEMPOTENCY_WAIT_SECONDS: float = 30.0  # how long a retry waits for the original
 
     # AI (Google Gemini)
     GOOGLE_API_KEY: str = ""
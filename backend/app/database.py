@@ -1,31 +1,312 @@
-"""Database engine, session, and base model configuration."""
+"""Database engine, session, and base model configuration.
 
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, declarative_base
+Request handlers use the asyncio engine (``get_db`` yields an ``AsyncSession``)
+so a single worker can hold many requests waiting on the database without
+tying up threadpool slots. The sync ``engine``/``SessionLocal`` pair is kept
+for scripts, migrations, seeding and test fixtures.
+
+An optional read replica (``DATABASE_READ_URL``) serves read-only routes
+through ``get_read_db``.
+"""
+
+import math
+import threading
+import time
+
+from typing import Optional
+
+from fastapi import Request, Response
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker, declarative_base
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
 from app.config import get_settings
+from app.services.cache import TTLCache
 
 settings = get_settings()
 
-# Use check_same_thread=False only for SQLite
-connect_args = {}
-if settings.DATABASE_URL.startswith("sqlite"):
-    connect_args["check_same_thread"] = False
+# asyncio drivers for each sync backend we support
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+}
 
-engine = create_engine(
-    settings.DATABASE_URL,
-    connect_args=connect_args,
-    echo=(settings.APP_ENV == "development"),
-)
+
+def to_async_url(url: str) -> str:
+    """Map a sync database URL onto its asyncio driver.
+
+    ``sqlite:///x.db`` → ``sqlite+aiosqlite:///x.db`` and
+    ``postgresql[+psycopg2]://…`` → ``postgresql+asyncpg://…``. URLs that
+    already name an async driver are returned unchanged.
+    """
+    parsed = make_url(url)
+    driver = ASYNC_DRIVERS.get(parsed.get_backend_name())
+    if driver is None or parsed.drivername in ASYNC_DRIVERS.values():
+        return url
+    return parsed.set(drivername=driver).render_as_string(hide_password=False)
+
+
+# --- Pool telemetry ---
+
+class PoolStats:
+    """Checkout wait-time counters for one connection pool."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.wait_sum = 0.0
+        self.wait_max = 0.0
+        self.timeouts = 0
+
+    def observe(self, wait: float, timed_out: bool = False) -> None:
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+                return
+            self.checkouts += 1
+            self.wait_sum += wait
+            self.wait_max = max(self.wait_max, wait)
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that records how long callers wait for a connection."""
+
+    stats: PoolStats
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.stats = PoolStats()
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            record = super()._do_get()
+        except Exception:
+            self.stats.observe(time.perf_counter() - start, timed_out=True)
+            raise
+        self.stats.observe(time.perf_counter() - start)
+        return record
+
+
+class InstrumentedAsyncAdaptedQueuePool(InstrumentedQueuePool, AsyncAdaptedQueuePool):
+    """asyncio flavour of ``InstrumentedQueuePool``."""
+
+
+def _is_sqlite_memory(url: str) -> bool:
+    parsed = make_url(url)
+    return parsed.get_backend_name() == "sqlite" and parsed.database in (None, "", ":memory:")
+
+
+def engine_options(url: str, is_async: bool = False) -> dict:
+    """create_engine keyword arguments for ``url`` built from settings."""
+    options = {"echo": settings.SQL_ECHO}
+    if make_url(url).get_backend_name() == "sqlite":
+        # Use check_same_thread=False only for SQLite
+        options["connect_args"] = {"check_same_thread": False}
+    if _is_sqlite_memory(url):
+        # In-memory SQLite is a single shared connection; pool sizing is moot
+        return options
+    options.update(
+        poolclass=InstrumentedAsyncAdaptedQueuePool if is_async else InstrumentedQueuePool,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+    )
+    return options
+
+
+def _apply_sqlite_pragmas(dbapi_connection, connection_record):
+    """Per-connection SQLite tuning: WAL lets readers run alongside a writer,
+    and busy_timeout makes writers wait instead of failing with
+    "database is locked"."""
+    cursor = dbapi_connection.cursor()
+    try:
+        if settings.SQLITE_WAL:
+            cursor.execute("PRAGMA journal_mode=WAL")
+            cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute(f"PRAGMA busy_timeout={int(settings.SQLITE_BUSY_TIMEOUT_MS)}")
+        cursor.execute(f"PRAGMA mmap_size={int(settings.SQLITE_MMAP_SIZE)}")
+    finally:
+        cursor.close()
+
+
+def configure_engine(sync_engine) -> None:
+    """Attach dialect-specific connection hooks to an engine."""
+    if sync_engine.dialect.name == "sqlite":
+        event.listen(sync_engine, "connect", _apply_sqlite_pragmas)
+
+
+ASYNC_DATABASE_URL = settings.ASYNC_DATABASE_URL or to_async_url(settings.DATABASE_URL)
+
+engine = create_engine(settings.DATABASE_URL, **engine_options(settings.DATABASE_URL))
+configure_engine(engine)
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
-Base = declarative_base()
+async_engine = create_async_engine(
+    ASYNC_DATABASE_URL, **engine_options(ASYNC_DATABASE_URL, is_async=True)
+)
+configure_engine(async_engine.sync_engine)
+
+
+# --- Read/write routing ---
+
+# After a user commits, their reads stay on the primary for
+# READ_AFTER_WRITE_PIN_SECONDS so they never observe replica lag on their own
+# changes. The pin is kept twice: in this process, keyed by user, and in a
+# short-lived cookie on the write's response. Under ``uvicorn --workers N`` the
+# next read usually lands on another worker, which only the cookie reaches;
+# a client that does not send cookies back is pinned on the writing worker only.
+WRITE_PIN_COOKIE = "primary_until"
 
+_recent_writers = TTLCache(maxsize=100_000, ttl=settings.READ_AFTER_WRITE_PIN_SECONDS)
 
-def get_db():
-    """Dependency that yields a database session per request."""
-    db = SessionLocal()
+
+def mark_primary_write(user_id) -> None:
+    _recent_writers.set(str(user_id), True)
+
+
+def is_pinned_to_primary(user_id) -> bool:
+    return user_id is not None and _recent_writers.get(str(user_id), False)
+
+
+def clear_write_pins() -> None:
+    _recent_writers.clear()
+
+
+def _cookie_pinned(request: Request) -> bool:
+    """Whether the client carries an unexpired pin from a write on any worker.
+
+    A forged cookie can only send that client's own reads to the primary.
+    """
     try:
+        return float(request.cookies.get(WRITE_PIN_COOKIE, 0)) > time.time()
+    except ValueError:
+        return False
+
+
+def set_write_pin_cookie(request: Request, response: Response) -> None:
+    """Pin the client to the primary if this request committed a write.
+
+    Called by the request middleware once the response is ready. A no-op
+    without a replica.
+    """
+    if read_engine is None or getattr(request.state, "primary_write_at", None) is None:
+        return
+    ttl = settings.READ_AFTER_WRITE_PIN_SECONDS
+    response.set_cookie(
+        WRITE_PIN_COOKIE,
+        f"{request.state.primary_write_at + ttl:.3f}",
+        max_age=math.ceil(ttl),
+        httponly=True,
+        samesite="lax",
+    )
+
+
+class PrimarySession(Session):
+    """Session class behind primary AsyncSessions; remembers who wrote."""
+
+
+@event.listens_for(PrimarySession, "after_commit")
+def _remember_writer(session) -> None:
+    user_id = session.info.get("user_id")
+    if user_id is not None:
+        mark_primary_write(user_id)
+    request_state = session.info.get("request_state")
+    if request_state is not None:
+        request_state.primary_write_at = time.time()
+
+
+# expire_on_commit=False: attributes stay readable after commit without an
+# implicit (and, under asyncio, illegal) lazy refresh.
+AsyncSessionLocal = async_sessionmaker(
+    async_engine,
+    class_=AsyncSession,
+    sync_session_class=PrimarySession,
+    autoflush=False,
+    expire_on_commit=False,
+)
+
+# Optional read replica: read-only routes use it via get_read_db
+read_engine = None
+if settings.DATABASE_READ_URL:
+    ASYNC_DATABASE_READ_URL = to_async_url(settings.DATABASE_READ_URL)
+    read_engine = create_async_engine(
+        ASYNC_DATABASE_READ_URL, **engine_options(ASYNC_DATABASE_READ_URL, is_async=True)
+    )
+    configure_engine(read_engine.sync_engine)
+
+AsyncReadSessionLocal = async_sessionmaker(
+    read_engine or async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False,
+)
+
+Base = declarative_base()
+
+
+def pool_status() -> dict:
+    """Connection pool gauges for the /metrics payload, per engine."""
+    engines = {"requests": async_engine.sync_engine, "scripts": engine}
+    if read_engine is not None:
+        engines["replica"] = read_engine.sync_engine
+    status = {}
+    for name, eng in engines.items():
+        pool = eng.pool
+        stats = getattr(pool, "stats", None)
+        if stats is None:
+            status[name] = {"pool": type(pool).__name__}
+            continue
+        status[name] = {
+            "pool": type(pool).__name__,
+            "size": pool.size(),
+            "checked_out": pool.checkedout(),
+            "checked_in": pool.checkedin(),
+            "overflow": max(pool.overflow(), 0),
+            "checkouts_total": stats.checkouts,
+            "checkout_timeouts_total": stats.timeouts,
+            "checkout_wait_seconds_sum": round(stats.wait_sum, 6),
+            "checkout_wait_seconds_max": round(stats.wait_max, 6),
+        }
+    return status
+
+
+def _request_user_id(request: Request) -> Optional[str]:
+    """User id from the token verified by the logging middleware, if any."""
+    verified = getattr(request.state, "auth", None)
+    return verified.user_id if verified is not None else None
+
+
+async def get_db(request: Request):
+    """Dependency that yields an async primary (read/write) session per request."""
+    async with AsyncSessionLocal() as db:
+        db.sync_session.info["user_id"] = _request_user_id(request)
+        db.sync_session.info["request_state"] = request.state
+        yield db
+
+
+def get_read_session_factory(request: Request) -> async_sessionmaker:
+    """Dependency returning the session factory a read-only route should use.
+
+    Routes that stream their body open their own session from it: FastAPI
+    closes yield dependencies such as ``get_read_db`` before the body is sent.
+    """
+    if is_pinned_to_primary(_request_user_id(request)) or _cookie_pinned(request):
+        return AsyncSessionLocal
+    return AsyncReadSessionLocal
+
+
+async def get_read_db(request: Request):
+    """Dependency for read-only routes: the replica when one is configured.
+
+    Falls back to the primary when no replica is configured, and pins a
+    user to the primary for READ_AFTER_WRITE_PIN_SECONDS after they commit
+    a write so they always read their own writes — on every worker when the
+    client returns the pin cookie, otherwise on the worker that wrote.
+    """
+    async with get_read_session_factory(request)() as db:
         yield db
-    finally:
-        db.close()
@@ -1,29 +1,49 @@
 """Shared dependencies for route injection — auth guards, DB session."""
 
-from fastapi import Depends, HTTPException, status
+from typing import AsyncIterator, Optional
+
+from fastapi import Depends, Header, HTTPException, Request, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials, OAuth2PasswordBearer
-from sqlalchemy.orm import Session
-from jose import JWTError
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database import get_db
 from app.models.user import User
-from app.services.auth_service import decode_token
+from app.services import idempotency
+from app.services.auth_service import VerifiedToken, verify_bearer
+from app.services.principal_cache import UserPrincipal, cache_principal, get_principal
 
 # HTTPBearer for programmatic access, OAuth2 for Swagger UI
 security = HTTPBearer(auto_error=False)
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/token", auto_error=False)
 
 
-def get_current_user(
+def get_verified_token(request: Request, token: str) -> VerifiedToken:
+    """Return the verification result for ``token``, computing it at most once.
+
+    ``RequestLoggingMiddleware`` stores its result on ``request.state.auth``;
+    we reuse it when it was made for the same token.
+    """
+    verified = getattr(request.state, "auth", None)
+    if verified is None or verified.token != token:
+        verified = verify_bearer(token)
+        request.state.auth = verified
+    return verified
+
+
+async def get_current_user(
+    request: Request,
     bearer: HTTPAuthorizationCredentials = Depends(security),
     oauth2_token: str = Depends(oauth2_scheme),
-    db: Session = Depends(get_db),
-) -> User:
-    """Extract and validate Bearer token, return the authenticated User.
+    db: AsyncSession = Depends(get_db),
+) -> UserPrincipal:
+    """Extract and validate Bearer token, return the authenticated user.
     
     Supports both:
     - HTTPBearer (Authorization: Bearer <token>) for API clients
     - OAuth2 password flow for Swagger UI
+
+    The user is served from the principal cache when possible, so the common
+    case costs no database round-trip.
     """
     # Get token from either source
     token = None
@@ -45,22 +65,33 @@ def get_current_user(
         headers={"WWW-Authenticate": "Bearer"},
     )
 
+    payload = get_verified_token(request, token).claims
+    if payload is None:
+        raise credentials_exception
+    user_id = payload.get("sub")
+    if user_id is None:
+        raise credentials_exception
+
     try:
-        payload = decode_token(token)
-        user_id = payload.get("sub")
-        if user_id is None:
-            raise credentials_exception
-    except JWTError:
+        user_id = int(user_id)
+    except (TypeError, ValueError):
         raise credentials_exception
 
-    user = db.query(User).filter(User.id == int(user_id)).first()
+    exp = payload.get("exp")
+    principal = get_principal(user_id, exp)
+    if principal is not None:
+        return principal
+
+    user = await db.get(User, user_id)
     if user is None:
         raise credentials_exception
 
-    return user
+    principal = UserPrincipal.from_user(user)
+    cache_principal(principal, exp)
+    return principal
 
 
-def require_admin(current_user: User = Depends(get_current_user)) -> User:
+def require_admin(current_user: UserPrincipal = Depends(get_current_user)) -> UserPrincipal:
     """Raise 403 if the current user is not an admin."""
     if not current_user.is_admin:
         raise HTTPException(
@@ -68,3 +99,45 @@ def require_admin(current_user: User = Depends(get_current_user)) -> User:
             detail="Admin access required",
         )
     return current_user
+
+
+async def idempotent_request(
+    request: Request,
+    idempotency_key: Optional[str] = Header(None, min_length=1, max_length=255),
+    current_user: UserPrincipal = Depends(get_current_user),
+) -> AsyncIterator[idempotency.IdempotentAttempt]:
+    """Claim the request's ``Idempotency-Key`` for the current user and route.
+
+    Yields an attempt whose ``replay`` is the stored response of an earlier
+    request with the same key (the route should return it as-is). A retry of
+    a request still in progress waits for it. The key is released if the
+    route fails without saving a response.
+    """
+    store = idempotency.store
+    if idempotency_key is None or not store.enabled:
+        yield idempotency.IdempotentAttempt()
+        return
+
+    key = (current_user.id, request.method, request.url.path, idempotency_key)
+    digest = idempotency.fingerprint(request.method, request.url.path, await request.body())
+    try:
+        stored = await store.begin(key, digest)
+    except idempotency.IdempotencyKeyReused:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="Idempotency-Key was already used for a different request",
+        )
+    except idempotency.IdempotencyInProgress:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="A request with this Idempotency-Key is still in progress",
+        )
+
+    if stored is not None:
+        yield idempotency.IdempotentAttempt(replay=stored.replay())
+        return
+    attempt = idempotency.IdempotentAttempt(store, key)
+    try:
+        yield attempt
+    finally:
+        attempt.release()
@@ -1,21 +1,38 @@
 """SprintSync — FastAPI application entry point."""
 
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.database import engine, Base
 from app.routers import auth, users, tasks, ai, metrics, stats
+from app.routers.metrics import request_metrics
 from app.middleware.logging import RequestLoggingMiddleware
+from app.services.hashing import shutdown_hash_executor
+from app.services.task_stream import hub as task_stream_hub
 
 # Create tables on startup (dev convenience — migrations handle production)
 Base.metadata.create_all(bind=engine)
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Process-level startup/shutdown hooks."""
+    request_metrics.start()
+    yield
+    request_metrics.close()
+    task_stream_hub.close()
+    shutdown_hash_executor()
+
+
 app = FastAPI(
     title="SprintSync API",
     description="Lean internal tool for logging work, tracking time, and AI-powered planning.",
     version="0.6.0",
     docs_url="/docs",
     redoc_url="/redoc",
+    lifespan=lifespan,
 )
 
 # --- Middleware (order matters: last added = first executed) ---
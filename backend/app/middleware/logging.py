@@ -1,4 +1,10 @@
-"""Structured request logging middleware — logs method, path, userId, latency, status."""
+"""Structured request logging middleware — logs method, path, userId, latency, status.
+
+It also feeds the /metrics request counters, labelled by the matched route
+template (``/tasks/{task_id}``) rather than the raw path so the number of
+series stays bounded, and sets the read-after-write pin cookie on responses
+to requests that committed a write.
+"""
 
 import time
 import json
@@ -8,6 +14,10 @@ from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.requests import Request
 from starlette.responses import Response
 
+from app.database import set_write_pin_cookie
+from app.routers.metrics import record_request
+from app.services.auth_service import verify_bearer
+
 logger = logging.getLogger("sprintsync.requests")
 
 # Configure structured JSON logging
@@ -18,27 +28,42 @@ logging.basicConfig(
 )
 
 
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+def route_template(request: Request) -> str:
+    """The path template of the route that handled ``request``.
+
+    The router stores the matched route in the shared ASGI scope; requests
+    that matched nothing (404s, probes) share a single label.
+    """
+    route = request.scope.get("route")
+    return getattr(route, "path", None) or UNMATCHED_ROUTE
+
+
 class RequestLoggingMiddleware(BaseHTTPMiddleware):
     """Middleware that logs every request with structured JSON fields."""
 
     async def dispatch(self, request: Request, call_next) -> Response:
         start_time = time.time()
 
-        # Extract user_id from JWT if present (best-effort, non-blocking)
+        # Verify the bearer token once and share the result with the auth
+        # dependencies via request.state (best-effort, non-blocking)
         user_id = None
         auth_header = request.headers.get("authorization", "")
         if auth_header.startswith("Bearer "):
-            try:
-                from app.services.auth_service import decode_token
-                token = auth_header.split(" ")[1]
-                payload = decode_token(token)
-                user_id = payload.get("sub")
-            except Exception:
-                pass  # Don't block the request for logging
+            verified = verify_bearer(auth_header.split(" ")[1])
+            request.state.auth = verified
+            user_id = verified.user_id
 
         try:
             response = await call_next(request)
-            latency_ms = round((time.time() - start_time) * 1000, 2)
+            set_write_pin_cookie(request, response)
+            latency_s = time.time() - start_time
+            latency_ms = round(latency_s * 1000, 2)
+            record_request(
+                request.method, route_template(request), response.status_code, latency_s
+            )
 
             log_entry = {
                 "level": "INFO",
@@ -54,7 +79,9 @@ class RequestLoggingMiddleware(BaseHTTPMiddleware):
             return response
 
         except Exception as exc:
-            latency_ms = round((time.time() - start_time) * 1000, 2)
+            latency_s = time.time() - start_time
+            latency_ms = round(latency_s * 1000, 2)
+            record_request(request.method, route_template(request), 500, latency_s)
 
             error_entry = {
                 "level": "ERROR",
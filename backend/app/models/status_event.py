@@ -0,0 +1,42 @@
+"""Status history ORM models — transition events and cycle-time buckets."""
+
+from sqlalchemy import Column, DateTime, Enum, Float, ForeignKey, Index, Integer
+from app.database import Base
+from app.models.task import TaskStatus, utcnow
+
+
+class TaskStatusEvent(Base):
+    """One accepted status change (or a task's initial status when created).
+
+    ``duration_seconds`` is how long the task spent in ``from_status``; it is
+    NULL for the creation event and when the previous event is unknown.
+    """
+
+    __tablename__ = "task_status_events"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    task_id = Column(Integer, ForeignKey("tasks.id", ondelete="CASCADE"), nullable=False)
+    from_status = Column(Enum(TaskStatus), nullable=True)
+    to_status = Column(Enum(TaskStatus), nullable=False)
+    changed_by = Column(Integer, ForeignKey("users.id", ondelete="SET NULL"), nullable=True)
+    occurred_at = Column(DateTime(timezone=True), default=utcnow, nullable=False)
+    duration_seconds = Column(Float, nullable=True)
+
+    # Latest event per task is the hot lookup on every transition
+    __table_args__ = (Index("ix_task_status_events_task_id", "task_id", "id"),)
+
+
+class CycleTimeBucket(Base):
+    """Persisted quantile-sketch counters of time spent per status.
+
+    One row per ``(status, bucket)`` of ``LogBucketSketch``; each transition
+    increments a single row, and percentiles are read back from at most a few
+    hundred rows per status however many events exist.
+    """
+
+    __tablename__ = "cycle_time_buckets"
+
+    status = Column(Enum(TaskStatus), primary_key=True)
+    bucket = Column(Integer, primary_key=True, autoincrement=False)
+    count = Column(Integer, nullable=False, default=0)
+    total_seconds = Column(Float, nullable=False, default=0.0)
@@ -1,7 +1,10 @@
 """Task ORM model with status enum and time tracking."""
 
 import enum
-from sqlalchemy import Column, Integer, String, DateTime, Enum, ForeignKey, Text
+from datetime import datetime, timezone
+from sqlalchemy import (
+    DDL, Column, Integer, String, DateTime, Enum, ForeignKey, Index, Text, event, text,
+)
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.database import Base
@@ -25,6 +28,15 @@ VALID_TRANSITIONS = {
 }
 
 
+def utcnow() -> datetime:
+    """Timestamp default with sub-second precision.
+
+    SQLite's CURRENT_TIMESTAMP only has one-second resolution, which makes
+    ``created_at`` ties common and keyset cursors ambiguous.
+    """
+    return datetime.now(timezone.utc)
+
+
 class Task(Base):
     """Task table — work items with status tracking and time logging."""
 
@@ -33,19 +45,17 @@ class Task(Base):
     id = Column(Integer, primary_key=True, index=True, autoincrement=True)
     title = Column(String(200), nullable=False)
     description = Column(Text, nullable=True)
-    status = Column(
-        Enum(TaskStatus), default=TaskStatus.TODO, nullable=False, index=True
-    )
+    status = Column(Enum(TaskStatus), default=TaskStatus.TODO, nullable=False)
     total_minutes = Column(Integer, default=0, nullable=False)
 
     # Foreign keys
-    assignee_id = Column(Integer, ForeignKey("users.id"), nullable=True, index=True)
+    assignee_id = Column(Integer, ForeignKey("users.id"), nullable=True)
     created_by = Column(Integer, ForeignKey("users.id"), nullable=False)
 
     # Timestamps
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    created_at = Column(DateTime(timezone=True), default=utcnow, server_default=func.now())
     updated_at = Column(
-        DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
+        DateTime(timezone=True), default=utcnow, server_default=func.now(), onupdate=utcnow
     )
 
     # Relationships
@@ -56,5 +66,62 @@ class Task(Base):
         "User", back_populates="created_tasks", foreign_keys=[created_by]
     )
 
+    # Matched to the hot query shapes — see alembic revision 0002
+    __table_args__ = (
+        Index("ix_tasks_assignee_created", "assignee_id", "created_at", "id"),
+        Index("ix_tasks_status_created", "status", "created_at", "id"),
+        Index("ix_tasks_created_at_id", "created_at", "id"),
+        Index("ix_tasks_created_by", "created_by"),
+        Index(
+            "ix_tasks_open_assignee_created",
+            "assignee_id",
+            "created_at",
+            "id",
+            postgresql_where=text("status <> 'DONE'"),
+            info={"dialect": "postgresql"},
+        ).ddl_if(dialect="postgresql"),
+    )
+
     def __repr__(self):
         return f"<Task(id={self.id}, title='{self.title}', status='{self.status}')>"
+
+
+# --- Full-text search index (see alembic revision 0005) ---
+# SQLite: an external-content FTS5 table mirroring title/description, kept in
+# sync by triggers. PostgreSQL: a generated tsvector column with a GIN index.
+# Neither is mapped on the model; app.services.task_search queries them.
+# Batch migrations that rebuild ``tasks`` on SQLite drop the triggers, so they
+# must recreate them.
+
+SQLITE_SEARCH_DDL = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS tasks_fts USING fts5("
+    "title, description, content='tasks', content_rowid='id', tokenize='unicode61 remove_diacritics 2')",
+    "CREATE TRIGGER IF NOT EXISTS tasks_fts_ai AFTER INSERT ON tasks BEGIN "
+    "INSERT INTO tasks_fts(rowid, title, description) "
+    "VALUES (new.id, new.title, new.description); END",
+    "CREATE TRIGGER IF NOT EXISTS tasks_fts_ad AFTER DELETE ON tasks BEGIN "
+    "INSERT INTO tasks_fts(tasks_fts, rowid, title, description) "
+    "VALUES ('delete', old.id, old.title, old.description); END",
+    "CREATE TRIGGER IF NOT EXISTS tasks_fts_au AFTER UPDATE OF title, description ON tasks BEGIN "
+    "INSERT INTO tasks_fts(tasks_fts, rowid, title, description) "
+    "VALUES ('delete', old.id, old.title, old.description); "
+    "INSERT INTO tasks_fts(rowid, title, description) "
+    "VALUES (new.id, new.title, new.description); END",
+]
+
+POSTGRES_SEARCH_DDL = [
+    "ALTER TABLE tasks ADD COLUMN IF NOT EXISTS search_vector tsvector GENERATED ALWAYS AS ("
+    "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(description, '')), 'B')) STORED",
+    "CREATE INDEX IF NOT EXISTS ix_tasks_search ON tasks USING gin (search_vector)",
+]
+
+for _statement in SQLITE_SEARCH_DDL:
+    event.listen(Task.__table__, "after_create", DDL(_statement).execute_if(dialect="sqlite"))
+for _statement in POSTGRES_SEARCH_DDL:
+    event.listen(Task.__table__, "after_create", DDL(_statement).execute_if(dialect="postgresql"))
+event.listen(
+    Task.__table__,
+    "before_drop",
+    DDL("DROP TABLE IF EXISTS tasks_fts").execute_if(dialect="sqlite"),
+)
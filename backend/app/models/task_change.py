@@ -0,0 +1,22 @@
+"""Task change feed ORM model."""
+
+from sqlalchemy import Column, DateTime, Integer, String
+from app.database import Base
+from app.models.task import utcnow
+
+
+class TaskChange(Base):
+    """One row per task write, numbered by a monotonic sequence.
+
+    ``task_id`` has no foreign key: delete rows are tombstones for tasks that
+    no longer exist. AUTOINCREMENT keeps SQLite from reusing sequence numbers.
+    """
+
+    __tablename__ = "task_changes"
+
+    seq = Column(Integer, primary_key=True, autoincrement=True)
+    task_id = Column(Integer, nullable=False)
+    op = Column(String(10), nullable=False)
+    changed_at = Column(DateTime(timezone=True), default=utcnow, nullable=False)
+
+    __table_args__ = {"sqlite_autoincrement": True}
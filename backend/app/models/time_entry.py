@@ -0,0 +1,41 @@
+"""Time ledger ORM models — individual entries and per-user daily rollups."""
+
+from sqlalchemy import Column, Date, DateTime, ForeignKey, Index, Integer
+from app.database import Base
+from app.models.task import utcnow
+
+
+class TimeEntry(Base):
+    """Append-only ledger row written every time minutes are logged.
+
+    Entries outlive the task they were logged against (``task_id`` is nulled)
+    so leaderboards keep counting work on deleted tasks.
+    """
+
+    __tablename__ = "time_entries"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    task_id = Column(Integer, ForeignKey("tasks.id", ondelete="SET NULL"), nullable=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    minutes = Column(Integer, nullable=False)
+    logged_at = Column(DateTime(timezone=True), default=utcnow, nullable=False)
+
+    __table_args__ = (
+        Index("ix_time_entries_user_logged", "user_id", "logged_at"),
+        Index("ix_time_entries_task", "task_id"),
+    )
+
+
+class UserDailyMinutes(Base):
+    """Minutes logged per user per UTC day, maintained on every ledger insert.
+
+    Keyed ``(day, user_id)`` so a window of N days is one primary-key range
+    scan over at most N × users rows, however large the ledger grows.
+    """
+
+    __tablename__ = "user_daily_minutes"
+
+    day = Column(Date, primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    minutes = Column(Integer, nullable=False, default=0)
+    entry_count = Column(Integer, nullable=False, default=0)
@@ -1,14 +1,15 @@
 """AI router — /ai/suggest endpoint for LLM-powered planning assistance."""
 
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy import or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database import get_db
-from app.models.user import User
 from app.models.task import Task
 from app.schemas.ai import AISuggestRequest, AISuggestResponse
 from app.services.ai_service import suggest_description, suggest_daily_plan
 from app.dependencies import get_current_user
+from app.services.principal_cache import UserPrincipal
 
 router = APIRouter(prefix="/ai", tags=["AI Assist"])
 
@@ -16,8 +17,8 @@ router = APIRouter(prefix="/ai", tags=["AI Assist"])
 @router.post("/suggest", response_model=AISuggestResponse)
 async def ai_suggest(
     payload: AISuggestRequest,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+    current_user: UserPrincipal = Depends(get_current_user),
 ):
     """AI-powered suggestions.
 
@@ -36,17 +37,16 @@ async def ai_suggest(
 
     elif payload.type == "daily_plan":
         # Get tasks assigned to or created by the current user
-        from sqlalchemy import or_
         user_tasks = (
-            db.query(Task)
-            .filter(
-                or_(
-                    Task.assignee_id == current_user.id,
-                    Task.created_by == current_user.id,
+            await db.scalars(
+                select(Task).where(
+                    or_(
+                        Task.assignee_id == current_user.id,
+                        Task.created_by == current_user.id,
+                    )
                 )
             )
-            .all()
-        )
+        ).all()
         result = await suggest_daily_plan(user_tasks)
         return AISuggestResponse(type="daily_plan", **result)
 
@@ -1,42 +1,73 @@
 """Auth router — register, login, and current user endpoints."""
 
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database import get_db
 from app.models.user import User
 from app.schemas.user import UserRegister, UserLogin, TokenResponse, UserResponse
-from app.services.auth_service import hash_password, verify_password, create_access_token
+from app.services.auth_service import create_access_token
+from app.services.hashing import HashingBusyError, hash_password_async, verify_password_async
 from app.dependencies import get_current_user
+from app.services.principal_cache import UserPrincipal
 from fastapi.security import OAuth2PasswordRequestForm
 
 router = APIRouter(prefix="/auth", tags=["Authentication"])
 
 
+def _hashing_unavailable() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Authentication is busy, please retry shortly",
+        headers={"Retry-After": "1"},
+    )
+
+
+async def _authenticate(db: AsyncSession, username: str, password: str) -> User:
+    """Look up the user and check their password on the hashing executor."""
+    user = await db.scalar(select(User).where(User.username == username))
+    try:
+        valid = user is not None and await verify_password_async(password, user.hashed_password)
+    except HashingBusyError:
+        raise _hashing_unavailable()
+    if not valid:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid username or password",
+        )
+    return user
+
+
 @router.post("/register", response_model=TokenResponse, status_code=status.HTTP_201_CREATED)
-def register(payload: UserRegister, db: Session = Depends(get_db)):
+async def register(payload: UserRegister, db: AsyncSession = Depends(get_db)):
     """Register a new user and return a JWT token."""
     # Check for existing username or email
-    if db.query(User).filter(User.username == payload.username).first():
+    if await db.scalar(select(User.id).where(User.username == payload.username)):
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
             detail="Username already taken",
         )
-    if db.query(User).filter(User.email == payload.email).first():
+    if await db.scalar(select(User.id).where(User.email == payload.email)):
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
             detail="Email already registered",
         )
 
+    try:
+        hashed_password = await hash_password_async(payload.password)
+    except HashingBusyError:
+        raise _hashing_unavailable()
+
     user = User(
         username=payload.username,
         email=payload.email,
-        hashed_password=hash_password(payload.password),
+        hashed_password=hashed_password,
         is_admin=False,
     )
     db.add(user)
-    db.commit()
-    db.refresh(user)
+    await db.commit()
+    await db.refresh(user)
 
     token = create_access_token(user.id, user.is_admin)
     return TokenResponse(
@@ -46,14 +77,9 @@ def register(payload: UserRegister, db: Session = Depends(get_db)):
 
 
 @router.post("/login", response_model=TokenResponse)
-def login(payload: UserLogin, db: Session = Depends(get_db)):
+async def login(payload: UserLogin, db: AsyncSession = Depends(get_db)):
     """Authenticate user credentials and return a JWT token."""
-    user = db.query(User).filter(User.username == payload.username).first()
-    if not user or not verify_password(payload.password, user.hashed_password):
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid username or password",
-        )
+    user = await _authenticate(db, payload.username, payload.password)
 
     token = create_access_token(user.id, user.is_admin)
     return TokenResponse(
@@ -63,23 +89,18 @@ def login(payload: UserLogin, db: Session = Depends(get_db)):
 
 
 @router.post("/token", tags=["Authentication"])
-def swagger_login(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
+async def swagger_login(form_data: OAuth2PasswordRequestForm = Depends(), db: AsyncSession = Depends(get_db)):
     """OAuth2-compatible token endpoint for Swagger UI Authorize button.
     
     Use the 🔒 Authorize button in Swagger → enter username & password → all endpoints authenticate automatically.
     """
-    user = db.query(User).filter(User.username == form_data.username).first()
-    if not user or not verify_password(form_data.password, user.hashed_password):
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid username or password",
-        )
+    user = await _authenticate(db, form_data.username, form_data.password)
 
     token = create_access_token(user.id, user.is_admin)
     return {"access_token": token, "token_type": "bearer"}
 
 
 @router.get("/me", response_model=UserResponse)
-def get_me(current_user: User = Depends(get_current_user)):
+async def get_me(current_user: UserPrincipal = Depends(get_current_user)):
     """Return the currently authenticated user's profile."""
     return UserResponse.model_validate(current_user)
@@ -1,61 +1,95 @@
-"""Metrics router — Prometheus-style JSON metrics endpoint."""
+"""Metrics router — JSON metrics endpoint, also served as Prometheus text."""
 
 import time
-from collections import defaultdict
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
+from typing import Literal, Optional
 
-from app.database import get_db
+from fastapi import APIRouter, Depends, Query, Request
+from fastapi.responses import PlainTextResponse
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import get_settings
+from app.database import get_read_db, pool_status
 from app.models.task import Task, TaskStatus
 from app.models.user import User
+from app.services.hashing import hashing_stats
+from app.services.idempotency import store as idempotency_store
+from app.services.prometheus import CONTENT_TYPE as PROMETHEUS_CONTENT_TYPE, render_metrics
+from app.services.request_metrics import RequestMetrics
+from app.services.task_stream import hub as task_stream_hub
 
+settings = get_settings()
 router = APIRouter(tags=["Observability"])
 
-# In-memory metrics counters (reset on restart — fine for MVP)
-_metrics = {
-    "requests_total": defaultdict(int),
-    "request_latency_seconds": [],
-    "start_time": time.time(),
-}
+# Request statistics (reset on restart); bounded in size. Per process unless
+# METRICS_DIR is set, in which case snapshots merge every worker's counters.
+request_metrics = RequestMetrics(
+    max_routes=settings.METRICS_MAX_ROUTES,
+    directory=settings.METRICS_DIR,
+    flush_interval=settings.METRICS_FLUSH_SECONDS,
+)
+
+
+def record_request(method: str, route: str, status_code: int, latency_s: float):
+    """Record a request in the metrics store (called from middleware).
+
+    ``route`` should be the matched route template, e.g. ``/tasks/{task_id}``.
+    """
+    request_metrics.record(method, route, status_code, latency_s)
+
 
+PROMETHEUS_ACCEPT = ("text/plain", "application/openmetrics-text")
 
-def record_request(method: str, path: str, status_code: int, latency_s: float):
-    """Record a request in the metrics store (called from middleware)."""
-    key = f"{method} {path} {status_code}"
-    _metrics["requests_total"][key] += 1
-    _metrics["request_latency_seconds"].append(latency_s)
+
+def wants_prometheus(request: Request, format: Optional[str]) -> bool:
+    """``?format=`` wins; otherwise a scraper's Accept header selects text."""
+    if format is not None:
+        return format == "prometheus"
+    accept = request.headers.get("accept", "")
+    return any(media in accept for media in PROMETHEUS_ACCEPT)
 
 
 @router.get("/metrics")
-def get_metrics(db: Session = Depends(get_db)):
+async def get_metrics(
+    request: Request,
+    format: Optional[Literal["json", "prometheus"]] = Query(
+        None, description="Force the JSON or Prometheus text format (default: by Accept)"
+    ),
+    db: AsyncSession = Depends(get_read_db),
+):
     """Prometheus-style JSON metrics endpoint.
 
     Returns request counters, latency stats, and application-level gauges.
+    Prometheus scrapers (``Accept: text/plain`` or OpenMetrics) and
+    ``?format=prometheus`` get the same numbers in the text exposition format.
     """
-    latencies = _metrics["request_latency_seconds"]
-    uptime = time.time() - _metrics["start_time"]
+    requests = request_metrics.snapshot()
+    uptime = time.time() - request_metrics.start_time
 
     # Application gauges
-    total_users = db.query(User).count()
-    total_tasks = db.query(Task).count()
+    total_users = await db.scalar(select(func.count(User.id)))
+    total_tasks = await db.scalar(select(func.count(Task.id)))
     tasks_by_status = {}
     for status in TaskStatus:
-        count = db.query(Task).filter(Task.status == status).count()
+        count = await db.scalar(select(func.count(Task.id)).where(Task.status == status))
         tasks_by_status[status.value] = count
 
-    # Latency histogram buckets
-    buckets = [0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0]
-    histogram = {f"le_{b}": sum(1 for lat in latencies if lat <= b) for b in buckets}
-    histogram["count"] = len(latencies)
-    histogram["sum"] = round(sum(latencies), 4) if latencies else 0
-
-    return {
+    payload = {
         "uptime_seconds": round(uptime, 2),
-        "requests_total": dict(_metrics["requests_total"]),
-        "request_latency_seconds": histogram,
+        "workers": requests["workers"],
+        "requests_total": requests["requests_total"],
+        "request_latency_seconds": requests["request_latency_seconds"],
+        "routes": requests["routes"],
         "gauges": {
             "active_users": total_users,
             "total_tasks": total_tasks,
             "tasks_by_status": tasks_by_status,
         },
+        "password_hashing": hashing_stats(),
+        "database_pool": pool_status(),
+        "task_stream": task_stream_hub.stats(),
+        "idempotency": idempotency_store.stats(),
     }
+    if wants_prometheus(request, format):
+        return PlainTextResponse(render_metrics(payload), media_type=PROMETHEUS_CONTENT_TYPE)
+    return payload
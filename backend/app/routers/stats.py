@@ -1,51 +1,61 @@
 """Stats router — aggregate endpoints (stretch goal)."""
 
-from fastapi import APIRouter, Depends, Query
-from sqlalchemy.orm import Session
-from sqlalchemy import func
+from datetime import timedelta
 
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import func, select
 
-from app.database import get_db
+from app.database import get_read_db
 from app.models.user import User
-from app.models.task import Task
+from app.models.task import Task, TaskStatus, utcnow
+from app.models.time_entry import UserDailyMinutes
 from app.dependencies import get_current_user
+from app.services.cycle_time import SKETCH_ALPHA, cycle_time_report
+from app.services.principal_cache import UserPrincipal
 
 router = APIRouter(prefix="/stats", tags=["Statistics"])
 
 
 @router.get("/top-users")
-def top_users(
+async def top_users(
     days: int = Query(7, ge=1, le=90, description="Lookback period in days"),
     limit: int = Query(5, ge=1, le=20),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db),
+    current_user: UserPrincipal = Depends(get_current_user),
 ):
-    """Top users by total logged minutes within the lookback period.
+    """Top users by minutes logged within the last ``days`` days (UTC, incl. today).
 
-    Returns the top N users ranked by their total_minutes on assigned tasks.
+    Reads the per-user daily rollups, so the cost is bounded by
+    ``days × users`` rows regardless of the size of the time ledger.
     """
+    since = utcnow().date() - timedelta(days=days - 1)
+    total = func.sum(UserDailyMinutes.minutes).label("total_minutes")
     results = (
-        db.query(
-            User.id,
-            User.username,
-            func.coalesce(func.sum(Task.total_minutes), 0).label("total_minutes"),
-            func.count(Task.id).label("task_count"),
+        await db.execute(
+            select(
+                User.id,
+                User.username,
+                total,
+                func.sum(UserDailyMinutes.entry_count).label("entry_count"),
+            )
+            .join(User, User.id == UserDailyMinutes.user_id)
+            .where(UserDailyMinutes.day >= since)
+            .group_by(User.id, User.username)
+            .order_by(total.desc(), User.id)
+            .limit(limit)
         )
-        .outerjoin(Task, Task.assignee_id == User.id)
-        .group_by(User.id, User.username)
-        .order_by(func.coalesce(func.sum(Task.total_minutes), 0).desc())
-        .limit(limit)
-        .all()
-    )
+    ).all()
 
     return {
         "period_days": days,
+        "since": since.isoformat(),
         "top_users": [
             {
                 "user_id": r.id,
                 "username": r.username,
                 "total_minutes": r.total_minutes,
-                "task_count": r.task_count,
+                "entry_count": r.entry_count,
             }
             for r in results
         ],
@@ -53,32 +63,22 @@ def top_users(
 
 
 @router.get("/cycle-time")
-def average_cycle_time(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+async def cycle_time(
+    db: AsyncSession = Depends(get_read_db),
+    current_user: UserPrincipal = Depends(get_current_user),
 ):
-    """Average cycle time per status — time tasks spend in each status.
+    """Time tasks spend in each status before moving on.
 
-    Note: In a production system this would use status change event logs.
-    For MVP, we report task counts and average minutes by status.
+    Built from the status-transition history: count, mean and p50/p85/p95
+    in seconds, read from pre-aggregated quantile sketches (within 2%
+    relative error) rather than by sorting events. ``task_count`` is the
+    number of tasks currently in each status.
     """
-    results = (
-        db.query(
-            Task.status,
-            func.count(Task.id).label("count"),
-            func.coalesce(func.avg(Task.total_minutes), 0).label("avg_minutes"),
-        )
-        .group_by(Task.status)
-        .all()
+    current = dict(
+        (await db.execute(select(Task.status, func.count(Task.id)).group_by(Task.status))).all()
     )
+    report = await cycle_time_report(db)
+    for entry in report:
+        entry["task_count"] = current.get(TaskStatus(entry["status"]), 0)
 
-    return {
-        "cycle_time_by_status": [
-            {
-                "status": r.status.value,
-                "task_count": r.count,
-                "avg_minutes": round(float(r.avg_minutes), 1),
-            }
-            for r in results
-        ],
-    }
+    return {"relative_accuracy": SKETCH_ALPHA, "cycle_time_by_status": report}
@@ -1,77 +1,500 @@
 """Tasks router — CRUD operations with status transitions and time logging."""
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy.orm import Session
-from typing import Optional
+import csv
+import io
 
-from app.database import get_db
+from fastapi import (
+    APIRouter, Depends, File, HTTPException, Query, Request, Response, UploadFile, status,
+)
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from datetime import datetime
+from typing import Literal, Optional
+
+from app.database import get_db, get_read_db, get_read_session_factory
 from app.models.user import User
-from app.models.task import Task, TaskStatus, VALID_TRANSITIONS
+from app.models.task import Task, TaskStatus
 from app.schemas.task import (
     TaskCreate,
     TaskUpdate,
     TaskStatusUpdate,
     TaskLogTime,
     TaskResponse,
+    TaskExpanded,
     TaskListResponse,
+    TaskFields,
+    TaskFieldsListResponse,
+    TaskSearchHit,
+    TaskSearchResponse,
+    TaskChangeResponse,
+    TaskChangesResponse,
+    TaskBulkCreate,
+    TaskBulkStatusUpdate,
+    TaskBulkLogTime,
+    BulkItemResult,
+    BulkResponse,
+    TaskImportError,
+    TaskImportResponse,
+)
+from app.dependencies import get_current_user, idempotent_request
+from app.services.pagination import InvalidCursor, decode_cursor, encode_cursor
+from app.services.task_queries import (
+    EXPANSIONS,
+    TASK_FIELDS,
+    TASK_ORDER,
+    after_cursor,
+    apply_task_filters,
+    count_rows,
+    estimate_rows,
+    expand_users,
+    parse_expand,
+    parse_fields,
+    projection,
+)
+from app.services.etag import etag_matches, make_etag, not_modified, set_etag
+from app.services.idempotency import IdempotentAttempt
+from app.services import change_feed
+from app.services.cycle_time import record_created
+from app.services.principal_cache import UserPrincipal
+from app.services.serialization import (
+    from_object, json_response, row_dicts, row_response, rows_response,
+)
+from app.services.task_export import MEDIA_TYPES, export_query, stream_export
+from app.services.task_import import InvalidImportFile, import_tasks, read_csv
+from app.services.task_stream import hub
+from app.services.task_search import EmptyQuery, SearchUnavailable, search_tasks
+from app.services.task_service import (
+    BulkOutcome,
+    InvalidTransition,
+    TaskNotFound,
+    add_minutes,
+    bulk_add_minutes,
+    bulk_create,
+    bulk_transition,
+    transition_status,
 )
-from app.dependencies import get_current_user
 
 router = APIRouter(prefix="/tasks", tags=["Tasks"])
 
 
 @router.get("/", response_model=TaskListResponse)
-def list_tasks(
+async def list_tasks(
+    request: Request,
     status_filter: Optional[TaskStatus] = Query(None, alias="status"),
     assignee_id: Optional[int] = Query(None),
     skip: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=100),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    count: Literal["exact", "estimate", "none"] = Query(
+        "exact", description="How to compute total: exact COUNT, planner estimate, or skip it"
+    ),
+    fields: Optional[str] = Query(
+        None, description="Comma-separated task fields to return, e.g. id,title,status"
+    ),
+    expand: Optional[str] = Query(None, description="Embed users: assignee, creator"),
+    db: AsyncSession = Depends(get_read_db),
+    current_user: UserPrincipal = Depends(get_current_user),
 ):
-    """List tasks with optional filtering by status and assignee."""
-    query = db.query(Task)
+    """List tasks with optional filtering by status and assignee.
+
+    Pages are ordered newest first. Pass the returned ``next_cursor`` back as
+    ``cursor`` for keyset pagination, which costs the same on every page;
+    ``skip`` is still supported for older clients.
+
+    ``fields`` selects only those columns (``id`` is always included) and
+    returns tasks with just those keys — board views can skip loading
+    descriptions entirely. ``expand=assignee,creator`` embeds ``{id, username}``
+    for those users, loaded with one query for the whole page.
 
-    if status_filter:
-        query = query.filter(Task.status == status_filter)
-    if assignee_id is not None:
-        query = query.filter(Task.assignee_id == assignee_id)
+    Rows are read as columns and encoded to JSON in one pass.
+
+    Responses carry a weak ETag from the change-feed head; a matching
+    ``If-None-Match`` gets a 304 without the page or count queries being run.
+    """
+    try:
+        expansions = parse_expand(expand) if expand is not None else []
+        projected = list(TASK_FIELDS)
+        if fields is not None:
+            # Expanding a user needs its id column, requested or not
+            projected = parse_fields(",".join([fields, *(EXPANSIONS[n] for n in expansions)]))
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc))
+
+    params = sorted(request.query_params.multi_items())
+    version = [await change_feed.latest_seq(db)]
+    if expansions:
+        # Embedded usernames change without a task change
+        version.append(await db.scalar(select(func.max(User.updated_at))))
+    etag = make_etag("tasks", *version, params)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+
+    query = apply_task_filters(projection(projected), status_filter, assignee_id)
+
+    total, total_is_estimate = None, False
+    if count == "estimate":
+        total = await estimate_rows(db, query)
+        total_is_estimate = total is not None
+    if count != "none" and total is None:
+        total = await count_rows(db, query)
+
+    page_query = query
+    if cursor is not None:
+        if skip:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Use either cursor or skip, not both",
+            )
+        try:
+            created_at, last_id = decode_cursor(cursor, 2)
+            if not isinstance(created_at, datetime) or not isinstance(last_id, int):
+                raise InvalidCursor("Invalid cursor")
+        except InvalidCursor:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid cursor",
+            )
+        page_query = after_cursor(page_query, created_at, last_id)
 
-    total = query.count()
-    tasks = query.order_by(Task.created_at.desc()).offset(skip).limit(limit).all()
+    # Fetch one extra row to learn whether another page exists
+    rows = (
+        await db.execute(page_query.order_by(*TASK_ORDER).offset(skip).limit(limit + 1))
+    ).all()
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(*rows[-1][-2:])
 
-    return TaskListResponse(
-        tasks=[TaskResponse.model_validate(t) for t in tasks],
+    # Column rows are encoded once, without building or validating models
+    items = row_dicts(projected, rows)
+    if expansions:
+        await expand_users(db, items, expansions)
+    if fields is not None:
+        page, row = TaskFieldsListResponse, TaskFields
+    else:
+        page, row = TaskListResponse, TaskExpanded if expansions else TaskResponse
+    result = rows_response(
+        page,
+        "tasks",
+        row,
+        items,
         total=total,
+        total_is_estimate=total_is_estimate,
+        next_cursor=next_cursor,
+    )
+    set_etag(result, etag)
+    return result
+
+
+@router.get("/search", response_model=TaskSearchResponse)
+async def search(
+    q: str = Query(..., min_length=1, max_length=200, description="Words to look for"),
+    status_filter: Optional[TaskStatus] = Query(None, alias="status"),
+    assignee_id: Optional[int] = Query(None),
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    db: AsyncSession = Depends(get_read_db),
+    current_user: UserPrincipal = Depends(get_current_user),
+):
+    """Full-text search over task titles and descriptions.
+
+    Every word must match (the last one as a prefix). Results are ranked by
+    relevance, title matches first, with a highlighted snippet.
+    """
+    after = None
+    if cursor is not None:
+        try:
+            score, last_id = decode_cursor(cursor, 2)
+            if not isinstance(score, (int, float)) or not isinstance(last_id, int):
+                raise InvalidCursor("Invalid cursor")
+        except InvalidCursor:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid cursor",
+            )
+        after = (score, last_id)
+
+    try:
+        hits = await search_tasks(db, q, limit + 1, after, status_filter, assignee_id)
+    except EmptyQuery:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Search query must contain at least one word",
+        )
+    except SearchUnavailable:
+        raise HTTPException(
+            status_code=status.HTTP_501_NOT_IMPLEMENTED,
+            detail="Full-text search is not available on this database",
+        )
+
+    next_cursor = None
+    if len(hits) > limit:
+        hits = hits[:limit]
+        next_cursor = encode_cursor(hits[-1].score, hits[-1].task.id)
+
+    return json_response(TaskSearchResponse.model_construct(
+        results=[
+            TaskSearchHit.model_construct(
+                task=from_object(TaskResponse, h.task), score=h.score, snippet=h.snippet
+            )
+            for h in hits
+        ],
+        next_cursor=next_cursor,
+    ))
+
+
+@router.get("/changes", response_model=TaskChangesResponse)
+async def list_changes(
+    since: Optional[str] = Query(None, description="cursor from the previous response"),
+    limit: int = Query(100, ge=1, le=1000),
+    db: AsyncSession = Depends(get_read_db),
+    current_user: UserPrincipal = Depends(get_current_user),
+):
+    """Task changes after ``since``, oldest first, at most ``limit`` per call.
+
+    Creates and updates carry the task's current state; deletes are
+    tombstones. Several changes to one task within a batch collapse into the
+    latest. Keep calling with the returned ``cursor`` while ``has_more``;
+    omit ``since`` to replay the feed from the start.
+    """
+    after = 0
+    if since is not None:
+        try:
+            (after,) = decode_cursor(since, 1)
+            if not isinstance(after, int):
+                raise InvalidCursor("Invalid cursor")
+        except InvalidCursor:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid cursor",
+            )
+
+    changes, has_more = await change_feed.read_changes(db, after, limit)
+    if not changes:
+        return TaskChangesResponse(changes=[], cursor=encode_cursor(after), has_more=False)
+
+    results = [
+        TaskChangeResponse.model_construct(
+            seq=change.seq,
+            task_id=change.task_id,
+            op=change.op,
+            changed_at=change.changed_at,
+            task=from_object(TaskResponse, task) if task is not None else None,
+        )
+        for change, task in await change_feed.with_tasks(db, changes)
+    ]
+
+    return json_response(TaskChangesResponse.model_construct(
+        changes=results, cursor=encode_cursor(changes[-1].seq), has_more=has_more
+    ))
+
+
+@router.get("/stream", response_class=StreamingResponse)
+async def stream_tasks(
+    status_filter: Optional[TaskStatus] = Query(None, alias="status"),
+    assignee_id: Optional[int] = Query(None),
+    current_user: UserPrincipal = Depends(get_current_user),
+):
+    """Push task changes as server-sent events instead of polling the list.
+
+    Each event is ``create``, ``update``, ``delete`` or ``remove`` (the task
+    no longer matches the filters) with the task as JSON; its ``id`` is a
+    ``/tasks/changes`` cursor. A ``reset`` event means this client fell
+    too far behind: catch up from ``/tasks/changes?since=<data.since>``.
+    Comment lines are sent as a heartbeat while idle.
+    """
+    subscription = await hub.subscribe(
+        status=status_filter.value if status_filter else None, assignee_id=assignee_id
+    )
+    return StreamingResponse(
+        hub.events(subscription),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.get("/export", response_class=StreamingResponse)
+async def export_tasks(
+    format: Literal["ndjson", "csv"] = Query("ndjson"),
+    status_filter: Optional[TaskStatus] = Query(None, alias="status"),
+    assignee_id: Optional[int] = Query(None),
+    session_factory=Depends(get_read_session_factory),
+    current_user: UserPrincipal = Depends(get_current_user),
+):
+    """Download every matching task in one streamed response, oldest first.
+
+    Takes the same filters as the task list but has no page size or count;
+    rows are read through a server-side cursor and written as they arrive.
+    """
+    query = apply_task_filters(export_query(), status_filter, assignee_id).order_by(Task.id)
+    return StreamingResponse(
+        stream_export(session_factory, query, format),
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="tasks.{format}"'},
+    )
+
+
+def _bulk_response(outcomes: list[BulkOutcome]) -> Response:
+    results = [
+        BulkItemResult.model_construct(
+            index=i,
+            ok=o.error is None,
+            task=from_object(TaskResponse, o.task) if o.task is not None else None,
+            error=o.error,
+        )
+        for i, o in enumerate(outcomes)
+    ]
+    succeeded = sum(r.ok for r in results)
+    return json_response(BulkResponse.model_construct(
+        results=results, succeeded=succeeded, failed=len(results) - succeeded
+    ))
+
+
+@router.post("/bulk", response_model=BulkResponse)
+async def bulk_create_tasks(
+    payload: TaskBulkCreate,
+    db: AsyncSession = Depends(get_db),
+    current_user: UserPrincipal = Depends(get_current_user),
+):
+    """Create many tasks in one transaction.
+
+    Items with an unknown assignee are reported as failed; the rest are
+    inserted together. Results are returned in request order.
+    """
+    items = [item.model_dump() for item in payload.tasks]
+    outcomes = await bulk_create(db, items, created_by=current_user.id)
+    await db.commit()
+    return _bulk_response(outcomes)
+
+
+@router.patch("/bulk/status", response_model=BulkResponse)
+async def bulk_update_status(
+    payload: TaskBulkStatusUpdate,
+    db: AsyncSession = Depends(get_db),
+    current_user: UserPrincipal = Depends(get_current_user),
+):
+    """Apply many status transitions in one transaction, in request order.
+
+    Disallowed transitions are reported per item and skipped, as are the
+    items of a task another request changed mid-batch.
+    """
+    changes = [(item.task_id, item.status) for item in payload.items]
+    outcomes = await bulk_transition(db, changes, user_id=current_user.id)
+    await db.commit()
+    return _bulk_response(outcomes)
+
+
+@router.post("/bulk/log-time", response_model=BulkResponse)
+async def bulk_log_time(
+    payload: TaskBulkLogTime,
+    db: AsyncSession = Depends(get_db),
+    current_user: UserPrincipal = Depends(get_current_user),
+):
+    """Log time against many tasks in one transaction."""
+    entries = [(item.task_id, item.minutes) for item in payload.items]
+    outcomes = await bulk_add_minutes(db, entries, user_id=current_user.id)
+    await db.commit()
+    return _bulk_response(outcomes)
+
+
+@router.post("/import", response_model=TaskImportResponse)
+async def import_tasks_csv(
+    file: UploadFile = File(..., description="CSV with task, actual_hours, notes[, assignee, status]"),
+    db: AsyncSession = Depends(get_db),
+    current_user: UserPrincipal = Depends(get_current_user),
+):
+    """Create tasks from a spreadsheet export (the ``estimates.csv`` shape).
+
+    The file is read row by row and written in batches. Rows that fail
+    validation or name an unknown assignee username are reported by line
+    and skipped; every other row is imported. A file that cannot be
+    decoded is rejected with 400, keeping any batches already committed.
+    """
+    # Parsing runs in the threadpool: large uploads are read back from disk
+    lines = io.TextIOWrapper(file.file, encoding="utf-8-sig", newline="")
+    try:
+        reader = await run_in_threadpool(read_csv, lines)
+        report = await import_tasks(db, reader, created_by=current_user.id)
+    except (InvalidImportFile, UnicodeDecodeError, csv.Error) as exc:
+        await db.rollback()
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc))
+    finally:
+        lines.detach()
+
+    return TaskImportResponse(
+        created=report.created,
+        failed=report.failed,
+        errors=[TaskImportError(line=line, error=error) for line, error in report.errors],
+        errors_truncated=report.errors_truncated,
     )
 
 
 @router.get("/{task_id}", response_model=TaskResponse)
-def get_task(
+async def get_task(
     task_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    request: Request,
+    response: Response,
+    expand: Optional[str] = Query(None, description="Embed users: assignee, creator"),
+    db: AsyncSession = Depends(get_read_db),
+    current_user: UserPrincipal = Depends(get_current_user),
 ):
-    """Get a specific task by ID."""
-    task = db.query(Task).filter(Task.id == task_id).first()
+    """Get a specific task by ID (weak ETag from its ``updated_at``).
+
+    ``expand=assignee,creator`` embeds ``{id, username}`` for those users.
+    """
+    try:
+        expansions = parse_expand(expand) if expand is not None else []
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc))
+
+    version = (await db.execute(select(Task.updated_at).where(Task.id == task_id))).first()
+    if version is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Task not found",
+        )
+    if expansions:
+        version = (*version, expand, await db.scalar(select(func.max(User.updated_at))))
+    etag = make_etag("task", task_id, *version)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+
+    task = await db.get(Task, task_id)
     if not task:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Task not found",
         )
+    if expansions:
+        item = {name: getattr(task, name) for name in TASK_FIELDS}
+        await expand_users(db, [item], expansions)
+        result = row_response(TaskExpanded, item)
+        set_etag(result, etag)
+        return result
+    set_etag(response, etag)
     return TaskResponse.model_validate(task)
 
 
 @router.post("/", response_model=TaskResponse, status_code=status.HTTP_201_CREATED)
-def create_task(
+async def create_task(
     payload: TaskCreate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+    current_user: UserPrincipal = Depends(get_current_user),
+    attempt: IdempotentAttempt = Depends(idempotent_request),
 ):
-    """Create a new task. The authenticated user is set as the creator."""
+    """Create a new task. The authenticated user is set as the creator.
+
+    Send an ``Idempotency-Key`` header to make retries safe: a repeated key
+    returns the original response instead of creating another task.
+    """
+    if attempt.replay is not None:
+        return attempt.replay
+
     # Validate assignee exists if provided
     if payload.assignee_id is not None:
-        assignee = db.query(User).filter(User.id == payload.assignee_id).first()
+        assignee = await db.get(User, payload.assignee_id)
         if not assignee:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -86,20 +509,25 @@ def create_task(
         created_by=current_user.id,
     )
     db.add(task)
-    db.commit()
-    db.refresh(task)
-    return TaskResponse.model_validate(task)
+    await db.flush()
+    await record_created(db, [(task.id, task.status)], user_id=current_user.id)
+    await change_feed.record_changes(db, [(task.id, change_feed.CREATE)])
+    await db.commit()
+    await db.refresh(task)
+    return attempt.save(
+        json_response(from_object(TaskResponse, task), status_code=status.HTTP_201_CREATED)
+    )
 
 
 @router.put("/{task_id}", response_model=TaskResponse)
-def update_task(
+async def update_task(
     task_id: int,
     payload: TaskUpdate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+    current_user: UserPrincipal = Depends(get_current_user),
 ):
     """Update task details (title, description, assignee, minutes)."""
-    task = db.query(Task).filter(Task.id == task_id).first()
+    task = await db.get(Task, task_id)
     if not task:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -110,84 +538,87 @@ def update_task(
     for key, value in update_data.items():
         setattr(task, key, value)
 
-    db.commit()
-    db.refresh(task)
+    if update_data:
+        await db.flush()
+        await change_feed.record_changes(db, [(task_id, change_feed.UPDATE)])
+    await db.commit()
+    await db.refresh(task)
     return TaskResponse.model_validate(task)
 
 
 @router.patch("/{task_id}/status", response_model=TaskResponse)
-def update_task_status(
+async def update_task_status(
     task_id: int,
     payload: TaskStatusUpdate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+    current_user: UserPrincipal = Depends(get_current_user),
 ):
     """Transition a task's status. Validates allowed status transitions."""
-    task = db.query(Task).filter(Task.id == task_id).first()
-    if not task:
+    try:
+        task = await transition_status(db, task_id, payload.status, user_id=current_user.id)
+    except TaskNotFound:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Task not found",
         )
+    except InvalidTransition as exc:
+        if exc.current == exc.requested:
+            detail = f"Task is already in '{exc.current.value}' status"
+        else:
+            allowed_names = [s.value for s in exc.allowed]
+            detail = (
+                f"Cannot transition from '{exc.current.value}' to '{exc.requested.value}'. "
+                f"Allowed transitions: {allowed_names}"
+            )
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=detail)
 
-    current_status = task.status
-    new_status = payload.status
-
-    if new_status == current_status:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Task is already in '{current_status.value}' status",
-        )
-
-    allowed = VALID_TRANSITIONS.get(current_status, set())
-    if new_status not in allowed:
-        allowed_names = [s.value for s in allowed]
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Cannot transition from '{current_status.value}' to '{new_status.value}'. "
-                   f"Allowed transitions: {allowed_names}",
-        )
-
-    task.status = new_status
-    db.commit()
-    db.refresh(task)
+    await db.commit()
     return TaskResponse.model_validate(task)
 
 
 @router.post("/{task_id}/log-time", response_model=TaskResponse)
-def log_time(
+async def log_time(
     task_id: int,
     payload: TaskLogTime,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+    current_user: UserPrincipal = Depends(get_current_user),
+    attempt: IdempotentAttempt = Depends(idempotent_request),
 ):
-    """Add logged minutes to a task."""
-    task = db.query(Task).filter(Task.id == task_id).first()
-    if not task:
+    """Add logged minutes to a task and record them in the time ledger.
+
+    With an ``Idempotency-Key`` header, a retry returns the original response
+    and the minutes are counted once.
+    """
+    if attempt.replay is not None:
+        return attempt.replay
+
+    try:
+        task = await add_minutes(db, task_id, payload.minutes, user_id=current_user.id)
+    except TaskNotFound:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Task not found",
         )
 
-    task.total_minutes += payload.minutes
-    db.commit()
-    db.refresh(task)
-    return TaskResponse.model_validate(task)
+    await db.commit()
+    return attempt.save(json_response(from_object(TaskResponse, task)))
 
 
 @router.delete("/{task_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_task(
+async def delete_task(
     task_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+    current_user: UserPrincipal = Depends(get_current_user),
 ):
     """Delete a task."""
-    task = db.query(Task).filter(Task.id == task_id).first()
+    task = await db.get(Task, task_id)
     if not task:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Task not found",
         )
 
-    db.delete(task)
-    db.commit()
+    await db.delete(task)
+    await db.flush()
+    await change_feed.record_changes(db, [(task_id, change_feed.DELETE)])
+    await db.commit()
@@ -1,45 +1,63 @@
 """Users router — CRUD operations for user management."""
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
 from typing import List
 
-from app.database import get_db
+from app.database import get_db, get_read_db
 from app.models.user import User
 from app.schemas.user import UserResponse, UserUpdate
 from app.dependencies import get_current_user, require_admin
+from app.services.etag import etag_matches, make_etag, not_modified, set_etag
+from app.services import change_feed
+from app.services.principal_cache import UserPrincipal, invalidate_principal
+from app.services.serialization import list_response, row_dicts
 
 router = APIRouter(prefix="/users", tags=["Users"])
 
 
 @router.get("/directory")
-def user_directory(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+async def user_directory(
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_read_db),
+    current_user: UserPrincipal = Depends(get_current_user),
 ):
-    """List all users (id + username) for assignment dropdowns. Any authenticated user."""
-    users = db.query(User.id, User.username).order_by(User.username).all()
+    """List all users (id + username) for assignment dropdowns. Any authenticated user.
+
+    Weak ETag from ``max(updated_at)`` and the user count; 304 when unchanged.
+    """
+    validator = (await db.execute(select(func.max(User.updated_at), func.count(User.id)))).one()
+    etag = make_etag("users", *validator)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    set_etag(response, etag)
+
+    users = (await db.execute(select(User.id, User.username).order_by(User.username))).all()
     return [{"id": u.id, "username": u.username} for u in users]
 
 
 @router.get("/", response_model=List[UserResponse])
-def list_users(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(require_admin),
+async def list_users(
+    db: AsyncSession = Depends(get_db),
+    current_user: UserPrincipal = Depends(require_admin),
 ):
-    """List all users (admin only)."""
-    users = db.query(User).all()
-    return [UserResponse.model_validate(u) for u in users]
+    """List all users (admin only), read as columns and encoded in one pass."""
+    fields = list(UserResponse.model_fields)
+    rows = await db.execute(select(*(getattr(User, name) for name in fields)))
+    return list_response(UserResponse, row_dicts(fields, rows))
 
 
 @router.get("/{user_id}", response_model=UserResponse)
-def get_user(
+async def get_user(
     user_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+    current_user: UserPrincipal = Depends(get_current_user),
 ):
     """Get a specific user by ID."""
-    user = db.query(User).filter(User.id == user_id).first()
+    user = await db.get(User, user_id)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -49,14 +67,14 @@ def get_user(
 
 
 @router.put("/{user_id}", response_model=UserResponse)
-def update_user(
+async def update_user(
     user_id: int,
     payload: UserUpdate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+    current_user: UserPrincipal = Depends(get_current_user),
 ):
     """Update a user. Only admins can update other users or change admin status."""
-    user = db.query(User).filter(User.id == user_id).first()
+    user = await db.get(User, user_id)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -81,19 +99,26 @@ def update_user(
     for key, value in update_data.items():
         setattr(user, key, value)
 
-    db.commit()
-    db.refresh(user)
+    await db.commit()
+    await db.refresh(user)
+    invalidate_principal(user.id)
     return UserResponse.model_validate(user)
 
 
 @router.delete("/{user_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_user(
+async def delete_user(
     user_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(require_admin),
+    db: AsyncSession = Depends(get_db),
+    current_user: UserPrincipal = Depends(require_admin),
 ):
     """Delete a user (admin only)."""
-    user = db.query(User).filter(User.id == user_id).first()
+    # Load task collections up front: the ORM detaches them on delete and
+    # lazy loading is not available under asyncio.
+    user = await db.get(
+        User,
+        user_id,
+        options=[selectinload(User.assigned_tasks), selectinload(User.created_tasks)],
+    )
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -105,5 +130,11 @@ def delete_user(
             detail="Cannot delete yourself",
         )
 
-    db.delete(user)
-    db.commit()
+    # The delete unassigns the user's tasks; put them on the change feed
+    # (which the task list ETag and stream follow) in the same transaction.
+    unassigned = [task.id for task in user.assigned_tasks]
+    await db.delete(user)
+    await db.flush()
+    await change_feed.record_changes(db, [(t, change_feed.UPDATE) for t in unassigned])
+    await db.commit()
+    invalidate_principal(user_id)
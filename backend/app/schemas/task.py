@@ -2,8 +2,9 @@
 
 from pydantic import BaseModel, Field
 from datetime import datetime
-from typing import Optional
+from typing import Literal, Optional
 from app.models.task import TaskStatus
+from app.schemas.user import UserSummary
 
 
 # --- Request Schemas ---
@@ -34,6 +35,38 @@ class TaskLogTime(BaseModel):
     minutes: int = Field(..., gt=0)
 
 
+# --- Bulk Request Schemas ---
+
+BULK_MAX_ITEMS = 500
+
+
+class TaskBulkCreate(BaseModel):
+    """Create many tasks in one transaction."""
+    tasks: list[TaskCreate] = Field(..., min_length=1, max_length=BULK_MAX_ITEMS)
+
+
+class TaskStatusChange(BaseModel):
+    """One status transition within a bulk request."""
+    task_id: int
+    status: TaskStatus
+
+
+class TaskBulkStatusUpdate(BaseModel):
+    """Apply many status transitions in one transaction, in order."""
+    items: list[TaskStatusChange] = Field(..., min_length=1, max_length=BULK_MAX_ITEMS)
+
+
+class TaskTimeEntry(BaseModel):
+    """One time entry within a bulk request."""
+    task_id: int
+    minutes: int = Field(..., gt=0)
+
+
+class TaskBulkLogTime(BaseModel):
+    """Log time against many tasks in one transaction."""
+    items: list[TaskTimeEntry] = Field(..., min_length=1, max_length=BULK_MAX_ITEMS)
+
+
 # --- Response Schemas ---
 
 class TaskResponse(BaseModel):
@@ -51,7 +84,101 @@ class TaskResponse(BaseModel):
     model_config = {"from_attributes": True}
 
 
+class TaskExpanded(TaskResponse):
+    """A task with the users named in ``expand=`` embedded; others are omitted."""
+    assignee: Optional[UserSummary] = None
+    creator: Optional[UserSummary] = None
+
+
 class TaskListResponse(BaseModel):
-    """Paginated task list response."""
+    """Paginated task list response.
+
+    ``total`` is None when the client asked to skip counting, and approximate
+    when ``total_is_estimate`` is set. ``next_cursor`` fetches the following
+    page and is None on the last page.
+    """
     tasks: list[TaskResponse]
-    total: int
+    total: Optional[int]
+    total_is_estimate: bool = False
+    next_cursor: Optional[str] = None
+
+
+class TaskFields(BaseModel):
+    """A task trimmed to the fields named in ``fields=``; the others are omitted."""
+    id: int
+    title: Optional[str] = None
+    description: Optional[str] = None
+    status: Optional[TaskStatus] = None
+    total_minutes: Optional[int] = None
+    assignee_id: Optional[int] = None
+    created_by: Optional[int] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+    assignee: Optional[UserSummary] = None
+    creator: Optional[UserSummary] = None
+
+
+class TaskFieldsListResponse(BaseModel):
+    """``TaskListResponse`` for a ``fields=`` projection."""
+    tasks: list[TaskFields]
+    total: Optional[int]
+    total_is_estimate: bool = False
+    next_cursor: Optional[str] = None
+
+
+class TaskSearchHit(BaseModel):
+    """One search result: the task, its relevance and a highlighted excerpt."""
+    task: TaskResponse
+    score: float = Field(..., description="Relevance; lower is better")
+    snippet: Optional[str] = None
+
+
+class TaskSearchResponse(BaseModel):
+    """A page of search results, best first."""
+    results: list[TaskSearchHit]
+    next_cursor: Optional[str] = None
+
+
+class TaskChangeResponse(BaseModel):
+    """One entry of the change feed; ``task`` is None for deletes."""
+    seq: int
+    task_id: int
+    op: Literal["create", "update", "delete"]
+    changed_at: datetime
+    task: Optional[TaskResponse] = None
+
+
+class TaskChangesResponse(BaseModel):
+    """A batch of changes and the cursor to resume from."""
+    changes: list[TaskChangeResponse]
+    cursor: str
+    has_more: bool
+
+
+class BulkItemResult(BaseModel):
+    """Outcome of one item in a bulk request, by position in the request."""
+    index: int
+    ok: bool
+    task: Optional[TaskResponse] = None
+    error: Optional[str] = None
+
+
+class BulkResponse(BaseModel):
+    """Per-item results of a bulk request."""
+    results: list[BulkItemResult]
+    succeeded: int
+    failed: int
+
+
+class TaskImportError(BaseModel):
+    """A rejected CSV row, by line number in the upload."""
+    line: int
+    error: str
+
+
+class TaskImportResponse(BaseModel):
+    """Outcome of a CSV import; only the first errors are listed."""
+    created: int
+    failed: int
+    errors: list[TaskImportError]
+    errors_truncated: bool = False
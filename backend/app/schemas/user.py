@@ -40,6 +40,12 @@ class UserResponse(BaseModel):
     model_config = {"from_attributes": True}
 
 
+class UserSummary(BaseModel):
+    """Id and username, embedded where a task is expanded."""
+    id: int
+    username: str
+
+
 class TokenResponse(BaseModel):
     """JWT token response after login/register."""
     access_token: str
@@ -1,13 +1,36 @@
 """Authentication service — password hashing and JWT token management."""
 
+import hashlib
+import time
+from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
+from typing import Optional
 from passlib.context import CryptContext
 from jose import JWTError, jwt
 from app.config import get_settings
+from app.services.cache import TTLCache
 
 settings = get_settings()
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+# Recently verified tokens, keyed by SHA-256 digest so raw tokens are never held
+_verified_tokens = TTLCache(
+    maxsize=settings.TOKEN_CACHE_SIZE,
+    ttl=settings.TOKEN_CACHE_TTL_SECONDS,
+)
+
+
+@dataclass(frozen=True)
+class VerifiedToken:
+    """Outcome of verifying one bearer token; ``claims`` is None if invalid."""
+
+    token: str
+    claims: Optional[dict]
+
+    @property
+    def user_id(self) -> Optional[str]:
+        return self.claims.get("sub") if self.claims else None
+
 
 def hash_password(plain_password: str) -> str:
     """Hash a plain-text password using bcrypt."""
@@ -41,3 +64,32 @@ def decode_token(token: str) -> dict:
         return payload
     except JWTError:
         raise
+
+
+def verify_token(token: str) -> dict:
+    """Like ``decode_token``, but reuses a recent verification of the same token.
+
+    The returned claims are shared between callers and must not be mutated.
+    Entries are dropped no later than the token's ``exp``.
+    """
+    digest = hashlib.sha256(token.encode()).digest()
+    claims = _verified_tokens.get(digest)
+    if claims is not None:
+        return claims
+
+    claims = decode_token(token)
+    exp = claims.get("exp")
+    _verified_tokens.set(digest, claims, ttl=(exp - time.time()) if exp else None)
+    return claims
+
+
+def verify_bearer(token: str) -> VerifiedToken:
+    """Verify a bearer token without raising, for sharing via ``request.state``."""
+    try:
+        return VerifiedToken(token=token, claims=verify_token(token))
+    except JWTError:
+        return VerifiedToken(token=token, claims=None)
+
+
+def clear_token_cache() -> None:
+    _verified_tokens.clear()
@@ -0,0 +1,94 @@
+"""Task change feed — a monotonic log of task writes for incremental sync.
+
+Every write path appends ``(task_id, op)`` rows in its own transaction.
+Clients read ``seq > cursor`` in bounded batches and get the current row for
+creates/updates and a tombstone for deletes.
+
+A reader must never see sequence N+1 committed while N is still in flight,
+or it would move its cursor past N for good. SQLite has a single writer, so
+that holds already; on PostgreSQL appends take a transaction-scoped advisory
+lock, which serializes sequence allocation with commit order.
+"""
+
+from typing import Callable, Iterable, Optional
+
+from sqlalchemy import event, func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.models.task import Task, utcnow
+from app.models.task_change import TaskChange
+
+CREATE = "create"
+UPDATE = "update"
+DELETE = "delete"
+
+# Arbitrary application-wide key for pg_advisory_xact_lock
+_FEED_LOCK_KEY = 0x5C_FEED
+_WROTE_FEED = "task_changes_written"
+_commit_listeners: list[Callable[[], None]] = []
+
+
+def on_commit(callback: Callable[[], None]) -> None:
+    """Call ``callback`` after every commit that appended to the feed."""
+    _commit_listeners.append(callback)
+
+
+@event.listens_for(Session, "after_commit")
+def _notify_listeners(session) -> None:
+    if session.info.pop(_WROTE_FEED, False):
+        for callback in _commit_listeners:
+            callback()
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_write(session) -> None:
+    session.info.pop(_WROTE_FEED, None)
+
+
+async def record_changes(db: AsyncSession, changes: Iterable[tuple[int, str]]) -> None:
+    """Append ``(task_id, op)`` rows; call last, just before commit."""
+    at = utcnow()
+    rows = [{"task_id": task_id, "op": op, "changed_at": at} for task_id, op in changes]
+    if not rows:
+        return
+    if db.bind.dialect.name == "postgresql":
+        await db.execute(select(func.pg_advisory_xact_lock(_FEED_LOCK_KEY)))
+    await db.execute(insert(TaskChange), rows)
+    db.info[_WROTE_FEED] = True
+
+
+async def latest_seq(db: AsyncSession) -> int:
+    """Highest sequence number written so far (0 for an empty feed)."""
+    return await db.scalar(select(func.coalesce(func.max(TaskChange.seq), 0)))
+
+
+async def read_changes(db: AsyncSession, since: int, limit: int) -> tuple[list[TaskChange], bool]:
+    """Changes after ``since`` (at most ``limit``), oldest first, and whether more remain."""
+    query = select(TaskChange).where(TaskChange.seq > since).order_by(TaskChange.seq)
+    rows = (await db.scalars(query.limit(limit + 1))).all()
+    return rows[:limit], len(rows) > limit
+
+
+async def with_tasks(
+    db: AsyncSession, changes: list[TaskChange]
+) -> list[tuple[TaskChange, Optional[Task]]]:
+    """Collapse a batch to the latest change per task and attach current rows.
+
+    Tasks are loaded with one ``IN`` query. Deletes carry no task; a create
+    or update whose task has since vanished is skipped, because its
+    tombstone comes later in the feed.
+    """
+    latest = {change.task_id: change for change in changes}
+    live_ids = [task_id for task_id, change in latest.items() if change.op != DELETE]
+    tasks = {}
+    if live_ids:
+        tasks = {t.id: t for t in await db.scalars(select(Task).where(Task.id.in_(live_ids)))}
+
+    resolved = []
+    for change in sorted(latest.values(), key=lambda c: c.seq):
+        task = tasks.get(change.task_id)
+        if change.op != DELETE and task is None:
+            continue
+        resolved.append((change, task))
+    return resolved
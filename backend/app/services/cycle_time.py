@@ -0,0 +1,140 @@
+"""Cycle-time engine — status history and incremental time-in-status sketches.
+
+Every accepted transition appends a ``task_status_events`` row. The time the
+task spent in the status it is leaving is measured against the task's latest
+event (one indexed lookup, never a replay) and folded into the persisted
+``cycle_time_buckets`` counters. ``/stats/cycle-time`` rebuilds one
+``LogBucketSketch`` per status from those counters to answer percentiles.
+
+Callers run these helpers after their guarded task UPDATE, in the same
+transaction: the row lock it holds keeps concurrent transitions of the same
+task from reading the same "latest" event.
+"""
+
+from datetime import datetime, timezone
+from typing import Iterable, Optional
+
+from sqlalchemy import func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.status_event import CycleTimeBucket, TaskStatusEvent
+from app.models.task import TaskStatus, utcnow
+from app.services.sketch import LogBucketSketch
+from app.services.upsert import increment_counters
+
+SKETCH_ALPHA = 0.02
+SKETCH_MIN_SECONDS = 0.001
+PERCENTILES = {"p50": 0.5, "p85": 0.85, "p95": 0.95}
+
+
+def new_sketch() -> LogBucketSketch:
+    return LogBucketSketch(alpha=SKETCH_ALPHA, min_value=SKETCH_MIN_SECONDS)
+
+
+def _as_utc(value: datetime) -> datetime:
+    # SQLite hands timezone-aware columns back naive; they were stored as UTC
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+async def record_created(
+    db: AsyncSession,
+    tasks: Iterable[tuple[int, TaskStatus]],
+    user_id: Optional[int],
+    at: Optional[datetime] = None,
+) -> None:
+    """Record the initial status of newly created ``(task_id, status)`` pairs."""
+    at = at or utcnow()
+    rows = [
+        {"task_id": task_id, "from_status": None, "to_status": status,
+         "changed_by": user_id, "occurred_at": at}
+        for task_id, status in tasks
+    ]
+    if rows:
+        await db.execute(insert(TaskStatusEvent), rows)
+
+
+async def record_transitions(
+    db: AsyncSession,
+    changes: list[tuple[int, TaskStatus]],
+    user_id: Optional[int],
+    at: Optional[datetime] = None,
+) -> None:
+    """Append events for applied ``(task_id, new_status)`` changes, in order.
+
+    Durations are added to the sketch counters of the status each task left.
+    Several changes to one task in the same batch chain off each other.
+    """
+    if not changes:
+        return
+    at = at or utcnow()
+    latest_ids = (
+        select(func.max(TaskStatusEvent.id))
+        .where(TaskStatusEvent.task_id.in_({task_id for task_id, _ in changes}))
+        .group_by(TaskStatusEvent.task_id)
+    )
+    latest = await db.execute(
+        select(TaskStatusEvent.task_id, TaskStatusEvent.to_status, TaskStatusEvent.occurred_at)
+        .where(TaskStatusEvent.id.in_(latest_ids))
+    )
+    last = {task_id: (status, _as_utc(occurred_at)) for task_id, status, occurred_at in latest}
+
+    sketch = new_sketch()
+    events, buckets = [], {}
+    for task_id, new_status in changes:
+        from_status, duration = None, None
+        if task_id in last:
+            from_status, entered_at = last[task_id]
+            duration = max((at - entered_at).total_seconds(), 0.0)
+            key = (from_status, sketch.key(duration))
+            bucket = buckets.setdefault(key, {
+                "status": from_status, "bucket": key[1], "count": 0, "total_seconds": 0.0,
+            })
+            bucket["count"] += 1
+            bucket["total_seconds"] += duration
+        events.append({
+            "task_id": task_id, "from_status": from_status, "to_status": new_status,
+            "changed_by": user_id, "occurred_at": at, "duration_seconds": duration,
+        })
+        last[task_id] = (new_status, at)
+
+    await db.execute(insert(TaskStatusEvent), events)
+    await increment_counters(
+        db, CycleTimeBucket, ["status", "bucket"], ["count", "total_seconds"],
+        list(buckets.values()),
+    )
+
+
+async def cycle_time_report(db: AsyncSession) -> list[dict]:
+    """Count, mean and percentiles of time spent in each status, in seconds."""
+    counts = {status: {} for status in TaskStatus}
+    totals = {status: 0.0 for status in TaskStatus}
+    rows = await db.execute(
+        select(
+            CycleTimeBucket.status,
+            CycleTimeBucket.bucket,
+            CycleTimeBucket.count,
+            CycleTimeBucket.total_seconds,
+        )
+    )
+    for status, bucket, count, total in rows:
+        counts[status][bucket] = count
+        totals[status] += total
+    sketches = {
+        status: LogBucketSketch.from_counts(
+            counts[status], totals[status], alpha=SKETCH_ALPHA, min_value=SKETCH_MIN_SECONDS
+        )
+        for status in TaskStatus
+    }
+
+    report = []
+    for status, sketch in sketches.items():
+        entry = {
+            "status": status.value,
+            "transitions": sketch.count,
+            "avg_seconds": round(sketch.sum / sketch.count, 1) if sketch.count else None,
+        }
+        for name, q in PERCENTILES.items():
+            value = sketch.quantile(q)
+            entry[f"{name}_seconds"] = round(value, 1) if value is not None else None
+        report.append(entry)
+    return report
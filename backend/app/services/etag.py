@@ -0,0 +1,44 @@
+"""Weak ETags for polled read endpoints.
+
+A validator is a cheap aggregate that changes whenever the underlying rows
+could have (e.g. ``max(updated_at)`` and ``count(*)``). It is hashed together
+with the request's query parameters, so every distinct listing gets its own
+tag, and compared against ``If-None-Match`` before the row query runs.
+"""
+
+import hashlib
+from typing import Any
+
+from fastapi import Request, Response, status
+
+# Clients must revalidate on every poll; responses depend on the caller's auth
+CACHE_CONTROL = "private, no-cache"
+
+
+def make_etag(*parts: Any) -> str:
+    """Weak ETag over the validator parts, in order."""
+    digest = hashlib.sha1(repr(parts).encode()).hexdigest()[:20]
+    return f'W/"{digest}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Weak comparison of ``etag`` against the request's ``If-None-Match``."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == opaque for tag in header.split(","))
+
+
+def not_modified(etag: str) -> Response:
+    return Response(
+        status_code=status.HTTP_304_NOT_MODIFIED,
+        headers={"ETag": etag, "Cache-Control": CACHE_CONTROL},
+    )
+
+
+def set_etag(response: Response, etag: str) -> None:
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = CACHE_CONTROL
@@ -0,0 +1,116 @@
+"""Password hashing executor — keeps bcrypt off the request threadpool.
+
+bcrypt is deliberately slow. Running it inline in a request handler ties up
+one of the workers every other sync route shares, so login storms stall
+unrelated traffic. Hashing requests are instead submitted to a dedicated,
+bounded process pool and awaited. When more than ``HASH_QUEUE_LIMIT`` jobs
+are pending we fail fast with ``HashingBusyError`` rather than queueing.
+"""
+
+import asyncio
+import threading
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Optional
+
+from app.config import get_settings
+from app.services.auth_service import hash_password, verify_password
+
+settings = get_settings()
+
+LATENCY_BUCKETS = [0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0]
+
+
+class HashingBusyError(RuntimeError):
+    """Raised when the hashing queue is full."""
+
+
+_executor: Optional[Executor] = None
+_lock = threading.Lock()
+_pending = 0
+_stats = {
+    "completed": 0,
+    "rejected": 0,
+    "latency_sum": 0.0,
+    "latency_max": 0.0,
+    "latency_buckets": [0] * len(LATENCY_BUCKETS),
+}
+
+
+def _get_executor() -> Executor:
+    """Create the pool lazily so importing the app never forks."""
+    global _executor
+    with _lock:
+        if _executor is None:
+            if settings.HASH_WORKERS > 0:
+                _executor = ProcessPoolExecutor(max_workers=settings.HASH_WORKERS)
+            else:
+                # HASH_WORKERS=0: in-process fallback for platforms without fork
+                _executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="hash")
+        return _executor
+
+
+def _observe(latency: float) -> None:
+    _stats["completed"] += 1
+    _stats["latency_sum"] += latency
+    _stats["latency_max"] = max(_stats["latency_max"], latency)
+    for i, bound in enumerate(LATENCY_BUCKETS):
+        if latency <= bound:
+            _stats["latency_buckets"][i] += 1
+            break
+
+
+async def _submit(fn, *args):
+    global _pending
+    with _lock:
+        if _pending >= settings.HASH_QUEUE_LIMIT:
+            _stats["rejected"] += 1
+            raise HashingBusyError("Password hashing queue is full")
+        _pending += 1
+
+    start = time.perf_counter()
+    try:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_get_executor(), fn, *args)
+    finally:
+        with _lock:
+            _pending -= 1
+            _observe(time.perf_counter() - start)
+
+
+async def hash_password_async(plain_password: str) -> str:
+    """Hash a password on the hashing executor."""
+    return await _submit(hash_password, plain_password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password on the hashing executor."""
+    return await _submit(verify_password, plain_password, hashed_password)
+
+
+def hashing_stats() -> dict:
+    """Queue depth and latency histogram for the /metrics payload."""
+    with _lock:
+        cumulative, running = {}, 0
+        for bound, count in zip(LATENCY_BUCKETS, _stats["latency_buckets"]):
+            running += count
+            cumulative[f"le_{bound}"] = running
+        cumulative["count"] = _stats["completed"]
+        cumulative["sum"] = round(_stats["latency_sum"], 4)
+        return {
+            "workers": settings.HASH_WORKERS,
+            "queue_depth": _pending,
+            "queue_limit": settings.HASH_QUEUE_LIMIT,
+            "rejected_total": _stats["rejected"],
+            "latency_seconds": cumulative,
+            "latency_seconds_max": round(_stats["latency_max"], 4),
+        }
+
+
+def shutdown_hash_executor() -> None:
+    """Stop the worker pool (called on application shutdown)."""
+    global _executor
+    with _lock:
+        if _executor is not None:
+            _executor.shutdown(wait=False, cancel_futures=True)
+            _executor = None
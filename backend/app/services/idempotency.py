@@ -0,0 +1,187 @@
+"""Idempotency keys — replay the first response to a retried write.
+
+A client that sends ``Idempotency-Key`` on a write gets the same response for
+every retry with that key: the first request runs and its response is kept;
+later ones are answered from the store without running the handler. A retry
+that arrives while the first is still running waits for it instead of
+running alongside it.
+
+Keys are scoped to the user and the route and remembered for
+``IDEMPOTENCY_TTL_SECONDS`` in a bounded LRU (``TTLCache``), so this protects
+retries that land on the same worker. Only successful (2xx) responses are
+kept; after an error the key is released and a retry runs again. Reusing a
+key with a different request body is refused.
+"""
+
+import asyncio
+import hashlib
+import threading
+from dataclasses import dataclass, field
+from typing import Hashable, Optional
+
+from fastapi import Response
+
+from app.config import get_settings
+from app.services.cache import TTLCache
+
+settings = get_settings()
+
+REPLAYED_HEADER = "Idempotent-Replayed"
+
+
+class IdempotencyKeyReused(ValueError):
+    """The key was already used for a different request."""
+
+
+class IdempotencyInProgress(RuntimeError):
+    """The original request is still running after the wait timeout."""
+
+
+@dataclass(frozen=True)
+class StoredResponse:
+    fingerprint: str
+    status_code: int
+    body: bytes
+    media_type: Optional[str]
+
+    def replay(self) -> Response:
+        return Response(
+            content=self.body,
+            status_code=self.status_code,
+            media_type=self.media_type,
+            headers={REPLAYED_HEADER: "true"},
+        )
+
+
+@dataclass
+class _InFlight:
+    fingerprint: str
+    waiters: list = field(default_factory=list)  # (loop, asyncio.Event)
+
+
+def fingerprint(method: str, path: str, body: bytes) -> str:
+    """Digest identifying the request a key was first used for."""
+    digest = hashlib.sha256(f"{method} {path}\n".encode())
+    digest.update(body)
+    return digest.hexdigest()
+
+
+class IdempotencyStore:
+    """Completed responses in a TTL-bounded LRU plus the requests still running."""
+
+    def __init__(self, maxsize: int, ttl: float, max_body_bytes: int, wait_timeout: float):
+        self.max_body_bytes = max_body_bytes
+        self.wait_timeout = wait_timeout
+        self._done = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._in_flight: dict[Hashable, _InFlight] = {}
+        self._lock = threading.Lock()
+        self.replays = 0
+        self.waits = 0
+        self.conflicts = 0
+        self.too_large = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self._done.enabled
+
+    async def begin(self, key: Hashable, request_fingerprint: str) -> Optional[StoredResponse]:
+        """Return the stored response for ``key``, or claim it and return None.
+
+        A caller that gets None must call ``finish`` exactly once. Raises
+        ``IdempotencyKeyReused`` or ``IdempotencyInProgress``.
+        """
+        while True:
+            with self._lock:
+                stored = self._done.get(key)
+                if stored is not None:
+                    if stored.fingerprint != request_fingerprint:
+                        self.conflicts += 1
+                        raise IdempotencyKeyReused(key)
+                    self.replays += 1
+                    return stored
+                running = self._in_flight.get(key)
+                if running is None:
+                    self._in_flight[key] = _InFlight(request_fingerprint)
+                    return None
+                if running.fingerprint != request_fingerprint:
+                    self.conflicts += 1
+                    raise IdempotencyKeyReused(key)
+                done = asyncio.Event()
+                running.waiters.append((asyncio.get_running_loop(), done))
+                self.waits += 1
+            try:
+                await asyncio.wait_for(done.wait(), self.wait_timeout)
+            except asyncio.TimeoutError:
+                raise IdempotencyInProgress(key)
+            # Replay what the first request stored, or take over if it failed
+
+    def finish(self, key: Hashable, response: Optional[Response]) -> None:
+        """Release ``key``, keeping ``response`` if it is a storable success."""
+        with self._lock:
+            running = self._in_flight.pop(key, None)
+            if response is not None and 200 <= response.status_code < 300:
+                if len(response.body) > self.max_body_bytes:
+                    self.too_large += 1
+                elif running is not None:
+                    self._done.set(key, StoredResponse(
+                        running.fingerprint, response.status_code, response.body,
+                        response.media_type,
+                    ))
+        for loop, done in running.waiters if running is not None else ():
+            try:
+                loop.call_soon_threadsafe(done.set)
+            except RuntimeError:
+                pass  # that waiter's loop is gone
+
+    def clear(self) -> None:
+        with self._lock:
+            self._done.clear()
+
+    def stats(self) -> dict:
+        """Store size, eviction and replay counters for the /metrics payload."""
+        done = self._done.stats()
+        return {
+            "size": done["size"],
+            "maxsize": done["maxsize"],
+            "in_flight": len(self._in_flight),
+            "replays_total": self.replays,
+            "waits_total": self.waits,
+            "conflicts_total": self.conflicts,
+            "evictions_total": done["evictions"],
+            "not_stored_too_large_total": self.too_large,
+        }
+
+
+class IdempotentAttempt:
+    """One request's claim on an idempotency key (a no-op without a key).
+
+    Return ``replay`` when it is set; otherwise pass the handler's response
+    through ``save`` so retries get the same one.
+    """
+
+    def __init__(self, store: Optional[IdempotencyStore] = None, key: Hashable = None,
+                 replay: Optional[Response] = None):
+        self.store = store
+        self.key = key
+        self.replay = replay
+        self._finished = store is None or replay is not None
+
+    def save(self, response: Response) -> Response:
+        if not self._finished:
+            self._finished = True
+            self.store.finish(self.key, response)
+        return response
+
+    def release(self) -> None:
+        """Give the key up without storing anything (the request failed)."""
+        if not self._finished:
+            self._finished = True
+            self.store.finish(self.key, None)
+
+
+store = IdempotencyStore(
+    maxsize=settings.IDEMPOTENCY_CACHE_SIZE,
+    ttl=settings.IDEMPOTENCY_TTL_SECONDS,
+    max_body_bytes=settings.IDEMPOTENCY_MAX_BODY_BYTES,
+    wait_timeout=settings.IDEMPOTENCY_WAIT_SECONDS,
+)
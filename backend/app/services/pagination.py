@@ -0,0 +1,44 @@
+"""Opaque cursors for keyset pagination.
+
+A cursor is the sort key of the last row on a page, JSON-encoded and wrapped
+in URL-safe base64 so clients treat it as an opaque token.
+"""
+
+import base64
+import json
+from datetime import datetime
+from typing import Any
+
+
+class InvalidCursor(ValueError):
+    """Raised when a client sends a cursor we did not issue."""
+
+
+def _default(value: Any):
+    if isinstance(value, datetime):
+        return {"dt": value.isoformat()}
+    raise TypeError(f"Cannot encode {type(value).__name__} in a cursor")
+
+
+def _hook(obj: dict):
+    if set(obj) == {"dt"}:
+        return datetime.fromisoformat(obj["dt"])
+    return obj
+
+
+def encode_cursor(*key: Any) -> str:
+    """Encode a sort key tuple into an opaque cursor string."""
+    raw = json.dumps(list(key), default=_default, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, arity: int) -> list:
+    """Decode a cursor back into its sort key; raises ``InvalidCursor``."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        key = json.loads(base64.urlsafe_b64decode(padded.encode()), object_hook=_hook)
+    except (ValueError, TypeError) as exc:
+        raise InvalidCursor("Invalid cursor") from exc
+    if not isinstance(key, list) or len(key) != arity:
+        raise InvalidCursor("Invalid cursor")
+    return key
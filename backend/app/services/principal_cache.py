@@ -0,0 +1,72 @@
+"""Principal cache — lightweight snapshots of authenticated users.
+
+Every protected route resolves the caller from the JWT. Instead of loading the
+``User`` row on each request, we keep a short-lived snapshot keyed by
+``(user_id, token exp)``. Entries never outlive the token they were built for,
+and routes that modify a user call ``invalidate_principal`` so role and profile
+changes take effect immediately on this process (other workers converge within
+``PRINCIPAL_CACHE_TTL_SECONDS``).
+"""
+
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional
+
+from app.config import get_settings
+from app.services.cache import TTLCache
+
+settings = get_settings()
+
+
+@dataclass(frozen=True)
+class UserPrincipal:
+    """Detached, read-only view of the authenticated user."""
+
+    id: int
+    username: str
+    email: str
+    is_admin: bool
+    created_at: Optional[datetime]
+
+    @classmethod
+    def from_user(cls, user) -> "UserPrincipal":
+        return cls(
+            id=user.id,
+            username=user.username,
+            email=user.email,
+            is_admin=user.is_admin,
+            created_at=user.created_at,
+        )
+
+
+_principals = TTLCache(
+    maxsize=settings.PRINCIPAL_CACHE_SIZE,
+    ttl=settings.PRINCIPAL_CACHE_TTL_SECONDS,
+)
+
+
+def get_principal(user_id: int, exp: Optional[float]) -> Optional[UserPrincipal]:
+    """Return the cached principal for this user/token pair, if still fresh."""
+    return _principals.get((user_id, exp))
+
+
+def cache_principal(principal: UserPrincipal, exp: Optional[float]) -> None:
+    """Cache a principal, never beyond the token's own expiry."""
+    ttl = None
+    if exp is not None:
+        ttl = float(exp) - time.time()
+    _principals.set((principal.id, exp), principal, ttl=ttl)
+
+
+def invalidate_principal(user_id: int) -> None:
+    """Forget every cached snapshot of ``user_id`` (all of their tokens)."""
+    _principals.discard_where(lambda key: key[0] == user_id)
+
+
+def clear_principal_cache() -> None:
+    _principals.clear()
+
+
+def principal_cache_stats() -> dict:
+    return _principals.stats()
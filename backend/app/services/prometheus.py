@@ -0,0 +1,130 @@
+"""Prometheus text exposition (format 0.0.4) of the /metrics payload.
+
+Renders the same numbers as the JSON view: request counters and latency
+histograms per route template and method, a latency summary with the sketch
+quantiles, and the application, pool, hashing, stream and idempotency
+gauges. Keys ending in ``_total`` become counters; everything else numeric
+is a gauge.
+"""
+
+import math
+from typing import Iterable, Optional
+
+from app.services.request_metrics import QUANTILES
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+PREFIX = "sprintsync_"
+
+Sample = tuple[str, dict, float]  # (name suffix, labels, value)
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", r"\\").replace("\n", r"\n").replace('"', r"\"")
+
+
+def _format_value(value: float) -> str:
+    if value is None or (isinstance(value, float) and math.isnan(value)):
+        return "NaN"
+    if isinstance(value, bool):
+        return "1" if value else "0"
+    if isinstance(value, float) and math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+def _sample_line(name: str, labels: dict, value) -> str:
+    if labels:
+        rendered = ",".join(f'{key}="{_escape(v)}"' for key, v in labels.items())
+        return f"{name}{{{rendered}}} {_format_value(value)}"
+    return f"{name} {_format_value(value)}"
+
+
+class Exposition:
+    """Collects metric families and renders them as text, one family each."""
+
+    def __init__(self, prefix: str = PREFIX):
+        self.prefix = prefix
+        self._families: dict[str, tuple[str, str, list[Sample]]] = {}
+
+    def add(self, name: str, kind: str, help_text: str, samples: Iterable[Sample]) -> None:
+        family = self._families.setdefault(name, (kind, help_text, []))
+        family[2].extend(samples)
+
+    def gauge(self, name: str, help_text: str, value, labels: Optional[dict] = None) -> None:
+        kind = "counter" if name.endswith("_total") else "gauge"
+        self.add(name, kind, help_text, [("", labels or {}, value)])
+
+    def render(self) -> str:
+        lines = []
+        for name, (kind, help_text, samples) in self._families.items():
+            full = self.prefix + name
+            lines.append(f"# HELP {full} {help_text}")
+            lines.append(f"# TYPE {full} {kind}")
+            lines.extend(_sample_line(full + suffix, labels, value) for suffix, labels, value in samples)
+        return "\n".join(lines) + "\n"
+
+
+def _histogram_samples(histogram: dict, labels: dict) -> list[Sample]:
+    samples = []
+    for key, value in histogram.items():
+        if key.startswith("le_"):
+            samples.append(("_bucket", {**labels, "le": key[3:]}, value))
+    samples.append(("_bucket", {**labels, "le": "+Inf"}, histogram["count"]))
+    samples.append(("_sum", labels, histogram["sum"]))
+    samples.append(("_count", labels, histogram["count"]))
+    return samples
+
+
+def _flat(exposition: Exposition, section: str, values: dict, help_text: str) -> None:
+    for key, value in values.items():
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            exposition.gauge(f"{section}_{key}", help_text, value)
+
+
+def render_metrics(payload: dict) -> str:
+    """Render the dict built by ``GET /metrics`` as Prometheus text."""
+    out = Exposition()
+    out.gauge("uptime_seconds", "Seconds since this process started.", payload["uptime_seconds"])
+    out.gauge("workers", "Worker processes whose request counters are merged here.",
+              payload["workers"])
+
+    for series, route in payload["routes"].items():
+        method, template = series.split(" ", 1)
+        labels = {"method": method, "route": template}
+        out.add(
+            "http_requests_total", "counter", "Requests by route template, method and status.",
+            [("", {**labels, "status": code}, n) for code, n in route["requests_total"].items()],
+        )
+        histogram = route["latency_seconds"]
+        out.add(
+            "http_request_duration_seconds", "histogram", "Request latency by route template.",
+            _histogram_samples(histogram, labels),
+        )
+        out.add(
+            "http_request_duration_quantile_seconds", "summary",
+            "Request latency quantiles (log-bucket sketch, 1% relative error).",
+            [
+                ("", {**labels, "quantile": str(q)}, route[f"latency_seconds_{name}"])
+                for name, q in QUANTILES.items()
+            ] + [("_sum", labels, histogram["sum"]), ("_count", labels, histogram["count"])],
+        )
+
+    gauges = payload["gauges"]
+    out.gauge("users", "Registered users.", gauges["active_users"])
+    for status, count in gauges["tasks_by_status"].items():
+        out.gauge("tasks", "Tasks by status.", count, {"status": status})
+
+    for engine, pool in payload["database_pool"].items():
+        for key, value in pool.items():
+            if isinstance(value, (int, float)):
+                out.gauge(f"db_pool_{key}", "Connection pool statistics.", value, {"engine": engine})
+
+    hashing = payload["password_hashing"]
+    _flat(out, "password_hashing", hashing, "Password hashing executor statistics.")
+    out.add(
+        "password_hashing_latency_seconds", "histogram", "Password hashing latency.",
+        _histogram_samples(hashing["latency_seconds"], {}),
+    )
+    _flat(out, "task_stream", payload["task_stream"], "Task stream (SSE) statistics.")
+    _flat(out, "idempotency", payload["idempotency"], "Idempotency-Key store statistics.")
+    return out.render()
@@ -0,0 +1,275 @@
+"""Request counters and latency distributions, per route template and method.
+
+Each request costs O(1): one status counter, one histogram bucket found by
+bisection, and one ``LogBucketSketch`` counter for quantiles. Nothing grows
+with traffic. Series are keyed by route template (``/tasks/{task_id}``),
+never the raw path, and capped at ``max_routes``; anything beyond that is
+folded into ``OTHER_ROUTE``.
+
+Under ``uvicorn --workers N`` every worker process has its own counters. With
+a ``directory`` configured, each worker also writes its counters to its own
+file there and reads the other workers' files back, from a background
+thread every ``flush_interval`` seconds (and at startup and shutdown). A
+snapshot merges this worker's live counters with the last read of the
+others, in memory, so any worker answers for the whole node and neither the
+request path nor a scrape touches the disk. Counters are cumulative, so files of exited workers
+are kept and still count; empty the directory when the server starts, as
+with ``prometheus_client``'s multiprocess mode.
+"""
+
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from typing import Optional
+
+from app.services.sketch import LogBucketSketch
+
+LATENCY_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUANTILES = {"p50": 0.5, "p95": 0.95, "p99": 0.99}
+SKETCH_ALPHA = 0.01
+SKETCH_MIN_SECONDS = 1e-5
+OTHER_ROUTE = "<other>"
+WORKER_FILE_PREFIX = "requests_"
+
+
+def new_sketch() -> LogBucketSketch:
+    return LogBucketSketch(alpha=SKETCH_ALPHA, min_value=SKETCH_MIN_SECONDS)
+
+
+class RouteStats:
+    """Counters for one ``(method, route)`` series."""
+
+    __slots__ = ("statuses", "buckets", "count", "sum", "sketch")
+
+    def __init__(self):
+        self.statuses: dict[int, int] = {}
+        self.buckets = [0] * (len(LATENCY_BUCKETS) + 1)  # last one is +Inf
+        self.count = 0
+        self.sum = 0.0
+        self.sketch = new_sketch()
+
+    def observe(self, status_code: int, latency_s: float) -> None:
+        self.statuses[status_code] = self.statuses.get(status_code, 0) + 1
+        self.buckets[bisect_left(LATENCY_BUCKETS, latency_s)] += 1
+        self.count += 1
+        self.sum += latency_s
+        self.sketch.add(latency_s)
+
+    def merge(self, other: "RouteStats") -> None:
+        for status_code, n in other.statuses.items():
+            self.statuses[status_code] = self.statuses.get(status_code, 0) + n
+        self.buckets = [a + b for a, b in zip(self.buckets, other.buckets)]
+        self.count += other.count
+        self.sum += other.sum
+        self.sketch.merge(other.sketch)
+
+    def to_state(self) -> dict:
+        """JSON-serialisable copy of the counters (for the worker file)."""
+        return {
+            "statuses": {str(code): n for code, n in self.statuses.items()},
+            "buckets": list(self.buckets),
+            "count": self.count,
+            "sum": self.sum,
+            "sketch": {str(k): n for k, n in self.sketch.counts.items()},
+        }
+
+    @classmethod
+    def from_state(cls, state: dict) -> "RouteStats":
+        stats = cls()
+        stats.statuses = {int(code): n for code, n in state["statuses"].items()}
+        stats.buckets = list(state["buckets"])
+        stats.count = state["count"]
+        stats.sum = state["sum"]
+        stats.sketch = LogBucketSketch.from_counts(
+            {int(k): n for k, n in state["sketch"].items()}, state["sum"],
+            alpha=SKETCH_ALPHA, min_value=SKETCH_MIN_SECONDS,
+        )
+        return stats
+
+
+def histogram(buckets: list[int], count: int, total: float) -> dict:
+    """Cumulative ``le_<bound>`` counts plus count and sum, as on /metrics."""
+    cumulative, running = {}, 0
+    for bound, n in zip(LATENCY_BUCKETS, buckets):
+        running += n
+        cumulative[f"le_{bound}"] = running
+    cumulative["count"] = count
+    cumulative["sum"] = round(total, 4)
+    return cumulative
+
+
+def quantiles(sketch: LogBucketSketch) -> dict:
+    result = {}
+    for name, q in QUANTILES.items():
+        value = sketch.quantile(q)
+        result[name] = round(value, 6) if value is not None else None
+    return result
+
+
+class RequestMetrics:
+    """Thread-safe per-route request statistics for one process.
+
+    With ``directory`` set, snapshots cover every worker writing there.
+    """
+
+    def __init__(self, max_routes: int = 200, directory: Optional[str] = None,
+                 flush_interval: float = 1.0):
+        self.max_routes = max_routes
+        self.directory = directory or None
+        self.flush_interval = flush_interval
+        self.start_time = time.time()
+        self._routes: dict[tuple[str, str], RouteStats] = {}
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()  # flusher thread vs. close()
+        self._dirty = False
+        self._file: Optional[tuple[int, str]] = None  # (pid, path)
+        # Other workers' counters, merged, and how many files they came from
+        self._others: tuple[dict[tuple[str, str], RouteStats], int] = ({}, 0)
+        self._stop = threading.Event()
+        self._flusher: Optional[threading.Thread] = None
+
+    def record(self, method: str, route: str, status_code: int, latency_s: float) -> None:
+        key = (method, route)
+        with self._lock:
+            stats = self._routes.get(key)
+            if stats is None:
+                if len(self._routes) >= self.max_routes:
+                    key = (method, OTHER_ROUTE)
+                stats = self._routes.setdefault(key, RouteStats())
+            stats.observe(status_code, latency_s)
+            self._dirty = True
+
+    def reset(self) -> None:
+        with self._lock:
+            self._routes.clear()
+            self._dirty = True
+
+    # --- Cross-worker sharing (only with ``directory``) ---
+
+    def _path(self) -> str:
+        """This process's file; a forked child gets a new one."""
+        pid = os.getpid()
+        if self._file is None or self._file[0] != pid:
+            name = f"{WORKER_FILE_PREFIX}{pid}_{time.time_ns()}.json"
+            self._file = (pid, os.path.join(self.directory, name))
+        return self._file[1]
+
+    def flush(self) -> None:
+        """Write this process's counters to its file, replacing it atomically."""
+        with self._flush_lock:
+            with self._lock:
+                routes = [[method, route, stats.to_state()]
+                          for (method, route), stats in self._routes.items()]
+                self._dirty = False
+            path = self._path()
+            tmp = f"{path}.tmp"
+            with open(tmp, "w") as f:
+                json.dump({"routes": routes}, f)
+            os.replace(tmp, path)
+
+    def start(self) -> None:
+        """Begin periodic flushing in a daemon thread (no-op without ``directory``)."""
+        if not self.directory or self._flusher is not None:
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        self._stop.clear()
+        self.flush()
+        self.sync()
+        self._flusher = threading.Thread(
+            target=self._flush_loop, name="request-metrics-flush", daemon=True
+        )
+        self._flusher.start()
+
+    def _flush_loop(self) -> None:
+        while not self._stop.wait(self.flush_interval):
+            self.sync()
+
+    def close(self) -> None:
+        """Stop the flusher and write the final counters."""
+        if self._flusher is not None:
+            self._stop.set()
+            self._flusher.join()
+            self._flusher = None
+        if self.directory:
+            self.flush()
+
+    def sync(self) -> None:
+        """Write this worker's file if it changed, then re-read the others'."""
+        if self._dirty:
+            self.flush()
+        own = os.path.basename(self._path())
+        others: dict[tuple[str, str], RouteStats] = {}
+        workers = 0
+        for name in sorted(os.listdir(self.directory)):
+            if name == own or not (
+                name.startswith(WORKER_FILE_PREFIX) and name.endswith(".json")
+            ):
+                continue
+            try:
+                with open(os.path.join(self.directory, name)) as f:
+                    state = json.load(f)
+            except (OSError, ValueError):
+                continue  # removed while listing
+            workers += 1
+            for method, route, route_state in state["routes"]:
+                _merge(others, method, route, RouteStats.from_state(route_state), self.max_routes)
+        self._others = (others, workers)
+
+    def snapshot(self) -> dict:
+        """Totals across routes plus a breakdown per ``"METHOD /template"``.
+
+        With ``directory`` set, other workers' counters are as of the last
+        ``sync``; this worker's are current.
+        """
+        if not self.directory:
+            with self._lock:
+                return _summarize(self._routes, 1)
+        others, other_workers = self._others
+        merged: dict[tuple[str, str], RouteStats] = {}
+        with self._lock:
+            for (method, route), stats in self._routes.items():
+                _merge(merged, method, route, stats, self.max_routes)
+        for (method, route), stats in others.items():
+            _merge(merged, method, route, stats, self.max_routes)
+        return _summarize(merged, 1 + other_workers)
+
+
+def _merge(
+    into: dict[tuple[str, str], RouteStats], method: str, route: str, stats: RouteStats,
+    max_routes: int,
+) -> None:
+    """Add ``stats`` to ``into`` (a fresh copy), folding past ``max_routes``."""
+    key = (method, route)
+    if key not in into and len(into) >= max_routes:
+        key = (method, OTHER_ROUTE)
+    into.setdefault(key, RouteStats()).merge(stats)
+
+
+def _summarize(stats_by_route: dict[tuple[str, str], RouteStats], workers: int) -> dict:
+    requests_total, routes = {}, {}
+    all_buckets = [0] * (len(LATENCY_BUCKETS) + 1)
+    all_count, all_sum, all_sketch = 0, 0.0, new_sketch()
+    for (method, template), stats in sorted(stats_by_route.items()):
+        series = f"{method} {template}"
+        for status_code, n in sorted(stats.statuses.items()):
+            requests_total[f"{series} {status_code}"] = n
+        routes[series] = {
+            "requests_total": {str(code): n for code, n in sorted(stats.statuses.items())},
+            "latency_seconds": histogram(stats.buckets, stats.count, stats.sum),
+            **{f"latency_seconds_{k}": v for k, v in quantiles(stats.sketch).items()},
+        }
+        all_buckets = [a + b for a, b in zip(all_buckets, stats.buckets)]
+        all_count += stats.count
+        all_sum += stats.sum
+        all_sketch.merge(stats.sketch)
+
+    latency = histogram(all_buckets, all_count, all_sum)
+    latency.update(quantiles(all_sketch))
+    return {
+        "workers": workers,
+        "requests_total": requests_total,
+        "request_latency_seconds": latency,
+        "routes": routes,
+    }
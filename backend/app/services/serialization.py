@@ -0,0 +1,99 @@
+"""One-pass JSON encoding for list responses.
+
+Returning a model from a route makes FastAPI validate it again against
+``response_model`` and walk it with ``jsonable_encoder`` before encoding —
+on top of the ``model_validate`` each row already went through. List routes
+instead return a ``Response`` encoded once by pydantic-core;
+``response_model`` stays on the route for the OpenAPI schema.
+
+- Large pages (``rows_response``/``list_response``) are encoded straight from
+  column rows turned into dicts (``row_dicts``), through a ``TypedDict`` derived from the response
+  model's fields. Neither validation nor model instances are involved, and
+  keys missing from a row are simply omitted (``fields=`` projections).
+- Smaller nested payloads build their models with ``model_construct`` (see
+  ``from_object``) and go through ``json_response``.
+
+``benchmarks/bench_serialization.py`` compares these with the old path.
+"""
+
+from functools import lru_cache
+from typing import Any, Iterable, Sequence, TypeVar, Union, get_args, get_origin
+
+from fastapi import Response
+from pydantic import BaseModel, TypeAdapter
+from typing_extensions import TypedDict
+
+M = TypeVar("M", bound=BaseModel)
+
+
+def from_object(model: type[M], obj: Any) -> M:
+    """Unvalidated ``model`` from an ORM object's attributes."""
+    return model.model_construct(**{name: getattr(obj, name) for name in model.model_fields})
+
+
+def _as_dicts(annotation):
+    """``annotation`` with nested models replaced by their row TypedDicts."""
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return _row_type(annotation)
+    origin, args = get_origin(annotation), get_args(annotation)
+    if origin is Union:
+        return Union[tuple(_as_dicts(arg) for arg in args)]
+    if origin is list:
+        return list[_as_dicts(args[0])]
+    return annotation
+
+
+@lru_cache(maxsize=None)
+def _row_type(model: type[BaseModel]) -> type:
+    """A TypedDict with ``model``'s fields; every key optional."""
+    fields = {name: _as_dicts(field.annotation) for name, field in model.model_fields.items()}
+    return TypedDict(f"{model.__name__}Row", fields, total=False)
+
+
+@lru_cache(maxsize=None)
+def _adapter(tp) -> TypeAdapter:
+    return TypeAdapter(tp)
+
+
+@lru_cache(maxsize=None)
+def _page_adapter(page: type[BaseModel], rows_field: str, row: type[BaseModel]) -> TypeAdapter:
+    fields = {name: _as_dicts(field.annotation) for name, field in page.model_fields.items()}
+    fields[rows_field] = list[_row_type(row)]
+    return TypeAdapter(TypedDict(f"{page.__name__}Page", fields))
+
+
+def _json(body: bytes, status_code: int = 200) -> Response:
+    return Response(content=body, status_code=status_code, media_type="application/json")
+
+
+def row_dicts(fields: Sequence[str], rows: Iterable[Sequence]) -> list[dict]:
+    """Column rows as dicts keyed by ``fields``.
+
+    ``zip`` stops at ``len(fields)``, so trailing helper columns (sort keys)
+    are dropped.
+    """
+    return [dict(zip(fields, row)) for row in rows]
+
+
+def rows_response(
+    page: type[BaseModel], rows_field: str, row: type[BaseModel], items: list[dict], **meta
+) -> Response:
+    """Encode a ``page`` model whose ``rows_field`` holds ``row``-shaped dicts."""
+    values = {**meta, rows_field: items}
+    content = {name: values[name] for name in page.model_fields if name in values}
+    return _json(_page_adapter(page, rows_field, row).dump_json(content))
+
+
+def row_response(row: type[BaseModel], item: dict) -> Response:
+    """Encode one ``row``-shaped dict."""
+    return _json(_adapter(_row_type(row)).dump_json(item))
+
+
+def list_response(row: type[BaseModel], items: list[dict]) -> Response:
+    """Encode a top-level JSON array of ``row``-shaped dicts."""
+    return _json(_adapter(list[_row_type(row)]).dump_json(items))
+
+
+def json_response(content: BaseModel, status_code: int = 200) -> Response:
+    """Encode an (unvalidated) model once, skipping FastAPI's response_model pass."""
+    return _json(_adapter(type(content)).dump_json(content), status_code)
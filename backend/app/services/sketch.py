@@ -0,0 +1,77 @@
+"""Mergeable quantile sketch with a relative-error guarantee.
+
+Values are counted in logarithmic buckets: bucket ``k`` holds values in
+``(gamma^(k-1), gamma^k]`` with ``gamma = (1 + alpha) / (1 - alpha)``, so any
+quantile is answered within ``alpha`` relative error from a bounded number of
+integer counters (DDSketch, Masson et al. 2019). Counters add, which makes the
+sketch cheap to persist as ``(key, count)`` rows and to merge across sources.
+"""
+
+import math
+from typing import Iterable, Mapping, Optional
+
+
+class LogBucketSketch:
+    """Quantile sketch over positive values; smaller values clamp to ``min_value``."""
+
+    def __init__(self, alpha: float = 0.02, min_value: float = 1e-6):
+        if not 0 < alpha < 1:
+            raise ValueError("alpha must be between 0 and 1")
+        self.alpha = alpha
+        self.gamma = (1 + alpha) / (1 - alpha)
+        self._log_gamma = math.log(self.gamma)
+        self.min_value = min_value
+        self.counts: dict[int, int] = {}
+        self.count = 0
+        self.sum = 0.0
+
+    @classmethod
+    def from_counts(
+        cls, counts: Mapping[int, int], total: float = 0.0, **kwargs
+    ) -> "LogBucketSketch":
+        """Rebuild a sketch from persisted bucket counts (and optional sum)."""
+        sketch = cls(**kwargs)
+        for key, n in counts.items():
+            if n:
+                sketch.counts[key] = sketch.counts.get(key, 0) + n
+                sketch.count += n
+        sketch.sum = total
+        return sketch
+
+    def key(self, value: float) -> int:
+        """Bucket index holding ``value``."""
+        return math.ceil(math.log(max(value, self.min_value)) / self._log_gamma)
+
+    def value(self, key: int) -> float:
+        """Representative value of a bucket (within ``alpha`` of its members)."""
+        return 2 * self.gamma ** key / (self.gamma + 1)
+
+    def add(self, value: float, n: int = 1) -> None:
+        k = self.key(value)
+        self.counts[k] = self.counts.get(k, 0) + n
+        self.count += n
+        self.sum += value * n
+
+    def merge(self, other: "LogBucketSketch") -> None:
+        """Fold another sketch with the same ``alpha`` into this one."""
+        if other.gamma != self.gamma:
+            raise ValueError("Cannot merge sketches with different accuracy")
+        for k, n in other.counts.items():
+            self.counts[k] = self.counts.get(k, 0) + n
+        self.count += other.count
+        self.sum += other.sum
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Estimate the ``q``-quantile (0 ≤ q ≤ 1), or None when empty."""
+        if self.count == 0:
+            return None
+        rank = q * (self.count - 1)
+        seen = 0
+        for k in sorted(self.counts):
+            seen += self.counts[k]
+            if seen > rank:
+                return self.value(k)
+        return self.value(max(self.counts))
+
+    def quantiles(self, qs: Iterable[float]) -> dict[float, Optional[float]]:
+        return {q: self.quantile(q) for q in qs}
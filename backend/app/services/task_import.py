@@ -0,0 +1,203 @@
+"""Task import from spreadsheet exports (CSV).
+
+The expected shape is the one ``estimates.csv`` uses — ``task``,
+``estimated_hours``, ``actual_hours``, ``notes`` — plus optional ``assignee``
+(a username) and ``status`` columns. ``actual_hours`` becomes the task's
+logged minutes and a time-ledger entry; ``estimated_hours`` has no column on
+``Task`` and is ignored.
+
+Rows are consumed from a lazy ``csv.DictReader`` and written ``IMPORT_BATCH``
+at a time: one ``IN`` query resolves the batch's unseen usernames (results,
+misses included, are kept in a per-import map), one executemany INSERT …
+RETURNING creates the tasks, and the status events, ledger entries and
+change-feed rows follow as one statement each. Every batch is committed on
+its own so a large import never holds one long transaction. Reading and
+parsing a batch is blocking file I/O (large uploads are spooled to disk), so
+it runs in the threadpool, one hop per batch.
+
+PostgreSQL ``COPY`` is not used: it cannot return the new ids that the
+status history, ledger and change feed need, and it skips the ORM column
+defaults. asyncpg already sends each batch as a few multi-row
+``INSERT … VALUES … RETURNING`` statements, which is close enough.
+"""
+
+import csv
+import math
+from dataclasses import dataclass, field
+from typing import Iterable, Optional
+
+from sqlalchemy import insert, select
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.task import Task, TaskStatus
+from app.models.user import User
+from app.services import change_feed
+from app.services.cycle_time import record_created
+from app.services.time_ledger import record_time
+
+IMPORT_BATCH = 1000
+MAX_REPORTED_ERRORS = 1000
+TITLE_MAX_LENGTH = 200
+# Far below the INTEGER minutes column's limit, leaving room for later log-time
+MAX_HOURS = 10_000
+
+
+class InvalidImportFile(ValueError):
+    """The upload is not a CSV file with a ``task`` column."""
+
+
+@dataclass
+class ImportReport:
+    """How many rows were imported, and why the others were rejected."""
+
+    created: int = 0
+    failed: int = 0
+    errors: list[tuple[int, str]] = field(default_factory=list)
+
+    def reject(self, line: int, error: str) -> None:
+        self.failed += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append((line, error))
+
+    @property
+    def errors_truncated(self) -> bool:
+        return self.failed > len(self.errors)
+
+
+def _hours_to_minutes(value: Optional[str], column: str) -> int:
+    if value is None or not value.strip():
+        return 0
+    try:
+        hours = float(value)
+    except ValueError:
+        raise ValueError(f"{column} is not a number: {value!r}")
+    if not math.isfinite(hours):
+        raise ValueError(f"{column} is not a finite number: {value!r}")
+    if hours < 0:
+        raise ValueError(f"{column} must not be negative")
+    if hours > MAX_HOURS:
+        raise ValueError(f"{column} must be at most {MAX_HOURS}")
+    return round(hours * 60)
+
+
+def parse_row(row: dict) -> dict:
+    """Validate one CSV row into task values; raises ``ValueError`` with a reason.
+
+    ``assignee`` is returned as the username; it is resolved per batch.
+    """
+    if None in row:
+        raise ValueError("Row has more fields than the header")
+    title = (row.get("task") or "").strip()
+    if not title:
+        raise ValueError("task is empty")
+    if len(title) > TITLE_MAX_LENGTH:
+        raise ValueError(f"task is longer than {TITLE_MAX_LENGTH} characters")
+
+    status_value = (row.get("status") or "").strip().lower()
+    try:
+        task_status = TaskStatus(status_value) if status_value else TaskStatus.TODO
+    except ValueError:
+        raise ValueError(f"Unknown status {status_value!r}")
+
+    return {
+        "title": title,
+        "description": (row.get("notes") or "").strip() or None,
+        "status": task_status,
+        "total_minutes": _hours_to_minutes(row.get("actual_hours"), "actual_hours"),
+        "assignee": (row.get("assignee") or "").strip() or None,
+    }
+
+
+def read_csv(lines: Iterable[str]) -> csv.DictReader:
+    """A lazy DictReader over ``lines``; raises ``InvalidImportFile`` on a bad header."""
+    reader = csv.DictReader(lines)
+    header = reader.fieldnames or []
+    if "task" not in (name.strip() for name in header):
+        raise InvalidImportFile("CSV header must include a 'task' column")
+    reader.fieldnames = [name.strip() for name in header]
+    return reader
+
+
+async def _resolve_usernames(
+    db: AsyncSession, usernames: set[str], known: dict[str, Optional[int]]
+) -> None:
+    missing = usernames - known.keys()
+    if not missing:
+        return
+    rows = await db.execute(select(User.username, User.id).where(User.username.in_(missing)))
+    known.update(dict.fromkeys(missing))
+    known.update(rows.all())
+
+
+async def _write_batch(
+    db: AsyncSession,
+    batch: list[tuple[int, dict]],
+    created_by: int,
+    known: dict[str, Optional[int]],
+    report: ImportReport,
+) -> None:
+    await _resolve_usernames(db, {v["assignee"] for _, v in batch if v["assignee"]}, known)
+
+    accepted = []
+    for line, values in batch:
+        username = values.pop("assignee")
+        assignee_id = known[username] if username else None
+        if username and assignee_id is None:
+            report.reject(line, f"Unknown assignee {username!r}")
+            continue
+        accepted.append({**values, "assignee_id": assignee_id, "created_by": created_by})
+    if not accepted:
+        return
+
+    result = await db.execute(
+        insert(Task).returning(Task.id, sort_by_parameter_order=True), accepted
+    )
+    task_ids = result.scalars().all()
+    await record_created(
+        db, [(task_id, v["status"]) for task_id, v in zip(task_ids, accepted)], user_id=created_by
+    )
+    # Imported hours count as time logged by the assignee (or the importer)
+    await record_time(db, [
+        (task_id, v["assignee_id"] or created_by, v["total_minutes"])
+        for task_id, v in zip(task_ids, accepted)
+        if v["total_minutes"]
+    ])
+    await change_feed.record_changes(db, [(task_id, change_feed.CREATE) for task_id in task_ids])
+    await db.commit()
+    report.created += len(task_ids)
+
+
+def _parse_batch(
+    reader: csv.DictReader, batch_size: int, report: ImportReport
+) -> list[tuple[int, dict]]:
+    """Up to ``batch_size`` valid rows with their line numbers; empty at EOF."""
+    batch: list[tuple[int, dict]] = []
+    while len(batch) < batch_size:
+        row = next(reader, None)
+        if row is None:
+            break
+        try:
+            batch.append((reader.line_num, parse_row(row)))
+        except ValueError as exc:
+            report.reject(reader.line_num, str(exc))
+    return batch
+
+
+async def import_tasks(
+    db: AsyncSession,
+    reader: csv.DictReader,
+    created_by: int,
+    batch_size: Optional[int] = None,
+) -> ImportReport:
+    """Create a task for every valid row of ``reader``, committing per batch.
+
+    Invalid rows are reported by CSV line number and skipped; they never
+    abort the rest of the import.
+    """
+    batch_size = batch_size or IMPORT_BATCH
+    report = ImportReport()
+    known: dict[str, Optional[int]] = {}
+    while batch := await run_in_threadpool(_parse_batch, reader, batch_size, report):
+        await _write_batch(db, batch, created_by, known, report)
+    return report
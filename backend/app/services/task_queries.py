@@ -0,0 +1,116 @@
+"""Reusable query building blocks for task listings."""
+
+import json
+from typing import Optional
+
+from sqlalchemy import Select, and_, func, or_, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.task import Task, TaskStatus
+from app.models.user import User
+
+# Newest first; id breaks created_at ties so the order is total
+TASK_ORDER = (Task.created_at.desc(), Task.id.desc())
+
+# Columns a ``fields=`` projection may name, in response order
+TASK_FIELDS = (
+    "id", "title", "description", "status", "total_minutes",
+    "assignee_id", "created_by", "created_at", "updated_at",
+)
+
+
+def parse_fields(value: str) -> list[str]:
+    """Split a ``fields=`` value into known column names; ``id`` is always included.
+
+    Raises ``ValueError`` naming any unknown field.
+    """
+    requested = {name.strip() for name in value.split(",") if name.strip()}
+    unknown = requested - set(TASK_FIELDS)
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(sorted(unknown))}")
+    requested.add("id")
+    return [name for name in TASK_FIELDS if name in requested]
+
+
+# expand= names and the task column holding each user's id
+EXPANSIONS = {"assignee": "assignee_id", "creator": "created_by"}
+
+
+def parse_expand(value: str) -> list[str]:
+    """Split an ``expand=`` value into relation names; raises ``ValueError``."""
+    requested = {name.strip() for name in value.split(",") if name.strip()}
+    unknown = requested - EXPANSIONS.keys()
+    if unknown:
+        raise ValueError(f"Cannot expand: {', '.join(sorted(unknown))}")
+    return [name for name in EXPANSIONS if name in requested]
+
+
+async def expand_users(db: AsyncSession, items: list[dict], expand: list[str]) -> None:
+    """Embed ``{id, username}`` for each relation in ``expand`` into ``items``.
+
+    One ``IN`` query covers every user referenced by the page, whatever its
+    size; ``items`` must carry the id columns named in ``EXPANSIONS``.
+    """
+    user_ids = {item[EXPANSIONS[name]] for item in items for name in expand}
+    user_ids.discard(None)
+    users = {}
+    if user_ids:
+        rows = await db.execute(select(User.id, User.username).where(User.id.in_(user_ids)))
+        users = {user_id: {"id": user_id, "username": username} for user_id, username in rows}
+    for item in items:
+        for name in expand:
+            item[name] = users.get(item[EXPANSIONS[name]])
+
+
+def projection(fields: list[str]) -> Select:
+    """Column-only select of ``fields`` plus the keyset sort columns.
+
+    The sort columns are always selected (last) so the next cursor can be
+    built from the row whether or not they were requested.
+    """
+    return select(*(getattr(Task, name) for name in fields), Task.created_at, Task.id)
+
+
+def apply_task_filters(
+    query: Select,
+    status_filter: Optional[TaskStatus] = None,
+    assignee_id: Optional[int] = None,
+) -> Select:
+    """Apply the list filters shared by every task listing endpoint."""
+    if status_filter:
+        query = query.where(Task.status == status_filter)
+    if assignee_id is not None:
+        query = query.where(Task.assignee_id == assignee_id)
+    return query
+
+
+def after_cursor(query: Select, created_at, task_id: int) -> Select:
+    """Restrict ``query`` to rows strictly after ``(created_at, id)`` in TASK_ORDER."""
+    return query.where(
+        or_(
+            Task.created_at < created_at,
+            and_(Task.created_at == created_at, Task.id < task_id),
+        )
+    )
+
+
+async def count_rows(db: AsyncSession, query: Select) -> int:
+    """Exact ``COUNT(*)`` of the rows ``query`` would return."""
+    return await db.scalar(select(func.count()).select_from(query.order_by(None).subquery()))
+
+
+async def estimate_rows(db: AsyncSession, query: Select) -> Optional[int]:
+    """Planner row estimate for ``query``, or None if the backend has none.
+
+    PostgreSQL answers from table statistics without touching the rows;
+    SQLite has no equivalent, so callers fall back to an exact count.
+    """
+    if db.bind.dialect.name != "postgresql":
+        return None
+    compiled = query.order_by(None).compile(
+        dialect=db.bind.dialect, compile_kwargs={"literal_binds": True}
+    )
+    plan = await db.scalar(text(f"EXPLAIN (FORMAT JSON) {compiled}"))
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
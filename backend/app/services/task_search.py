@@ -0,0 +1,117 @@
+"""Full-text task search over the FTS5 (SQLite) or tsvector (PostgreSQL) index.
+
+Results are ordered by a dialect-specific relevance ``score`` where lower is
+better — FTS5's bm25() already works that way and PostgreSQL's ts_rank_cd()
+is negated — then by id, so ``(score, id)`` is a stable keyset cursor.
+"""
+
+import re
+from dataclasses import dataclass
+from typing import Optional
+
+from sqlalchemy import and_, column, func, literal_column, or_, select, table
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.task import Task, TaskStatus
+from app.services.task_queries import apply_task_filters
+
+SNIPPET_START = "<mark>"
+SNIPPET_END = "</mark>"
+SNIPPET_TOKENS = 12
+
+# Title matches weigh ten times a description match (bm25 column weights)
+_SQLITE_WEIGHTS = (10.0, 1.0)
+_WORD = re.compile(r"\w+", re.UNICODE)
+_tasks_fts = table("tasks_fts", column("rowid"))
+# Inline, not bound: asyncpg would send a bound config name as varchar
+_PG_CONFIG = literal_column("'english'::regconfig")
+
+
+class SearchUnavailable(RuntimeError):
+    """The database has no full-text index we know how to query."""
+
+
+class EmptyQuery(ValueError):
+    """The query has no searchable words."""
+
+
+@dataclass
+class SearchHit:
+    task: Task
+    score: float
+    snippet: Optional[str]
+
+
+def _sqlite_match(q: str) -> str:
+    """Turn free text into a safe FTS5 query: every word must appear.
+
+    Words are quoted so FTS5 operators in user input are taken literally;
+    the last word is a prefix match to support search-as-you-type.
+    """
+    words = _WORD.findall(q)
+    if not words:
+        raise EmptyQuery(q)
+    terms = [f'"{w}"' for w in words]
+    terms[-1] += "*"
+    return " ".join(terms)
+
+
+def _sqlite_query(q: str):
+    fts = literal_column("tasks_fts")
+    score = func.bm25(fts, *_SQLITE_WEIGHTS)
+    snippet = func.snippet(fts, -1, SNIPPET_START, SNIPPET_END, "…", SNIPPET_TOKENS)
+    stmt = (
+        select(Task, score.label("score"), snippet.label("snippet"))
+        .select_from(Task)
+        .join(_tasks_fts, _tasks_fts.c.rowid == Task.id)
+        .where(fts.op("MATCH")(_sqlite_match(q)))
+    )
+    return stmt, score
+
+
+def _postgres_query(q: str):
+    if not _WORD.search(q):
+        raise EmptyQuery(q)
+    vector = literal_column("tasks.search_vector")
+    tsquery = func.websearch_to_tsquery(_PG_CONFIG, q)
+    score = -func.ts_rank_cd(vector, tsquery)
+    snippet = func.ts_headline(
+        _PG_CONFIG,
+        func.concat_ws(" — ", Task.title, Task.description),
+        tsquery,
+        f"StartSel={SNIPPET_START}, StopSel={SNIPPET_END}, MaxWords={SNIPPET_TOKENS}, MinWords=4",
+    )
+    stmt = select(Task, score.label("score"), snippet.label("snippet")).where(
+        vector.op("@@")(tsquery)
+    )
+    return stmt, score
+
+
+async def search_tasks(
+    db: AsyncSession,
+    q: str,
+    limit: int,
+    after: Optional[tuple[float, int]] = None,
+    status_filter: Optional[TaskStatus] = None,
+    assignee_id: Optional[int] = None,
+) -> list[SearchHit]:
+    """Return up to ``limit`` hits for ``q``, best first, after a cursor key.
+
+    Raises ``EmptyQuery`` if ``q`` has no words and ``SearchUnavailable`` on
+    dialects without a full-text index.
+    """
+    dialect = db.bind.dialect.name
+    if dialect == "sqlite":
+        stmt, score = _sqlite_query(q)
+    elif dialect == "postgresql":
+        stmt, score = _postgres_query(q)
+    else:
+        raise SearchUnavailable(dialect)
+
+    stmt = apply_task_filters(stmt, status_filter, assignee_id)
+    if after is not None:
+        last_score, last_id = after
+        stmt = stmt.where(or_(score > last_score, and_(score == last_score, Task.id > last_id)))
+
+    rows = await db.execute(stmt.order_by(score, Task.id).limit(limit))
+    return [SearchHit(task=task, score=s, snippet=snip) for task, s, snip in rows]
@@ -0,0 +1,260 @@
+"""Task write operations as single, atomic statements.
+
+Each mutation is one ``UPDATE … WHERE … RETURNING`` so concurrent writers
+cannot lose each other's changes and the handler needs one round-trip
+instead of SELECT + UPDATE + refresh. Dialects without UPDATE RETURNING get
+the equivalent UPDATE followed by a SELECT in the same transaction.
+
+Bulk variants validate the whole batch with one ``IN`` query, then write it
+with a single executemany statement, so a batch of N items costs a constant
+number of round-trips rather than N.
+"""
+
+from dataclasses import dataclass
+from typing import Optional
+
+from sqlalchemy import Update, bindparam, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.task import Task, TaskStatus, VALID_TRANSITIONS
+from app.models.user import User
+from app.services import change_feed
+from app.services.cycle_time import record_created, record_transitions
+from app.services.time_ledger import record_time
+
+
+class TaskNotFound(LookupError):
+    """The task does not exist."""
+
+
+class InvalidTransition(ValueError):
+    """The requested status change is not allowed from the current status."""
+
+    def __init__(self, current: TaskStatus, requested: TaskStatus):
+        self.current = current
+        self.requested = requested
+        self.allowed = VALID_TRANSITIONS.get(current, set())
+        super().__init__(f"Cannot transition from '{current.value}' to '{requested.value}'")
+
+
+@dataclass
+class BulkOutcome:
+    """Result of one bulk item: the resulting task, or why it was rejected."""
+
+    task: Optional[Task] = None
+    error: Optional[str] = None
+
+
+def allowed_predecessors(new_status: TaskStatus) -> set[TaskStatus]:
+    """Statuses from which ``new_status`` may be entered."""
+    return {s for s, targets in VALID_TRANSITIONS.items() if new_status in targets}
+
+
+async def _update_returning(db: AsyncSession, task_id: int, stmt: Update):
+    """Run a single-row task UPDATE and return the updated Task, or None."""
+    if db.bind.dialect.update_returning:
+        result = await db.execute(
+            stmt.returning(Task).execution_options(populate_existing=True)
+        )
+        return result.scalar_one_or_none()
+
+    result = await db.execute(stmt.execution_options(synchronize_session=False))
+    if result.rowcount == 0:
+        return None
+    return await db.scalar(
+        select(Task).where(Task.id == task_id).execution_options(populate_existing=True)
+    )
+
+
+async def add_minutes(db: AsyncSession, task_id: int, minutes: int, user_id: int) -> Task:
+    """Atomically add ``minutes`` to a task's total; raises ``TaskNotFound``.
+
+    The minutes are also recorded in the time ledger against ``user_id``.
+    """
+    stmt = (
+        update(Task)
+        .where(Task.id == task_id)
+        .values(total_minutes=Task.total_minutes + minutes)
+    )
+    task = await _update_returning(db, task_id, stmt)
+    if task is None:
+        raise TaskNotFound(task_id)
+    await record_time(db, [(task_id, user_id, minutes)])
+    await change_feed.record_changes(db, [(task_id, change_feed.UPDATE)])
+    return task
+
+
+async def transition_status(
+    db: AsyncSession, task_id: int, new_status: TaskStatus, user_id: int
+) -> Task:
+    """Move a task to ``new_status`` if VALID_TRANSITIONS allows it.
+
+    The transition rule is part of the UPDATE's WHERE clause, so the check
+    and the write cannot interleave with another request. Only when nothing
+    matched do we read the row, to explain why. Accepted transitions are
+    appended to the status history by ``user_id``.
+    """
+    stmt = (
+        update(Task)
+        .where(Task.id == task_id, Task.status.in_(allowed_predecessors(new_status)))
+        .values(status=new_status)
+    )
+    task = await _update_returning(db, task_id, stmt)
+    if task is not None:
+        await record_transitions(db, [(task_id, new_status)], user_id)
+        await change_feed.record_changes(db, [(task_id, change_feed.UPDATE)])
+        return task
+
+    current = await db.scalar(select(Task.status).where(Task.id == task_id))
+    if current is None:
+        raise TaskNotFound(task_id)
+    raise InvalidTransition(current, new_status)
+
+
+async def _load_tasks(db: AsyncSession, task_ids) -> dict[int, Task]:
+    """Fetch fresh copies of the given tasks with one ``IN`` query."""
+    rows = await db.scalars(
+        select(Task).where(Task.id.in_(set(task_ids))).execution_options(populate_existing=True)
+    )
+    return {task.id: task for task in rows}
+
+
+async def bulk_create(db: AsyncSession, items: list[dict], created_by: int) -> list[BulkOutcome]:
+    """Insert every item whose assignee exists with one executemany INSERT."""
+    assignee_ids = {item["assignee_id"] for item in items if item.get("assignee_id") is not None}
+    known = set()
+    if assignee_ids:
+        known = set(await db.scalars(select(User.id).where(User.id.in_(assignee_ids))))
+
+    outcomes = [BulkOutcome() for _ in items]
+    accepted = []
+    for outcome, item in zip(outcomes, items):
+        if item.get("assignee_id") is not None and item["assignee_id"] not in known:
+            outcome.error = "Assignee not found"
+        else:
+            accepted.append((outcome, {**item, "created_by": created_by}))
+
+    if accepted:
+        created = await db.scalars(
+            insert(Task).returning(Task, sort_by_parameter_order=True),
+            [values for _, values in accepted],
+        )
+        for (outcome, _), task in zip(accepted, created.all()):
+            outcome.task = task
+        await record_created(
+            db, [(o.task.id, o.task.status) for o, _ in accepted], user_id=created_by
+        )
+        await change_feed.record_changes(
+            db, [(o.task.id, change_feed.CREATE) for o, _ in accepted]
+        )
+    return outcomes
+
+
+async def _lock_statuses(db: AsyncSession, task_ids) -> dict[int, TaskStatus]:
+    """Current status of each task, locked (``FOR UPDATE``) until commit."""
+    rows = await db.execute(
+        select(Task.id, Task.status).where(Task.id.in_(set(task_ids))).with_for_update()
+    )
+    return dict(rows.all())
+
+
+async def bulk_transition(
+    db: AsyncSession, changes: list[tuple[int, TaskStatus]], user_id: int
+) -> list[BulkOutcome]:
+    """Apply status changes in request order with one executemany UPDATE.
+
+    Each change is checked against VALID_TRANSITIONS from the status the task
+    will have after the earlier changes in the same batch. The rows are
+    locked while they are validated, and each task gets one UPDATE, guarded
+    by the status that was read, to the last accepted status. The written
+    statuses are read back instead of trusting the executemany rowcount,
+    which some drivers (asyncpg) do not report. A task whose UPDATE missed
+    fails all of its items and gets no events or change-feed row.
+    """
+    current = await _lock_statuses(db, {task_id for task_id, _ in changes})
+    read = dict(current)
+
+    outcomes, accepted = [], []
+    for task_id, new_status in changes:
+        outcome = BulkOutcome()
+        outcomes.append(outcome)
+        if task_id not in current:
+            outcome.error = "Task not found"
+            continue
+        if new_status not in VALID_TRANSITIONS.get(current[task_id], set()):
+            outcome.error = str(InvalidTransition(current[task_id], new_status))
+            continue
+        accepted.append((outcome, task_id, new_status))
+        current[task_id] = new_status
+
+    if not accepted:
+        return outcomes
+
+    final = {task_id: current[task_id] for _, task_id, _ in accepted}
+    table = Task.__table__
+    stmt = (
+        update(table)
+        .where(table.c.id == bindparam("task_id"), table.c.status == bindparam("expected"))
+        .values(status=bindparam("new_status"))
+    )
+    await db.execute(stmt, [
+        {"task_id": task_id, "expected": read[task_id], "new_status": status}
+        for task_id, status in final.items()
+    ])
+    written = dict(
+        (await db.execute(select(Task.id, Task.status).where(Task.id.in_(final)))).all()
+    )
+    applied = {task_id for task_id, status in final.items() if written.get(task_id) == status}
+
+    for outcome, task_id, _ in accepted:
+        if task_id not in applied:
+            outcome.error = "Task was modified concurrently; retry"
+    await record_transitions(
+        db, [(task_id, status) for _, task_id, status in accepted if task_id in applied], user_id
+    )
+    await change_feed.record_changes(db, [(t, change_feed.UPDATE) for t in final if t in applied])
+
+    tasks = await _load_tasks(db, applied) if applied else {}
+    for outcome, task_id, _ in accepted:
+        if outcome.error is None:
+            outcome.task = tasks[task_id]
+    return outcomes
+
+
+async def bulk_add_minutes(
+    db: AsyncSession, entries: list[tuple[int, int]], user_id: int
+) -> list[BulkOutcome]:
+    """Add logged minutes to many tasks with one executemany UPDATE.
+
+    Entries for the same task are summed into a single increment, so the
+    write stays atomic per row however the batch is ordered. The rows are
+    locked up front, and the ledger and change feed are written only for
+    tasks the read-back after the UPDATE still finds, so a task deleted
+    mid-batch reports "Task not found" instead of leaving orphan entries.
+    """
+    existing = await _lock_statuses(db, {t for t, _ in entries})
+
+    totals: dict[int, int] = {}
+    for task_id, minutes in entries:
+        if task_id in existing:
+            totals[task_id] = totals.get(task_id, 0) + minutes
+
+    tasks: dict[int, Task] = {}
+    if totals:
+        table = Task.__table__
+        stmt = (
+            update(table)
+            .where(table.c.id == bindparam("task_id"))
+            .values(total_minutes=table.c.total_minutes + bindparam("minutes"))
+        )
+        await db.execute(stmt, [{"task_id": t, "minutes": m} for t, m in totals.items()])
+        tasks = await _load_tasks(db, totals)
+        await record_time(
+            db, [(task_id, user_id, minutes) for task_id, minutes in entries if task_id in tasks]
+        )
+        await change_feed.record_changes(db, [(t, change_feed.UPDATE) for t in totals if t in tasks])
+
+    return [
+        BulkOutcome(task=tasks[task_id]) if task_id in tasks else BulkOutcome(error="Task not found")
+        for task_id, _ in entries
+    ]
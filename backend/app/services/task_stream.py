@@ -0,0 +1,339 @@
+"""Task stream hub — fans task changes out to server-sent-event subscribers.
+
+Writers never publish payloads themselves. A commit that appended to the
+change feed wakes the hub, and a single pump per worker reads the new feed
+rows once, loads the affected tasks once and offers the resulting events to
+every subscriber. Open boards therefore cost one feed query per burst of
+writes instead of one list query per board per poll.
+
+The backend decides how the pump learns about writes:
+
+- ``MemoryBackend`` — local commits only (single worker).
+- ``PollingBackend`` — local commits plus a periodic check of the shared
+  change feed, so writes on other workers arrive within the poll interval.
+
+A filtered subscriber only hears about tasks inside its filter: it keeps the
+ids of the tasks it may be showing (seeded from the database when it
+connects), and gets a ``remove`` or ``delete`` only for one of those.
+
+Slow consumers are bounded: each subscriber holds at most ``buffer_size``
+pending tasks. A newer change to a task that is still waiting replaces it
+(coalescing); past that the buffer is dropped and the subscriber gets one
+``reset`` event telling it to catch up from ``/tasks/changes``.
+"""
+
+import asyncio
+import json
+import logging
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import AsyncIterator, Optional
+
+from sqlalchemy import select
+
+from app.config import get_settings
+from app.database import AsyncSessionLocal
+from app.models.task import Task, TaskStatus
+from app.schemas.task import TaskResponse
+from app.services import change_feed
+from app.services.pagination import encode_cursor
+
+settings = get_settings()
+logger = logging.getLogger("sprintsync.stream")
+
+REMOVE = "remove"
+PUMP_BATCH = 500
+
+
+@dataclass(frozen=True)
+class TaskEvent:
+    """One change as sent to clients; ``task`` is None for deletes/removals."""
+
+    seq: int
+    task_id: int
+    op: str
+    task: Optional[dict]
+
+    def encode(self) -> str:
+        data = {"task_id": self.task_id, "op": self.op, "task": self.task}
+        return (
+            f"id: {encode_cursor(self.seq)}\n"
+            f"event: {self.op}\n"
+            f"data: {json.dumps(data, separators=(',', ':'))}\n\n"
+        )
+
+
+class MemoryBackend:
+    """Wakes the pump when this process commits a feed write."""
+
+    def __init__(self):
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._event: Optional[asyncio.Event] = None
+
+    def bind(self, loop: asyncio.AbstractEventLoop) -> None:
+        self._loop = loop
+        self._event = asyncio.Event()
+
+    def notify(self) -> None:
+        """Thread-safe: may be called from any thread or event loop."""
+        loop, event = self._loop, self._event
+        if loop is None or event is None:
+            return
+        try:
+            loop.call_soon_threadsafe(event.set)
+        except RuntimeError:
+            pass  # the pump's loop has already shut down
+
+    async def wait(self) -> None:
+        await self._event.wait()
+        self._event.clear()
+
+
+class PollingBackend(MemoryBackend):
+    """Also wakes every ``interval`` seconds to pick up other workers' writes."""
+
+    def __init__(self, interval: float):
+        super().__init__()
+        self.interval = interval
+
+    async def wait(self) -> None:
+        try:
+            await asyncio.wait_for(super().wait(), self.interval)
+        except asyncio.TimeoutError:
+            pass
+
+
+class Subscription:
+    """One connected client: its filters and a bounded, coalescing buffer."""
+
+    def __init__(
+        self,
+        hub: "TaskStreamHub",
+        status: Optional[str],
+        assignee_id: Optional[int],
+        position: int,
+        visible: Optional[set[int]] = None,
+    ):
+        self.hub = hub
+        self.status = status
+        self.assignee_id = assignee_id
+        # Filtered only: ids of the tasks this client may be showing
+        self.visible = visible
+        self.delivered = position
+        self.closed = False
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        self._lock = threading.Lock()
+        self._pending: "OrderedDict[int, TaskEvent]" = OrderedDict()
+        self._reset = False
+
+    def _matches(self, task: dict) -> bool:
+        if self.status is not None and task["status"] != self.status:
+            return False
+        if self.assignee_id is not None and task["assignee_id"] != self.assignee_id:
+            return False
+        return True
+
+    def offer(self, event: TaskEvent) -> None:
+        """Queue ``event`` without blocking; called from the pump's loop."""
+        if self.visible is not None:
+            if event.task is not None and self._matches(event.task):
+                self.visible.add(event.task_id)
+            elif event.task_id in self.visible:
+                # It matched before this change: tell the client to drop it
+                self.visible.discard(event.task_id)
+                if event.task is not None:
+                    event = TaskEvent(event.seq, event.task_id, REMOVE, None)
+            else:
+                return  # never inside this client's filter
+
+        with self._lock:
+            if self._reset:
+                return
+            if self._pending.pop(event.task_id, None) is not None:
+                self.hub.stats_counters["coalesced"] += 1
+            elif len(self._pending) >= self.hub.buffer_size:
+                self.hub.stats_counters["dropped"] += len(self._pending)
+                self.hub.stats_counters["resets"] += 1
+                self._pending.clear()
+                self._reset = True
+                self._wake()
+                return
+            self._pending[event.task_id] = event
+        self._wake()
+
+    def close(self) -> None:
+        self.closed = True
+        self._wake()
+
+    def _wake(self) -> None:
+        try:
+            self._loop.call_soon_threadsafe(self._wakeup.set)
+        except RuntimeError:
+            pass  # the client's loop is gone; it is being torn down
+
+    async def next_batch(self, timeout: float) -> Optional[tuple[bool, list[TaskEvent]]]:
+        """Wait up to ``timeout`` for events; returns ``(reset, events)`` or None."""
+        try:
+            await asyncio.wait_for(self._wakeup.wait(), timeout)
+        except asyncio.TimeoutError:
+            return None
+        self._wakeup.clear()
+        with self._lock:
+            reset, events = self._reset, list(self._pending.values())
+            self._reset = False
+            self._pending.clear()
+        return reset, events
+
+
+class TaskStreamHub:
+    """Per-process registry of subscribers plus the pump that feeds them."""
+
+    def __init__(self, backend: MemoryBackend, buffer_size: int, heartbeat: float):
+        self.backend = backend
+        self.buffer_size = buffer_size
+        self.heartbeat = heartbeat
+        self.session_factory = AsyncSessionLocal
+        self.position = 0
+        self.stats_counters = {
+            "published": 0,
+            "delivered": 0,
+            "coalesced": 0,
+            "dropped": 0,
+            "resets": 0,
+        }
+        self._subscribers: set[Subscription] = set()
+        self._lock = threading.Lock()
+        self._pump: Optional[asyncio.Task] = None
+        self._ready: Optional[asyncio.Event] = None
+        change_feed.on_commit(self.backend.notify)
+
+    async def subscribe(
+        self, status: Optional[str] = None, assignee_id: Optional[int] = None
+    ) -> Subscription:
+        # Claim the pump before any await, so concurrent first subscribers
+        # share one; it reads the starting position itself.
+        if self._pump is None or self._pump.done():
+            self.backend.bind(asyncio.get_running_loop())
+            self._ready = asyncio.Event()
+            self._pump = asyncio.create_task(self._run_pump(self._ready))
+        await self._ready.wait()
+        if self._pump.done():
+            self._pump.result()  # the position could not be read: raise that
+        visible = None
+        if status is not None or assignee_id is not None:
+            visible = await self._matching_ids(status, assignee_id)
+        subscription = Subscription(self, status, assignee_id, self.position, visible)
+        with self._lock:
+            self._subscribers.add(subscription)
+        return subscription
+
+    async def _matching_ids(self, status: Optional[str], assignee_id: Optional[int]) -> set[int]:
+        query = select(Task.id)
+        if status is not None:
+            query = query.where(Task.status == TaskStatus(status))
+        if assignee_id is not None:
+            query = query.where(Task.assignee_id == assignee_id)
+        async with self.session_factory() as db:
+            return set(await db.scalars(query))
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            self._subscribers.discard(subscription)
+            idle = not self._subscribers
+        if idle:
+            self.backend.notify()  # let the pump notice and exit
+
+    def close(self) -> None:
+        """End every open stream (application shutdown)."""
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for subscription in subscribers:
+            subscription.close()
+
+    async def _run_pump(self, ready: asyncio.Event) -> None:
+        try:
+            async with self.session_factory() as db:
+                self.position = await change_feed.latest_seq(db)
+        finally:
+            ready.set()
+        while True:
+            await self.backend.wait()
+            if not self._subscribers:
+                break
+            try:
+                await self._drain()
+            except Exception:
+                logger.exception("Task stream pump failed; retrying")
+                await asyncio.sleep(1.0)
+
+    async def _drain(self) -> None:
+        async with self.session_factory() as db:
+            while True:
+                changes, has_more = await change_feed.read_changes(db, self.position, PUMP_BATCH)
+                if not changes:
+                    return
+                events = [
+                    TaskEvent(
+                        seq=change.seq,
+                        task_id=change.task_id,
+                        op=change.op,
+                        task=(
+                            TaskResponse.model_validate(task).model_dump(mode="json")
+                            if task is not None else None
+                        ),
+                    )
+                    for change, task in await change_feed.with_tasks(db, changes)
+                ]
+                with self._lock:
+                    subscribers = list(self._subscribers)
+                for subscription in subscribers:
+                    for event in events:
+                        subscription.offer(event)
+                self.position = changes[-1].seq
+                self.stats_counters["published"] += len(events)
+                if not has_more:
+                    return
+
+    async def events(self, subscription: Subscription) -> AsyncIterator[str]:
+        """Encode a subscription as an SSE body; unsubscribes when the client goes."""
+        try:
+            yield "retry: 3000\n: connected\n\n"
+            while not subscription.closed:
+                batch = await subscription.next_batch(self.heartbeat)
+                if batch is None:
+                    yield ": keep-alive\n\n"
+                    continue
+                reset, events = batch
+                if reset:
+                    since = encode_cursor(subscription.delivered)
+                    yield f"event: reset\ndata: {json.dumps({'since': since})}\n\n"
+                for event in events:
+                    yield event.encode()
+                    subscription.delivered = event.seq
+                self.stats_counters["delivered"] += len(events)
+        finally:
+            self.unsubscribe(subscription)
+
+    def stats(self) -> dict:
+        """Connection count and event counters for the /metrics payload."""
+        return {
+            "backend": type(self.backend).__name__,
+            "connections": len(self._subscribers),
+            "position": self.position,
+            **{f"events_{k}_total": v for k, v in self.stats_counters.items()},
+        }
+
+
+def _make_backend() -> MemoryBackend:
+    if settings.TASK_STREAM_BACKEND == "polling":
+        return PollingBackend(settings.TASK_STREAM_POLL_SECONDS)
+    return MemoryBackend()
+
+
+hub = TaskStreamHub(
+    backend=_make_backend(),
+    buffer_size=settings.TASK_STREAM_BUFFER_SIZE,
+    heartbeat=settings.TASK_STREAM_HEARTBEAT_SECONDS,
+)
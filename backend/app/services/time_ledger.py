@@ -0,0 +1,84 @@
+"""Time ledger — record logged minutes and keep the daily rollups current.
+
+Every call to ``log_time`` appends to ``time_entries`` and, in the same
+transaction, folds the minutes into ``user_daily_minutes`` with an
+``INSERT … ON CONFLICT DO UPDATE``. Windowed reports read the rollups only.
+``rebuild_daily_rollups`` recomputes them from the ledger for backfills or
+after manual repairs.
+"""
+
+from datetime import date, datetime, time, timezone
+from typing import Iterable, Optional
+
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.task import utcnow
+from app.models.time_entry import TimeEntry, UserDailyMinutes
+from app.services.upsert import increment_counters
+
+
+async def record_time(
+    db: AsyncSession,
+    entries: Iterable[tuple[int, int, int]],
+    logged_at: Optional[datetime] = None,
+) -> None:
+    """Append ``(task_id, user_id, minutes)`` entries and update the rollups.
+
+    Does not commit; the caller's transaction covers the ledger, the rollups
+    and the task counter together.
+    """
+    logged_at = logged_at or utcnow()
+    rows = [
+        {"task_id": task_id, "user_id": user_id, "minutes": minutes, "logged_at": logged_at}
+        for task_id, user_id, minutes in entries
+    ]
+    if not rows:
+        return
+    await db.execute(insert(TimeEntry), rows)
+
+    increments: dict[tuple[date, int], dict] = {}
+    for row in rows:
+        day = logged_at.date()
+        rollup = increments.setdefault(
+            (day, row["user_id"]),
+            {"day": day, "user_id": row["user_id"], "minutes": 0, "entry_count": 0},
+        )
+        rollup["minutes"] += row["minutes"]
+        rollup["entry_count"] += 1
+    await increment_counters(
+        db, UserDailyMinutes, ["day", "user_id"], ["minutes", "entry_count"],
+        list(increments.values()),
+    )
+
+
+async def rebuild_daily_rollups(db: AsyncSession, since: Optional[date] = None) -> int:
+    """Recompute rollups from the ledger (from ``since`` on, or entirely).
+
+    Runs as one DELETE plus one ``INSERT … SELECT … GROUP BY``, so the
+    aggregation happens inside the database. Returns the rollup row count.
+    """
+    logged_at = TimeEntry.logged_at
+    if db.bind.dialect.name == "postgresql":
+        # Bucket by UTC day, as record_time does, whatever the session zone
+        logged_at = func.timezone("UTC", logged_at)
+    day = func.date(logged_at)
+    clear = delete(UserDailyMinutes)
+    source = select(
+        day.label("day"),
+        TimeEntry.user_id,
+        func.sum(TimeEntry.minutes),
+        func.count(TimeEntry.id),
+    ).group_by(day, TimeEntry.user_id)
+    if since is not None:
+        clear = clear.where(UserDailyMinutes.day >= since)
+        start = datetime.combine(since, time.min, tzinfo=timezone.utc)
+        source = source.where(TimeEntry.logged_at >= start)
+
+    await db.execute(clear)
+    result = await db.execute(
+        insert(UserDailyMinutes).from_select(
+            ["day", "user_id", "minutes", "entry_count"], source
+        )
+    )
+    return result.rowcount
@@ -0,0 +1,37 @@
+"""Counter upserts — ``INSERT … ON CONFLICT DO UPDATE SET c = c + excluded.c``."""
+
+from sqlalchemy import insert, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+async def increment_counters(
+    db: AsyncSession, model, keys: list[str], counters: list[str], rows: list[dict]
+) -> None:
+    """Add each row's ``counters`` onto the row identified by ``keys``.
+
+    Missing rows are inserted with the given values. SQLite and PostgreSQL
+    use a single executemany upsert; other dialects fall back to UPDATE,
+    then INSERT when nothing matched.
+    """
+    if not rows:
+        return
+    dialect = db.bind.dialect.name
+    if dialect in ("sqlite", "postgresql"):
+        dialect_insert = sqlite.insert if dialect == "sqlite" else postgresql.insert
+        stmt = dialect_insert(model)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[getattr(model, k) for k in keys],
+            set_={c: getattr(model, c) + getattr(stmt.excluded, c) for c in counters},
+        )
+        await db.execute(stmt, rows)
+        return
+
+    for row in rows:
+        result = await db.execute(
+            update(model)
+            .where(*(getattr(model, k) == row[k] for k in keys))
+            .values({c: getattr(model, c) + row[c] for c in counters})
+        )
+        if result.rowcount == 0:
+            await db.execute(insert(model).values(**row))
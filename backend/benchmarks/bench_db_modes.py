@@ -0,0 +1,158 @@
+"""Side-by-side benchmark of the sync (threadpool) and async database paths.
+
+Builds two minimal apps over the same SQLite file — a sync ``def`` endpoint on
+``Session`` (the pre-async request path) and an ``async def`` endpoint on
+``AsyncSession`` (the current path) — and drives both with the same
+concurrent load through an in-process ASGI client.
+
+Real deployments wait on a network round-trip per query; SQLite answers in
+microseconds, so each request first runs ``SELECT sleep_ms(:ms)`` (a SQL
+function registered on every connection) to emulate that wait.
+
+Usage:
+    python benchmarks/bench_db_modes.py --requests 2000 --concurrency 200 --db-latency-ms 5
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import httpx  # noqa: E402
+from fastapi import Depends, FastAPI  # noqa: E402
+from sqlalchemy import create_engine, event, func, select  # noqa: E402
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine  # noqa: E402
+from sqlalchemy.orm import Session, sessionmaker  # noqa: E402
+from sqlalchemy.pool import AsyncAdaptedQueuePool  # noqa: E402
+
+from app.database import Base  # noqa: E402
+from app.models.task import Task  # noqa: E402
+from app.models.user import User  # noqa: E402
+
+
+def _install_sleep(engine) -> None:
+    @event.listens_for(engine, "connect")
+    def _register(dbapi_connection, _record):
+        dbapi_connection.create_function("sleep_ms", 1, lambda ms: time.sleep(ms / 1000) or 0)
+
+
+def _seed(url: str, rows: int) -> None:
+    engine = create_engine(url)
+    Base.metadata.create_all(engine)
+    with Session(engine) as db:
+        owner = User(username="bench", email="bench@example.com", hashed_password="x")
+        db.add(owner)
+        db.flush()
+        db.add_all(Task(title=f"Task {i}", created_by=owner.id) for i in range(rows))
+        db.commit()
+    engine.dispose()
+
+
+def build_sync_app(url: str, pool_size: int, latency_ms: int) -> FastAPI:
+    engine = create_engine(
+        url, connect_args={"check_same_thread": False}, pool_size=pool_size, max_overflow=0
+    )
+    _install_sleep(engine)
+    factory = sessionmaker(bind=engine)
+
+    def get_db():
+        db = factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app = FastAPI()
+
+    @app.get("/tasks")
+    def list_tasks(db: Session = Depends(get_db)):
+        db.execute(select(func.sleep_ms(latency_ms)))
+        return [{"id": i, "title": t} for i, t in db.execute(select(Task.id, Task.title).limit(50))]
+
+    return app
+
+
+def build_async_app(url: str, pool_size: int, latency_ms: int) -> FastAPI:
+    engine = create_async_engine(
+        url.replace("sqlite://", "sqlite+aiosqlite://"),
+        poolclass=AsyncAdaptedQueuePool,
+        pool_size=pool_size,
+        max_overflow=0,
+    )
+    _install_sleep(engine.sync_engine)
+    factory = async_sessionmaker(engine, expire_on_commit=False)
+
+    async def get_db():
+        async with factory() as db:
+            yield db
+
+    app = FastAPI()
+
+    @app.get("/tasks")
+    async def list_tasks(db: AsyncSession = Depends(get_db)):
+        await db.execute(select(func.sleep_ms(latency_ms)))
+        rows = await db.execute(select(Task.id, Task.title).limit(50))
+        return [{"id": i, "title": t} for i, t in rows]
+
+    return app
+
+
+async def drive(app: FastAPI, requests: int, concurrency: int) -> dict:
+    latencies = []
+    gate = asyncio.Semaphore(concurrency)
+    transport = httpx.ASGITransport(app=app)
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        async def one():
+            async with gate:
+                start = time.perf_counter()
+                response = await client.get("/tasks")
+                response.raise_for_status()
+                latencies.append(time.perf_counter() - start)
+
+        # Warm-up: fill the connection pools before measuring
+        await asyncio.gather(*(one() for _ in range(concurrency)))
+        latencies.clear()
+
+        start = time.perf_counter()
+        await asyncio.gather(*(one() for _ in range(requests)))
+        elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        "rps": requests / elapsed,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p95_ms": latencies[int(len(latencies) * 0.95) - 1] * 1000,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--db-latency-ms", type=int, default=5)
+    parser.add_argument("--rows", type=int, default=1000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        url = f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+        _seed(url, args.rows)
+
+        print(
+            f"{args.requests} requests, concurrency {args.concurrency}, "
+            f"{args.db_latency_ms} ms simulated DB latency"
+        )
+        print(f"{'mode':<8}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}")
+        for mode, build in (("sync", build_sync_app), ("async", build_async_app)):
+            app = build(url, args.concurrency, args.db_latency_ms)
+            result = asyncio.run(drive(app, args.requests, args.concurrency))
+            print(f"{mode:<8}{result['rps']:>10.1f}{result['p50_ms']:>10.1f}{result['p95_ms']:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
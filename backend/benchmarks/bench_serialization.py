@@ -0,0 +1,100 @@
+"""Microbenchmark of list-response serialization: per-row validation vs one pass.
+
+``validated`` is the previous ``GET /tasks/`` path: ``model_validate`` on each
+ORM task, then FastAPI's own ``response_model`` validation and JSON encoding
+(``serialize_response`` + ``JSONResponse``). ``one-pass`` is the current path:
+column rows as dicts, encoded by a single pydantic-core ``dump_json`` with no
+validation.
+
+Only serialization is timed; rows and ORM objects are built up front, so
+database time is excluded.
+
+Usage:
+    python benchmarks/bench_serialization.py --sizes 100 10000 --repeat 20
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+from datetime import datetime, timezone
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from fastapi.responses import JSONResponse  # noqa: E402
+from fastapi.routing import serialize_response  # noqa: E402
+from fastapi.utils import create_model_field  # noqa: E402
+
+import app.main  # noqa: E402,F401 — configure mappers
+from app.models.task import Task, TaskStatus  # noqa: E402
+from app.schemas.task import TaskListResponse, TaskResponse  # noqa: E402
+from app.services.serialization import row_dicts, rows_response  # noqa: E402
+from app.services.task_queries import TASK_FIELDS  # noqa: E402
+
+RESPONSE_FIELD = create_model_field("response", TaskListResponse, mode="serialization")
+LOOP = asyncio.new_event_loop()
+
+
+def make_rows(n: int) -> list[tuple]:
+    now = datetime.now(timezone.utc)
+    return [
+        (i, f"Task {i}", "Some description " * 8, list(TaskStatus)[i % 4], i * 3,
+         i % 50 or None, 1, now, now)
+        for i in range(n)
+    ]
+
+
+def make_tasks(rows: list[tuple]) -> list[Task]:
+    return [Task(**dict(zip(TASK_FIELDS, row))) for row in rows]
+
+
+def validated(tasks: list[Task]) -> bytes:
+    page = TaskListResponse(
+        tasks=[TaskResponse.model_validate(t) for t in tasks], total=len(tasks)
+    )
+    content = LOOP.run_until_complete(
+        serialize_response(field=RESPONSE_FIELD, response_content=page)
+    )
+    return JSONResponse(content).body
+
+
+def one_pass(rows: list[tuple]) -> bytes:
+    return rows_response(
+        TaskListResponse, "tasks", TaskResponse, row_dicts(TASK_FIELDS, rows),
+        total=len(rows), total_is_estimate=False, next_cursor=None,
+    ).body
+
+
+def timed(fn, arg, repeat: int) -> list[float]:
+    fn(arg)  # warm-up
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(arg)
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 10_000])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"{'rows':>7}  {'path':<10} {'median ms':>10} {'p95 ms':>9} {'speedup':>8}")
+    for n in args.sizes:
+        rows = make_rows(n)
+        tasks = make_tasks(rows)
+        baseline = None
+        for name, fn, arg in (("validated", validated, tasks), ("one-pass", one_pass, rows)):
+            samples = sorted(timed(fn, arg, args.repeat))
+            median = statistics.median(samples) * 1000
+            p95 = samples[int(0.95 * (len(samples) - 1))] * 1000
+            baseline = baseline or median
+            print(f"{n:>7}  {name:<10} {median:>10.2f} {p95:>9.2f} {baseline / median:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
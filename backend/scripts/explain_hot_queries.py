@@ -0,0 +1,152 @@
+"""Print the query plan of each hot task query before and after migration 0002.
+
+By default this builds a throwaway SQLite database, migrates it to 0001,
+loads synthetic users/tasks, prints plans, upgrades to head and prints them
+again. Pass ``--url`` to use another database (e.g. a scratch PostgreSQL)
+instead; it must be empty or at revision 0001, because reaching 0001 from a
+later revision would drop the tables added since, and their data with them.
+It is left upgraded to head.
+
+Usage:
+    python scripts/explain_hot_queries.py [--rows 20000] [--url postgresql://…]
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+from datetime import timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from alembic import command  # noqa: E402
+from alembic.config import Config  # noqa: E402
+from alembic.runtime.migration import MigrationContext  # noqa: E402
+from sqlalchemy import column, create_engine, func, insert, or_, select, table, text  # noqa: E402
+
+from app.models.task import Task, TaskStatus, utcnow  # noqa: E402
+from app.models.time_entry import UserDailyMinutes  # noqa: E402
+from app.models.user import User  # noqa: E402
+from app.services.task_queries import TASK_ORDER, apply_task_filters  # noqa: E402
+
+BACKEND_DIR = os.path.join(os.path.dirname(__file__), "..")
+
+
+def top_users_query(at_head: bool):
+    """``GET /stats/top-users`` as each schema serves it."""
+    if not at_head:
+        # Before the time ledger: summed from the tasks themselves
+        total = func.coalesce(func.sum(Task.total_minutes), 0)
+        return (
+            select(User.id, User.username, total)
+            .outerjoin(Task, Task.assignee_id == User.id)
+            .group_by(User.id, User.username)
+            .order_by(total.desc())
+            .limit(5)
+        )
+    total = func.sum(UserDailyMinutes.minutes)
+    return (
+        select(User.id, User.username, total, func.sum(UserDailyMinutes.entry_count))
+        .join(User, User.id == UserDailyMinutes.user_id)
+        .where(UserDailyMinutes.day >= utcnow().date() - timedelta(days=6))
+        .group_by(User.id, User.username)
+        .order_by(total.desc(), User.id)
+        .limit(5)
+    )
+
+
+def hot_queries(at_head: bool) -> dict:
+    """The statements behind our busiest endpoints, with representative filters."""
+    return {
+        "GET /tasks/?status=in_progress": apply_task_filters(
+            select(Task), status_filter=TaskStatus.IN_PROGRESS
+        ).order_by(*TASK_ORDER).limit(50),
+        "GET /tasks/?assignee_id=1": apply_task_filters(
+            select(Task), assignee_id=1
+        ).order_by(*TASK_ORDER).limit(50),
+        "GET /tasks/ (unfiltered)": select(Task).order_by(*TASK_ORDER).limit(50),
+        "POST /ai/suggest daily_plan": select(Task).where(
+            or_(Task.assignee_id == 1, Task.created_by == 1)
+        ),
+        "GET /stats/top-users": top_users_query(at_head),
+    }
+
+
+def alembic_config(url: str) -> Config:
+    cfg = Config(os.path.join(BACKEND_DIR, "alembic.ini"))
+    cfg.set_main_option("script_location", os.path.join(BACKEND_DIR, "alembic"))
+    cfg.set_main_option("sqlalchemy.url", url.replace("%", "%%"))
+    cfg.attributes["configure_logger"] = False
+    return cfg
+
+
+# The tables as revision 0001 created them. The ORM models follow head and
+# may name columns 0001 does not have, so synthetic rows go through these.
+users_0001 = table("users", column("username"), column("email"),
+                   column("hashed_password"), column("is_admin"))
+tasks_0001 = table("tasks", column("id"), column("title"), column("status"),
+                   column("total_minutes"), column("assignee_id"), column("created_by"))
+
+
+def load_synthetic_data(engine, rows: int) -> None:
+    statuses = [status.name for status in TaskStatus]  # 0001's enum stores names
+    with engine.begin() as conn:
+        if conn.scalar(select(func.count(tasks_0001.c.id))):
+            return
+        conn.execute(insert(users_0001), [
+            {"username": f"user{i}", "email": f"user{i}@example.com",
+             "hashed_password": "x", "is_admin": False}
+            for i in range(1, 21)
+        ])
+        conn.execute(insert(tasks_0001), [
+            {"title": f"Task {i}", "status": random.choice(statuses),
+             "total_minutes": random.randint(0, 600),
+             "assignee_id": random.randint(1, 20), "created_by": random.randint(1, 20)}
+            for i in range(rows)
+        ])
+
+
+def print_plans(engine, label: str, at_head: bool) -> None:
+    dialect = engine.dialect
+    prefix = "EXPLAIN QUERY PLAN" if dialect.name == "sqlite" else "EXPLAIN"
+    with engine.begin() as conn:
+        conn.execute(text("ANALYZE"))
+        print(f"\n===== {label} =====")
+        for name, stmt in hot_queries(at_head).items():
+            sql = stmt.compile(dialect=dialect, compile_kwargs={"literal_binds": True})
+            print(f"\n-- {name}")
+            for row in conn.execute(text(f"{prefix} {sql}")):
+                print("   ", row[-1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Explain hot task queries around migration 0002")
+    parser.add_argument("--url", help="database to use (default: temporary SQLite file)")
+    parser.add_argument("--rows", type=int, default=20000, help="synthetic tasks to load")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        url = args.url or f"sqlite:///{os.path.join(tmp, 'explain.db')}"
+        cfg = alembic_config(url)
+        engine = create_engine(url)
+
+        with engine.connect() as conn:
+            current = MigrationContext.configure(conn).get_current_revision()
+        if current not in (None, "0001"):
+            engine.dispose()
+            parser.error(
+                f"{url} is at revision {current}; use an empty database or one at 0001 "
+                "(going back to 0001 would drop later tables and their data)"
+            )
+        command.upgrade(cfg, "0001")
+        load_synthetic_data(engine, args.rows)
+        print_plans(engine, "before (revision 0001)", at_head=False)
+
+        command.upgrade(cfg, "head")
+        print_plans(engine, "after (head)", at_head=True)
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""Import tasks from a spreadsheet CSV export (the ``estimates.csv`` shape).
+
+Same rules as ``POST /tasks/import``: columns ``task``, ``actual_hours``,
+``notes`` and optional ``assignee`` (username) and ``status``. The file is
+streamed and committed in batches; rejected rows are printed with their
+line numbers.
+
+Usage:
+    python scripts/import_tasks.py estimates.csv --created-by admin [--batch-size 1000]
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from sqlalchemy import select  # noqa: E402
+
+from app.database import AsyncSessionLocal, async_engine  # noqa: E402
+from app.models import status_event, task, task_change, time_entry, user  # noqa: E402,F401 — register mappers
+from app.services.task_import import IMPORT_BATCH, ImportReport, import_tasks, read_csv  # noqa: E402
+
+
+async def run(path: str, created_by: str, batch_size: int) -> ImportReport:
+    try:
+        async with AsyncSessionLocal() as db:
+            creator_id = await db.scalar(
+                select(user.User.id).where(user.User.username == created_by)
+            )
+            if creator_id is None:
+                raise SystemExit(f"Unknown user {created_by!r}")
+            with open(path, encoding="utf-8-sig", newline="") as lines:
+                return await import_tasks(db, read_csv(lines), creator_id, batch_size)
+    finally:
+        await async_engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Import tasks from a CSV file")
+    parser.add_argument("path", help="CSV file to import")
+    parser.add_argument("--created-by", required=True, help="username recorded as the creator")
+    parser.add_argument("--batch-size", type=int, default=IMPORT_BATCH, help="rows per commit")
+    args = parser.parse_args()
+
+    report = asyncio.run(run(args.path, args.created_by, args.batch_size))
+    for line, error in report.errors:
+        print(f"line {line}: {error}", file=sys.stderr)
+    if report.errors_truncated:
+        print(f"... {report.failed - len(report.errors)} more errors", file=sys.stderr)
+    print(f"Imported {report.created} tasks, rejected {report.failed}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+"""Rebuild the per-user daily rollups from the time ledger.
+
+Use after a bulk import, a manual fix to ``time_entries``, or to backfill a
+database whose rollups predate the ledger. Runs in one transaction.
+
+Usage:
+    python scripts/rebuild_time_rollups.py [--since 2026-10-01]
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+from datetime import date
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from app.database import AsyncSessionLocal, async_engine  # noqa: E402
+from app.models import status_event, task, task_change, time_entry, user  # noqa: E402,F401 — register mappers
+from app.services.time_ledger import rebuild_daily_rollups  # noqa: E402
+
+
+async def rebuild(since: date | None) -> int:
+    async with AsyncSessionLocal() as db:
+        rows = await rebuild_daily_rollups(db, since=since)
+        await db.commit()
+    await async_engine.dispose()
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Rebuild user_daily_minutes from time_entries")
+    parser.add_argument(
+        "--since", type=date.fromisoformat, help="only rebuild days from this date (YYYY-MM-DD)"
+    )
+    args = parser.parse_args()
+
+    rows = asyncio.run(rebuild(args.since))
+    scope = f"since {args.since}" if args.since else "all days"
+    print(f"Rebuilt {rows} rollup rows ({scope})")
+
+
+if __name__ == "__main__":
+    main()
@@ -7,7 +7,9 @@ sys.path.insert(0, os.path.dirname(__file__))
 
 from app.database import engine, SessionLocal, Base
 from app.models.user import User
-from app.models.task import Task, TaskStatus
+from app.models.task import Task, TaskStatus, utcnow
+from app.models.status_event import TaskStatusEvent
+from app.models.time_entry import TimeEntry, UserDailyMinutes
 from passlib.context import CryptContext
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
@@ -91,6 +93,29 @@ def seed():
             ),
         ]
         db.add_all(tasks)
+        db.flush()
+
+        # History behind the stats endpoints: current status and logged time
+        now = utcnow()
+        logged = [t for t in tasks if t.total_minutes]
+        db.add_all([
+            TaskStatusEvent(
+                task_id=t.id, to_status=t.status, changed_by=t.created_by, occurred_at=now
+            )
+            for t in tasks
+        ])
+        db.add_all([
+            TimeEntry(
+                task_id=t.id, user_id=t.assignee_id, minutes=t.total_minutes, logged_at=now
+            )
+            for t in logged
+        ])
+        for user_id in {t.assignee_id for t in logged}:
+            mine = [t for t in logged if t.assignee_id == user_id]
+            db.add(UserDailyMinutes(
+                day=now.date(), user_id=user_id,
+                minutes=sum(t.total_minutes for t in mine), entry_count=len(mine),
+            ))
         db.commit()
 
         print("✅ Seeded database with 3 users and 5 tasks.")
@@ -4,15 +4,20 @@ import os
 import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
 
 # Force stub mode and SQLite for tests
 os.environ["AI_STUB_MODE"] = "false"
 os.environ["DATABASE_URL"] = "sqlite:///./test.db"
 
-from app.database import Base, get_db
+from app.database import Base, clear_write_pins, get_db, get_read_db, get_read_session_factory
 from app.main import app
-from app.services.auth_service import create_access_token, hash_password
+from app.services.auth_service import clear_token_cache, create_access_token, hash_password
+from app.services.principal_cache import clear_principal_cache
+from app.services.idempotency import store as idempotency_store
+from app.services.task_stream import hub as task_stream_hub
 from app.models.user import User
 from app.models.task import Task, TaskStatus
 
@@ -21,20 +26,31 @@ TEST_DATABASE_URL = "sqlite:///./test.db"
 test_engine = create_engine(TEST_DATABASE_URL, connect_args={"check_same_thread": False})
 TestSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=test_engine)
 
+# Request handlers run on the async engine. NullPool: TestClient may drive
+# requests from different event loops, so connections are never reused.
+test_async_engine = create_async_engine("sqlite+aiosqlite:///./test.db", poolclass=NullPool)
+TestAsyncSessionLocal = async_sessionmaker(
+    test_async_engine, autoflush=False, expire_on_commit=False
+)
+task_stream_hub.session_factory = TestAsyncSessionLocal
+
 
 @pytest.fixture(autouse=True)
 def test_db():
     """Create fresh tables for each test, then tear down."""
     Base.metadata.create_all(bind=test_engine)
+    clear_principal_cache()
+    clear_token_cache()
+    clear_write_pins()
+    idempotency_store.clear()
 
-    def override_get_db():
-        db = TestSessionLocal()
-        try:
+    async def override_get_db():
+        async with TestAsyncSessionLocal() as db:
             yield db
-        finally:
-            db.close()
 
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_read_db] = override_get_db
+    app.dependency_overrides[get_read_session_factory] = lambda: TestAsyncSessionLocal
     yield
     app.dependency_overrides.clear()
     Base.metadata.drop_all(bind=test_engine)
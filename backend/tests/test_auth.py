@@ -57,6 +57,31 @@ class TestLogin:
         assert response.status_code == 401
 
 
+class TestPasswordHashingQueue:
+    """bcrypt runs on a bounded executor; overload fails fast."""
+
+    def test_login_returns_503_when_queue_full(self, client, test_user, monkeypatch):
+        """With no free hashing slots, login is rejected immediately with 503."""
+        from app.services import hashing
+
+        monkeypatch.setattr(hashing.settings, "HASH_QUEUE_LIMIT", 0)
+        response = client.post("/auth/login", json={
+            "username": "testuser",
+            "password": "testpass123",
+        })
+
+        assert response.status_code == 503
+        assert response.headers["retry-after"] == "1"
+
+    def test_hashing_stats_in_metrics(self, client, test_user):
+        """Completed hash jobs show up in the /metrics payload."""
+        client.post("/auth/login", json={"username": "testuser", "password": "testpass123"})
+
+        stats = client.get("/metrics").json()["password_hashing"]
+        assert stats["queue_depth"] == 0
+        assert stats["latency_seconds"]["count"] >= 1
+
+
 class TestAuthMe:
     """Tests for GET /auth/me."""
 
@@ -72,3 +97,31 @@ class TestAuthMe:
         """Request without token returns 403."""
         response = client.get("/auth/me")
         assert response.status_code == 401
+
+
+class TestTokenVerification:
+    """The bearer token is verified once, then reused."""
+
+    def test_token_decoded_once_across_requests(self, client, auth_headers, monkeypatch):
+        """Middleware and auth share one verification; repeat requests hit the token cache."""
+        from app.services import auth_service
+
+        calls = []
+        real_decode = auth_service.decode_token
+
+        def counting_decode(token):
+            calls.append(token)
+            return real_decode(token)
+
+        monkeypatch.setattr(auth_service, "decode_token", counting_decode)
+
+        assert client.get("/auth/me", headers=auth_headers).status_code == 200
+        assert len(calls) == 1
+
+        assert client.get("/tasks/", headers=auth_headers).status_code == 200
+        assert len(calls) == 1
+
+    def test_invalid_token_rejected(self, client):
+        """A tampered token is still rejected with 401."""
+        response = client.get("/auth/me", headers={"Authorization": "Bearer not-a-jwt"})
+        assert response.status_code == 401
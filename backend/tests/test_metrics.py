@@ -0,0 +1,147 @@
+"""Tests for the /metrics endpoint."""
+
+import multiprocessing
+import os
+import random
+
+from app.database import engine
+from app.routers.metrics import request_metrics
+from app.services.request_metrics import OTHER_ROUTE, RequestMetrics
+
+
+def _worker(directory: str, requests: int, latency_s: float) -> None:
+    """One worker process: serve ``requests`` requests, then shut down."""
+    metrics = RequestMetrics(directory=directory, flush_interval=0.05)
+    metrics.start()
+    for _ in range(requests):
+        metrics.record("GET", "/tasks/{task_id}", 200, latency_s)
+    metrics.record("POST", "/tasks/", 201, latency_s)
+    metrics.close()
+
+
+class TestPoolMetrics:
+    """Connection pool telemetry on /metrics."""
+
+    def test_pool_stats_exposed(self, client):
+        """/metrics reports pool size, usage and checkout wait time."""
+        with engine.connect():
+            pool = client.get("/metrics").json()["database_pool"]["scripts"]
+
+        assert pool["pool"] == "InstrumentedQueuePool"
+        assert pool["checked_out"] == 1
+        assert pool["checkouts_total"] >= 1
+        assert pool["checkout_wait_seconds_max"] >= 0
+
+
+class TestRequestMetrics:
+    """Bounded per-route request counters and latency quantiles."""
+
+    def test_histogram_and_quantiles(self):
+        """Buckets are cumulative and p50/p95/p99 come from the sketch within 1%."""
+        metrics = RequestMetrics()
+        rng = random.Random(7)
+        latencies = [rng.uniform(0.001, 0.2) for _ in range(5000)]
+        for latency in latencies:
+            metrics.record("GET", "/tasks/{task_id}", 200, latency)
+        metrics.record("GET", "/tasks/{task_id}", 404, 0.003)
+
+        snapshot = metrics.snapshot()
+        route = snapshot["routes"]["GET /tasks/{task_id}"]
+        assert route["requests_total"] == {"200": 5000, "404": 1}
+        assert snapshot["requests_total"]["GET /tasks/{task_id} 404"] == 1
+        histogram = route["latency_seconds"]
+        assert histogram["count"] == 5001
+        assert histogram["le_0.05"] <= histogram["le_0.1"] <= histogram["le_0.25"] == 5001
+
+        ordered = sorted(latencies)
+        for name, q in (("p50", 0.5), ("p95", 0.95), ("p99", 0.99)):
+            exact = ordered[int(q * (len(ordered) - 1))]
+            assert abs(route[f"latency_seconds_{name}"] - exact) <= 0.011 * exact
+        assert snapshot["request_latency_seconds"]["p99"] == route["latency_seconds_p99"]
+
+    def test_series_are_bounded(self):
+        """Past max_routes, new routes fold into one overflow series."""
+        metrics = RequestMetrics(max_routes=3)
+        for i in range(50):
+            metrics.record("GET", f"/r{i}", 200, 0.01)
+        routes = metrics.snapshot()["routes"]
+        assert len(routes) == 4
+        assert routes[f"GET {OTHER_ROUTE}"]["latency_seconds"]["count"] == 47
+
+    def test_requests_recorded_by_route_template(self, client, auth_headers, sample_task):
+        """The middleware labels requests with the matched template, not the raw path."""
+        request_metrics.reset()
+        client.get(f"/tasks/{sample_task.id}", headers=auth_headers)
+        client.get("/no-such-page")
+
+        requests_total = client.get("/metrics").json()["requests_total"]
+        assert requests_total["GET /tasks/{task_id} 200"] == 1
+        assert requests_total["GET <unmatched> 404"] == 1
+        assert not any(str(sample_task.id) in series for series in requests_total)
+
+
+class TestPrometheusFormat:
+    """/metrics in the Prometheus text exposition format."""
+
+    def test_format_query_parameter(self, client):
+        request_metrics.reset()
+        client.get("/")
+        response = client.get("/metrics", params={"format": "prometheus"})
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+        body = response.text
+        assert "# TYPE sprintsync_http_requests_total counter" in body
+        assert "# TYPE sprintsync_http_request_duration_seconds histogram" in body
+        assert 'sprintsync_http_requests_total{method="GET",route="/",status="200"} 1' in body
+        assert 'sprintsync_http_request_duration_seconds_bucket{method="GET",route="/",le="+Inf"} 1' in body
+        assert 'sprintsync_db_pool_checkouts_total{engine="scripts"}' in body
+        assert "# TYPE sprintsync_idempotency_replays_total counter" in body
+
+    def test_accept_negotiation(self, client):
+        """Scrapers asking for text get it; browsers and API clients keep JSON."""
+        scraped = client.get("/metrics", headers={"Accept": "text/plain;version=0.0.4"})
+        assert "# TYPE sprintsync_uptime_seconds gauge" in scraped.text
+
+        assert client.get("/metrics", headers={"Accept": "application/json"}).json()["gauges"]
+        forced = client.get(
+            "/metrics", params={"format": "json"}, headers={"Accept": "text/plain"}
+        )
+        assert forced.headers["content-type"] == "application/json"
+
+
+class TestCrossWorkerMetrics:
+    """METRICS_DIR: one worker's /metrics reports the whole node."""
+
+    def test_totals_across_worker_processes(self, tmp_path, monkeypatch):
+        ctx = multiprocessing.get_context("spawn")  # as uvicorn --workers starts them
+        workers = [
+            ctx.Process(target=_worker, args=(str(tmp_path), 100 * n, 0.02 * n))
+            for n in (1, 2, 3)
+        ]
+        for process in workers:
+            process.start()
+        for process in workers:
+            process.join(timeout=60)
+            assert process.exitcode == 0
+
+        scraper = RequestMetrics(directory=str(tmp_path))
+        scraper.start()  # reads the other workers' files
+        scraper.record("GET", "/metrics", 200, 0.001)
+        with monkeypatch.context() as patch:
+            # A scrape merges in memory; only the background sync touches files
+            patch.setattr(os, "listdir", None)
+            patch.setattr("builtins.open", None)
+            snapshot = scraper.snapshot()
+        scraper.close()
+
+        assert snapshot["workers"] == 4
+        assert snapshot["requests_total"]["GET /tasks/{task_id} 200"] == 600
+        assert snapshot["requests_total"]["POST /tasks/ 201"] == 3
+        assert snapshot["requests_total"]["GET /metrics 200"] == 1
+        route = snapshot["routes"]["GET /tasks/{task_id}"]
+        histogram = route["latency_seconds"]
+        assert (histogram["le_0.01"], histogram["le_0.05"], histogram["le_0.1"]) == (0, 300, 600)
+        assert histogram["sum"] == 28.0  # 100 * 0.02 + 200 * 0.04 + 300 * 0.06
+        assert abs(route["latency_seconds_p50"] - 0.04) <= 0.01 * 0.04
+        assert abs(route["latency_seconds_p99"] - 0.06) <= 0.01 * 0.06
@@ -0,0 +1,109 @@
+"""Unit tests for the stats endpoints and the time ledger behind them."""
+
+import asyncio
+from datetime import timedelta
+
+from sqlalchemy import select
+
+from app.models.status_event import TaskStatusEvent
+from app.models.task import TaskStatus, utcnow
+from app.models.time_entry import TimeEntry, UserDailyMinutes
+from app.services.sketch import LogBucketSketch
+from app.services.time_ledger import rebuild_daily_rollups
+from tests.conftest import TestAsyncSessionLocal
+
+
+def _rebuild():
+    async def run():
+        async with TestAsyncSessionLocal() as db:
+            await rebuild_daily_rollups(db)
+            await db.commit()
+
+    asyncio.run(run())
+
+
+class TestTopUsers:
+    """Tests for GET /stats/top-users."""
+
+    def test_log_time_feeds_ledger_and_rollup(self, client, auth_headers, sample_task, db_session):
+        """Each log-time call appends a ledger row and bumps today's rollup."""
+        for minutes in (30, 45):
+            client.post(
+                f"/tasks/{sample_task.id}/log-time", json={"minutes": minutes}, headers=auth_headers
+            )
+
+        entries = db_session.scalars(select(TimeEntry.minutes)).all()
+        assert sorted(entries) == [30, 45]
+        rollup = db_session.scalars(select(UserDailyMinutes)).one()
+        assert (rollup.day, rollup.minutes, rollup.entry_count) == (utcnow().date(), 75, 2)
+
+        data = client.get("/stats/top-users?days=1", headers=auth_headers).json()
+        assert data["top_users"] == [{
+            "user_id": sample_task.assignee_id,
+            "username": "testuser",
+            "total_minutes": 75,
+            "entry_count": 2,
+        }]
+
+    def test_days_window_excludes_older_entries(
+        self, client, auth_headers, admin_user, test_user, db_session
+    ):
+        """Minutes older than the window do not count; rebuild matches incremental."""
+        old = utcnow() - timedelta(days=10)
+        db_session.add_all([
+            TimeEntry(user_id=admin_user.id, minutes=500, logged_at=old),
+            TimeEntry(user_id=test_user.id, minutes=60, logged_at=utcnow()),
+        ])
+        db_session.commit()
+        _rebuild()
+
+        week = client.get("/stats/top-users?days=7", headers=auth_headers).json()
+        assert [u["username"] for u in week["top_users"]] == ["testuser"]
+
+        month = client.get("/stats/top-users?days=30", headers=auth_headers).json()
+        assert [u["total_minutes"] for u in month["top_users"]] == [500, 60]
+
+
+class TestCycleTime:
+    """Tests for GET /stats/cycle-time and the status history behind it."""
+
+    def test_transitions_append_events(self, client, auth_headers, db_session):
+        """Creation and each accepted transition are recorded, chained in order."""
+        created = client.post("/tasks/", json={"title": "Track me"}, headers=auth_headers)
+        url = f"/tasks/{created.json()['id']}/status"
+        for new_status in ("in_progress", "review", "done", "review"):
+            client.patch(url, json={"status": new_status}, headers=auth_headers)
+
+        events = db_session.scalars(select(TaskStatusEvent).order_by(TaskStatusEvent.id)).all()
+        assert [(e.from_status, e.to_status) for e in events] == [
+            (None, TaskStatus.TODO),
+            (TaskStatus.TODO, TaskStatus.IN_PROGRESS),
+            (TaskStatus.IN_PROGRESS, TaskStatus.REVIEW),
+            (TaskStatus.REVIEW, TaskStatus.DONE),
+        ]
+        assert events[0].duration_seconds is None
+        assert all(e.duration_seconds >= 0 for e in events[1:])
+
+        report = client.get("/stats/cycle-time", headers=auth_headers).json()
+        by_status = {r["status"]: r for r in report["cycle_time_by_status"]}
+        assert by_status["todo"]["transitions"] == 1
+        assert by_status["review"]["transitions"] == 1
+        assert by_status["done"]["transitions"] == 0
+        assert by_status["done"]["p50_seconds"] is None
+        assert by_status["done"]["task_count"] == 1
+        assert by_status["todo"]["p95_seconds"] is not None
+
+    def test_sketch_quantiles_within_relative_error(self):
+        """Percentiles from the log-bucket sketch stay within alpha of the truth."""
+        sketch = LogBucketSketch(alpha=0.02)
+        values = [float(v) for v in range(1, 10001)]
+        for v in values:
+            sketch.add(v)
+
+        for q in (0.5, 0.85, 0.95):
+            exact = values[int(q * (len(values) - 1))]
+            assert abs(sketch.quantile(q) - exact) <= 0.02 * exact
+        assert len(sketch.counts) < 500
+
+        rebuilt = LogBucketSketch.from_counts(sketch.counts, sketch.sum, alpha=0.02)
+        assert rebuilt.quantile(0.95) == sketch.quantile(0.95)
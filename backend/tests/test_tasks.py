@@ -1,5 +1,31 @@
 """Unit tests for task CRUD — happy paths."""
 
+import asyncio
+import csv
+import io
+import json
+import threading
+import time
+
+from fastapi import Response
+from sqlalchemy import delete, event, func, select, update
+
+from app.models.task import Task, TaskStatus
+from app.models.task_change import TaskChange
+from app.schemas.task import TaskResponse
+from app.models.status_event import TaskStatusEvent
+from app.models.time_entry import TimeEntry
+from app.services import task_export, task_import, task_service
+from app.services.idempotency import IdempotencyStore
+from app.services.task_stream import (
+    MemoryBackend,
+    PollingBackend,
+    TaskEvent,
+    TaskStreamHub,
+    hub,
+)
+from tests.conftest import TestAsyncSessionLocal, test_async_engine
+
 
 class TestCreateTask:
     """Tests for POST /tasks."""
@@ -37,6 +63,12 @@ class TestListTasks:
         assert data["total"] >= 1
         assert len(data["tasks"]) >= 1
 
+    def test_list_matches_task_schema(self, client, auth_headers, sample_task):
+        """Rows encoded straight from columns have exactly the TaskResponse shape."""
+        task = client.get("/tasks/", headers=auth_headers).json()["tasks"][0]
+        assert list(task) == list(TaskResponse.model_fields)
+        assert TaskResponse.model_validate(task).id == sample_task.id
+
     def test_filter_by_status(self, client, auth_headers, sample_task):
         """Filtering by status returns matching tasks."""
         response = client.get("/tasks/?status=todo", headers=auth_headers)
@@ -47,6 +79,90 @@ class TestListTasks:
             assert task["status"] == "todo"
 
 
+class TestTaskFields:
+    """Tests for the fields= projection on GET /tasks."""
+
+    def test_projection_selects_only_requested_columns(self, client, auth_headers):
+        """Only the named fields (plus id) are read and returned."""
+        client.post("/tasks/bulk", json={"tasks": [
+            {"title": f"T{i}", "description": "long text " * 50} for i in range(3)
+        ]}, headers=auth_headers)
+
+        statements = []
+        listener = lambda *args: statements.append(args[2])  # noqa: E731
+        event.listen(test_async_engine.sync_engine, "before_cursor_execute", listener)
+        try:
+            response = client.get("/tasks/?fields=title,status&limit=2", headers=auth_headers)
+        finally:
+            event.remove(test_async_engine.sync_engine, "before_cursor_execute", listener)
+
+        assert response.status_code == 200
+        assert response.headers["etag"].startswith('W/"')
+        data = response.json()
+        assert data["total"] == 3
+        assert [set(t) for t in data["tasks"]] == [{"id", "title", "status"}] * 2
+        assert data["tasks"][0] == {"id": data["tasks"][0]["id"], "title": "T2", "status": "todo"}
+        page_query = [s for s in statements if "FROM tasks" in s and "LIMIT" in s]
+        assert page_query and "description" not in page_query[0]
+
+        rest = client.get(
+            f"/tasks/?fields=title&cursor={data['next_cursor']}", headers=auth_headers
+        ).json()
+        assert [t["title"] for t in rest["tasks"]] == ["T0"]
+        assert rest["next_cursor"] is None
+
+    def test_unknown_field_rejected(self, client, auth_headers):
+        response = client.get("/tasks/?fields=title,password", headers=auth_headers)
+        assert response.status_code == 400
+        assert "password" in response.json()["detail"]
+
+
+class TestTaskExpand:
+    """Tests for expand=assignee,creator."""
+
+    def _count_queries(self, client, url, headers):
+        statements = []
+        listener = lambda *args: statements.append(args[2])  # noqa: E731
+        event.listen(test_async_engine.sync_engine, "before_cursor_execute", listener)
+        try:
+            response = client.get(url, headers=headers)
+        finally:
+            event.remove(test_async_engine.sync_engine, "before_cursor_execute", listener)
+        assert response.status_code == 200
+        return response.json(), len(statements)
+
+    def test_expand_uses_constant_queries(self, client, auth_headers, test_user, admin_user):
+        """The embedded users cost one query however many tasks are on the page."""
+        url = "/tasks/?expand=assignee,creator"
+        client.post("/tasks/bulk", json={"tasks": [{"title": "A", "assignee_id": test_user.id}]},
+                    headers=auth_headers)
+        small, small_queries = self._count_queries(client, url, auth_headers)
+
+        client.post("/tasks/bulk", json={"tasks": [
+            {"title": f"T{i}", "assignee_id": (test_user.id, admin_user.id, None)[i % 3]}
+            for i in range(30)
+        ]}, headers=auth_headers)
+        large, large_queries = self._count_queries(client, url, auth_headers)
+
+        assert len(small["tasks"]) == 1 and len(large["tasks"]) == 31
+        assert small_queries == large_queries
+        first = small["tasks"][0]
+        assert first["assignee"] == {"id": test_user.id, "username": "testuser"}
+        assert first["creator"] == {"id": test_user.id, "username": "testuser"}
+        assert {t["assignee"]["username"] if t["assignee"] else None for t in large["tasks"]} == {
+            "testuser", "adminuser", None,
+        }
+
+    def test_expand_with_fields_and_single_task(self, client, auth_headers, sample_task):
+        tasks = client.get("/tasks/?fields=title&expand=assignee", headers=auth_headers).json()
+        assert set(tasks["tasks"][0]) == {"id", "title", "assignee_id", "assignee"}
+
+        task = client.get(f"/tasks/{sample_task.id}?expand=creator", headers=auth_headers).json()
+        assert task["creator"]["username"] == "testuser"
+        assert "assignee" not in task
+        assert client.get("/tasks/?expand=comments", headers=auth_headers).status_code == 400
+
+
 class TestTaskStatusTransition:
     """Tests for PATCH /tasks/{id}/status."""
 
@@ -71,3 +187,616 @@ class TestTaskStatusTransition:
 
         assert response.status_code == 400
         assert "Cannot transition" in response.json()["detail"]
+
+    def test_same_status_transition(self, client, auth_headers, sample_task):
+        """Transitioning to the current status is rejected with a clear message."""
+        response = client.patch(
+            f"/tasks/{sample_task.id}/status",
+            json={"status": "todo"},
+            headers=auth_headers,
+        )
+
+        assert response.status_code == 400
+        assert "already in 'todo'" in response.json()["detail"]
+
+
+class TestTaskPagination:
+    """Keyset pagination and count modes for GET /tasks."""
+
+    def _create(self, client, headers, n):
+        for i in range(n):
+            client.post("/tasks/", json={"title": f"Task {i}"}, headers=headers)
+
+    def test_cursor_walks_all_pages(self, client, auth_headers):
+        """Following next_cursor visits every task exactly once, newest first."""
+        self._create(client, auth_headers, 5)
+
+        seen, cursor = [], None
+        while True:
+            params = {"limit": 2} if cursor is None else {"limit": 2, "cursor": cursor}
+            data = client.get("/tasks/", params=params, headers=auth_headers).json()
+            seen.extend(t["title"] for t in data["tasks"])
+            cursor = data["next_cursor"]
+            if cursor is None:
+                break
+
+        assert seen == [f"Task {i}" for i in reversed(range(5))]
+
+    def test_count_none_omits_total(self, client, auth_headers, sample_task):
+        """count=none skips the COUNT query entirely."""
+        data = client.get("/tasks/?count=none", headers=auth_headers).json()
+        assert data["total"] is None
+        assert len(data["tasks"]) == 1
+
+    def test_invalid_cursor_rejected(self, client, auth_headers):
+        """A cursor we did not issue is a 400, not a 500."""
+        response = client.get("/tasks/?cursor=garbage", headers=auth_headers)
+        assert response.status_code == 400
+
+
+class TestLogTime:
+    """Tests for POST /tasks/{id}/log-time."""
+
+    def test_log_time_accumulates(self, client, auth_headers, sample_task):
+        """Each call adds to the running total."""
+        for _ in range(3):
+            response = client.post(
+                f"/tasks/{sample_task.id}/log-time",
+                json={"minutes": 15},
+                headers=auth_headers,
+            )
+            assert response.status_code == 200
+
+        assert response.json()["total_minutes"] == 45
+
+    def test_log_time_missing_task(self, client, auth_headers):
+        """Logging against an unknown task returns 404."""
+        response = client.post("/tasks/999/log-time", json={"minutes": 5}, headers=auth_headers)
+        assert response.status_code == 404
+
+
+class TestBulkTasks:
+    """Tests for the /tasks/bulk endpoints."""
+
+    def test_bulk_create_reports_per_item(self, client, auth_headers, test_user):
+        """Valid items are created in order; unknown assignees fail individually."""
+        response = client.post("/tasks/bulk", json={"tasks": [
+            {"title": "First", "assignee_id": test_user.id},
+            {"title": "Orphan", "assignee_id": 99999},
+            {"title": "Third"},
+        ]}, headers=auth_headers)
+
+        assert response.status_code == 200
+        data = response.json()
+        assert (data["succeeded"], data["failed"]) == (2, 1)
+        results = data["results"]
+        assert results[0]["task"]["title"] == "First"
+        assert results[1] == {"index": 1, "ok": False, "task": None, "error": "Assignee not found"}
+        assert results[2]["task"]["title"] == "Third"
+        assert results[0]["task"]["id"] < results[2]["task"]["id"]
+
+    def test_bulk_transition_applies_in_order(self, client, auth_headers, sample_task):
+        """Later items see the status left by earlier items in the same batch."""
+        response = client.patch("/tasks/bulk/status", json={"items": [
+            {"task_id": sample_task.id, "status": "in_progress"},
+            {"task_id": sample_task.id, "status": "review"},
+            {"task_id": sample_task.id, "status": "todo"},
+            {"task_id": 99999, "status": "in_progress"},
+        ]}, headers=auth_headers)
+
+        assert response.status_code == 200
+        results = response.json()["results"]
+        assert [r["ok"] for r in results] == [True, True, False, False]
+        assert "Cannot transition" in results[2]["error"]
+        assert results[3]["error"] == "Task not found"
+
+        task = client.get(f"/tasks/{sample_task.id}", headers=auth_headers).json()
+        assert task["status"] == "review"
+
+    def test_bulk_transition_reports_missed_update(
+        self, client, auth_headers, sample_task, db_session, monkeypatch
+    ):
+        """A task changed between the read and the UPDATE fails without events."""
+        other = client.post("/tasks/", json={"title": "Other"}, headers=auth_headers).json()
+        lock_statuses = task_service._lock_statuses
+
+        async def stale_read(db, task_ids):
+            statuses = await lock_statuses(db, task_ids)
+            # Another writer moves the task on before the batch's UPDATE runs
+            await db.execute(
+                update(Task).where(Task.id == sample_task.id).values(status=TaskStatus.REVIEW)
+            )
+            return statuses
+
+        monkeypatch.setattr(task_service, "_lock_statuses", stale_read)
+        events_before = db_session.scalar(select(func.count()).select_from(TaskStatusEvent))
+        feed_before = db_session.scalar(select(func.count()).select_from(TaskChange))
+
+        response = client.patch("/tasks/bulk/status", json={"items": [
+            {"task_id": sample_task.id, "status": "in_progress"},
+            {"task_id": other["id"], "status": "in_progress"},
+        ]}, headers=auth_headers)
+
+        assert response.status_code == 200
+        results = response.json()["results"]
+        assert [r["ok"] for r in results] == [False, True]
+        assert "modified concurrently" in results[0]["error"]
+        events = db_session.scalars(
+            select(TaskStatusEvent.task_id).order_by(TaskStatusEvent.id)
+        ).all()
+        assert len(events) == events_before + 1 and events[-1] == other["id"]
+        feed = db_session.scalars(select(TaskChange.task_id).order_by(TaskChange.seq)).all()
+        assert feed[feed_before:] == [other["id"]]
+
+    def test_bulk_log_time_sums_duplicates(self, client, auth_headers, sample_task):
+        """Several entries for one task are all applied."""
+        response = client.post("/tasks/bulk/log-time", json={"items": [
+            {"task_id": sample_task.id, "minutes": 30},
+            {"task_id": sample_task.id, "minutes": 15},
+            {"task_id": 99999, "minutes": 5},
+        ]}, headers=auth_headers)
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["succeeded"] == 2
+        assert data["results"][1]["task"]["total_minutes"] == 45
+        assert data["results"][2]["error"] == "Task not found"
+
+    def test_bulk_log_time_skips_task_deleted_mid_batch(
+        self, client, auth_headers, sample_task, db_session, monkeypatch
+    ):
+        """A task deleted after the existence check gets no ledger or feed rows."""
+        other = client.post("/tasks/", json={"title": "Other"}, headers=auth_headers).json()
+        lock_statuses = task_service._lock_statuses
+
+        async def stale_read(db, task_ids):
+            statuses = await lock_statuses(db, task_ids)
+            await db.execute(delete(Task).where(Task.id == sample_task.id))
+            return statuses
+
+        monkeypatch.setattr(task_service, "_lock_statuses", stale_read)
+        feed_before = db_session.scalar(select(func.count()).select_from(TaskChange))
+
+        response = client.post("/tasks/bulk/log-time", json={"items": [
+            {"task_id": sample_task.id, "minutes": 30},
+            {"task_id": other["id"], "minutes": 15},
+        ]}, headers=auth_headers)
+
+        assert response.status_code == 200
+        results = response.json()["results"]
+        assert [r["ok"] for r in results] == [False, True]
+        assert results[0]["error"] == "Task not found"
+        assert db_session.scalars(select(TimeEntry.task_id)).all() == [other["id"]]
+        feed = db_session.scalars(select(TaskChange.task_id).order_by(TaskChange.seq)).all()
+        assert feed[feed_before:] == [other["id"]]
+
+    def test_bulk_rejects_oversized_batch(self, client, auth_headers):
+        """Batches above the item limit are rejected before touching the DB."""
+        items = [{"task_id": 1, "minutes": 1}] * 501
+        response = client.post("/tasks/bulk/log-time", json={"items": items}, headers=auth_headers)
+        assert response.status_code == 422
+
+
+class TestTaskSearch:
+    """Tests for GET /tasks/search."""
+
+    def _create(self, client, headers, title, description=None):
+        return client.post(
+            "/tasks/", json={"title": title, "description": description}, headers=headers
+        ).json()["id"]
+
+    def test_ranked_results_with_snippets(self, client, auth_headers):
+        """Title matches outrank description matches; snippets highlight the terms."""
+        body = self._create(client, auth_headers, "Write docs", "Explain the deployment pipeline")
+        title = self._create(client, auth_headers, "Fix deployment script", "Broken on CI")
+        self._create(client, auth_headers, "Unrelated", "Nothing to see")
+
+        response = client.get("/tasks/search?q=deploy", headers=auth_headers)
+
+        assert response.status_code == 200
+        results = response.json()["results"]
+        assert [r["task"]["id"] for r in results] == [title, body]
+        assert "<mark>" in results[1]["snippet"]
+
+    def test_index_follows_updates_and_deletes(self, client, auth_headers):
+        """Edited and deleted tasks are reflected in the index immediately."""
+        task_id = self._create(client, auth_headers, "Old wording")
+        client.put(f"/tasks/{task_id}", json={"title": "Fresh wording"}, headers=auth_headers)
+
+        assert client.get("/tasks/search?q=old", headers=auth_headers).json()["results"] == []
+        fresh = client.get("/tasks/search?q=fresh", headers=auth_headers).json()["results"]
+        assert [r["task"]["id"] for r in fresh] == [task_id]
+
+        client.delete(f"/tasks/{task_id}", headers=auth_headers)
+        assert client.get("/tasks/search?q=fresh", headers=auth_headers).json()["results"] == []
+
+    def test_cursor_pagination(self, client, auth_headers):
+        """Pages chain through next_cursor without repeats."""
+        ids = {self._create(client, auth_headers, f"Refactor module {i}") for i in range(5)}
+
+        seen, cursor = [], None
+        while True:
+            url = "/tasks/search?q=refactor&limit=2" + (f"&cursor={cursor}" if cursor else "")
+            page = client.get(url, headers=auth_headers).json()
+            seen += [r["task"]["id"] for r in page["results"]]
+            cursor = page["next_cursor"]
+            if cursor is None:
+                break
+        assert sorted(seen) == sorted(ids)
+
+    def test_query_operators_are_literal(self, client, auth_headers):
+        """FTS syntax in user input is treated as plain words, not an error."""
+        response = client.get('/tasks/search?q=foo" OR (bar', headers=auth_headers)
+        assert response.status_code == 200
+        assert client.get("/tasks/search?q=%21%21", headers=auth_headers).status_code == 400
+
+
+class TestTaskETags:
+    """Tests for conditional GETs on the task read endpoints."""
+
+    def test_list_not_modified_skips_row_query(self, client, auth_headers, sample_task):
+        """A matching If-None-Match returns 304 without reading the tasks table."""
+        first = client.get("/tasks/?status=todo", headers=auth_headers)
+        etag = first.headers["etag"]
+        assert etag.startswith('W/"')
+
+        statements = []
+        listener = lambda *args: statements.append(args[2])  # noqa: E731
+        event.listen(test_async_engine.sync_engine, "before_cursor_execute", listener)
+        try:
+            again = client.get(
+                "/tasks/?status=todo", headers={**auth_headers, "If-None-Match": etag}
+            )
+        finally:
+            event.remove(test_async_engine.sync_engine, "before_cursor_execute", listener)
+
+        assert again.status_code == 304
+        assert again.content == b""
+        assert not [s for s in statements if "FROM tasks" in s]
+        assert len([s for s in statements if "FROM task_changes" in s]) == 1
+
+    def test_list_etag_changes_with_data_and_params(self, client, auth_headers, sample_task):
+        """Writes and different filters both produce a different tag."""
+        etag = client.get("/tasks/", headers=auth_headers).headers["etag"]
+        assert client.get("/tasks/?limit=5", headers=auth_headers).headers["etag"] != etag
+
+        client.post(f"/tasks/{sample_task.id}/log-time", json={"minutes": 5}, headers=auth_headers)
+        response = client.get("/tasks/", headers={**auth_headers, "If-None-Match": etag})
+        assert response.status_code == 200
+        assert response.headers["etag"] != etag
+
+        client.delete(f"/tasks/{sample_task.id}", headers=auth_headers)
+        latest = response.headers["etag"]
+        conditional = {**auth_headers, "If-None-Match": latest}
+        assert client.get("/tasks/", headers=conditional).status_code == 200
+
+    def test_get_task_not_modified(self, client, auth_headers, sample_task):
+        """Single-task reads revalidate against the task's own version."""
+        etag = client.get(f"/tasks/{sample_task.id}", headers=auth_headers).headers["etag"]
+        conditional = {**auth_headers, "If-None-Match": etag}
+        assert client.get(f"/tasks/{sample_task.id}", headers=conditional).status_code == 304
+
+        client.patch(
+            f"/tasks/{sample_task.id}/status", json={"status": "in_progress"}, headers=auth_headers
+        )
+        assert client.get(f"/tasks/{sample_task.id}", headers=conditional).status_code == 200
+
+
+class TestChangeFeed:
+    """Tests for GET /tasks/changes."""
+
+    def test_feed_returns_deltas_and_tombstones(self, client, auth_headers):
+        """Each write shows up once, latest state only, with tombstones for deletes."""
+        start = client.get("/tasks/changes", headers=auth_headers).json()
+        assert start["changes"] == [] and start["has_more"] is False
+
+        a = client.post("/tasks/", json={"title": "A"}, headers=auth_headers).json()["id"]
+        b = client.post("/tasks/", json={"title": "B"}, headers=auth_headers).json()["id"]
+        client.post(f"/tasks/{a}/log-time", json={"minutes": 10}, headers=auth_headers)
+        client.delete(f"/tasks/{b}", headers=auth_headers)
+
+        page = client.get(
+            f"/tasks/changes?since={start['cursor']}", headers=auth_headers
+        ).json()
+        assert [(c["task_id"], c["op"]) for c in page["changes"]] == [(a, "update"), (b, "delete")]
+        assert page["changes"][0]["task"]["total_minutes"] == 10
+        assert page["changes"][1]["task"] is None
+
+        caught_up = client.get(f"/tasks/changes?since={page['cursor']}", headers=auth_headers)
+        assert caught_up.json()["changes"] == []
+
+    def test_feed_batches_are_bounded(self, client, auth_headers):
+        """Large backlogs are delivered in limit-sized batches."""
+        client.post("/tasks/bulk", json={"tasks": [{"title": f"T{i}"} for i in range(5)]},
+                    headers=auth_headers)
+
+        first = client.get("/tasks/changes?limit=3", headers=auth_headers).json()
+        assert len(first["changes"]) == 3 and first["has_more"] is True
+        rest = client.get(
+            f"/tasks/changes?limit=3&since={first['cursor']}", headers=auth_headers
+        ).json()
+        assert len(rest["changes"]) == 2 and rest["has_more"] is False
+        assert client.get("/tasks/changes?since=bogus", headers=auth_headers).status_code == 400
+
+
+class TestTaskStream:
+    """Tests for GET /tasks/stream and the hub behind it."""
+
+    def test_stream_pushes_matching_changes(self, client, auth_headers, test_user, monkeypatch):
+        """Writes reach an open stream; changes outside the filter become removals."""
+        monkeypatch.setattr(hub, "heartbeat", 0.05)
+        body = {}
+
+        def listen():
+            body["text"] = client.get(
+                f"/tasks/stream?assignee_id={test_user.id}", headers=auth_headers
+            ).text
+
+        listener = threading.Thread(target=listen)
+        listener.start()
+        deadline = time.monotonic() + 5
+        while hub.stats()["connections"] == 0 and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+        mine = client.post(
+            "/tasks/", json={"title": "Mine", "assignee_id": test_user.id}, headers=auth_headers
+        ).json()["id"]
+        client.post("/tasks/", json={"title": "Unassigned"}, headers=auth_headers)
+        client.put(f"/tasks/{mine}", json={"assignee_id": None}, headers=auth_headers)
+
+        while hub.stats_counters["delivered"] < 2 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        time.sleep(0.2)  # idle long enough for a heartbeat
+        hub.close()
+        listener.join(timeout=5)
+
+        text = body["text"]
+        assert text.startswith("retry: 3000")
+        assert ": keep-alive" in text
+        assert "event: create" in text and '"title":"Mine"' in text
+        assert "Unassigned" not in text
+        assert "event: remove" in text
+        assert hub.stats()["connections"] == 0
+
+    def test_slow_subscriber_coalesces_then_resets(self):
+        """Repeat changes to one task coalesce; overflowing the buffer forces a reset."""
+        async def scenario():
+            small = TaskStreamHub(MemoryBackend(), buffer_size=2, heartbeat=0.01)
+            small.session_factory = TestAsyncSessionLocal
+            sub = await small.subscribe()
+            task = {"status": "todo", "assignee_id": None}
+            for seq in (1, 2, 3):
+                sub.offer(TaskEvent(seq, 1, "update", task))
+            reset, events = await sub.next_batch(1)
+            assert (reset, [e.seq for e in events]) == (False, [3])
+
+            for seq, task_id in ((4, 1), (5, 2), (6, 3)):
+                sub.offer(TaskEvent(seq, task_id, "update", task))
+            reset, events = await sub.next_batch(1)
+            assert (reset, events) == (True, [])
+            assert small.stats()["events_coalesced_total"] == 2
+            assert small.stats()["events_resets_total"] == 1
+            small.unsubscribe(sub)
+
+        asyncio.run(scenario())
+
+    def test_concurrent_first_subscribers_share_one_pump(self, monkeypatch):
+        """Subscribers connecting together while no pump runs start only one."""
+        async def scenario():
+            fresh = TaskStreamHub(MemoryBackend(), buffer_size=10, heartbeat=0.01)
+            fresh.session_factory = TestAsyncSessionLocal
+            pumps = []
+            run_pump = fresh._run_pump
+
+            def counting_pump(ready):
+                pumps.append(ready)
+                return run_pump(ready)
+
+            monkeypatch.setattr(fresh, "_run_pump", counting_pump)
+            subs = await asyncio.gather(fresh.subscribe(), fresh.subscribe(), fresh.subscribe())
+            assert len(pumps) == 1 and fresh.stats()["connections"] == 3
+            for sub in subs:
+                fresh.unsubscribe(sub)
+
+        asyncio.run(scenario())
+
+    def test_filtered_subscriber_ignores_other_tasks(self, test_user, sample_task):
+        """Only tasks that were inside the filter produce remove/delete events."""
+        async def scenario():
+            fresh = TaskStreamHub(MemoryBackend(), buffer_size=10, heartbeat=0.01)
+            fresh.session_factory = TestAsyncSessionLocal
+            sub = await fresh.subscribe(assignee_id=test_user.id)
+            elsewhere = {"status": "todo", "assignee_id": None}
+            sub.offer(TaskEvent(1, 999, "update", elsewhere))
+            sub.offer(TaskEvent(2, 998, "delete", None))
+            # Already on the board when the client connected, then reassigned
+            sub.offer(TaskEvent(3, sample_task.id, "update", elsewhere))
+            # Arrived through the stream, then deleted
+            sub.offer(TaskEvent(4, 997, "create", {"status": "todo", "assignee_id": test_user.id}))
+            sub.offer(TaskEvent(5, 997, "delete", None))
+
+            reset, events = await sub.next_batch(1)
+            assert not reset
+            assert [(e.task_id, e.op) for e in events] == [
+                (sample_task.id, "remove"), (997, "delete")
+            ]
+            fresh.unsubscribe(sub)
+
+        asyncio.run(scenario())
+
+    def test_polling_backend_sees_other_workers(self, db_session, sample_task):
+        """Feed rows written elsewhere (no local notify) arrive on the next poll."""
+        async def scenario():
+            polling = TaskStreamHub(PollingBackend(0.05), buffer_size=10, heartbeat=0.01)
+            polling.session_factory = TestAsyncSessionLocal
+            sub = await polling.subscribe()
+
+            db_session.add(TaskChange(task_id=sample_task.id, op="update"))
+            db_session.commit()
+
+            batch = None
+            for _ in range(50):
+                batch = await sub.next_batch(0.1)
+                if batch:
+                    break
+            assert [e.task_id for e in batch[1]] == [sample_task.id]
+            polling.unsubscribe(sub)
+
+        asyncio.run(scenario())
+
+
+class TestTaskExport:
+    """Tests for GET /tasks/export."""
+
+    def test_ndjson_export_applies_filters(self, client, auth_headers, test_user, monkeypatch):
+        """Every matching task is streamed across several fetch batches."""
+        monkeypatch.setattr(task_export, "EXPORT_BATCH", 2)
+        tasks = [{"title": f"T{i}", "assignee_id": test_user.id} for i in range(5)]
+        client.post("/tasks/bulk", json={"tasks": tasks + [{"title": "Other"}]},
+                    headers=auth_headers)
+
+        response = client.get(f"/tasks/export?assignee_id={test_user.id}", headers=auth_headers)
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        rows = [json.loads(line) for line in response.text.splitlines()]
+        assert [r["title"] for r in rows] == [f"T{i}" for i in range(5)]
+        assert rows[0]["status"] == "todo"
+        assert set(rows[0]) == set(task_export.EXPORT_FIELDS)
+
+    def test_csv_export(self, client, auth_headers):
+        """CSV has a header row and quotes values that need it."""
+        client.post("/tasks/", json={"title": "Fix, then ship", "description": "line1\nline2"},
+                    headers=auth_headers)
+
+        response = client.get("/tasks/export?format=csv&status=todo", headers=auth_headers)
+        assert response.status_code == 200
+        assert "tasks.csv" in response.headers["content-disposition"]
+        rows = list(csv.DictReader(io.StringIO(response.text)))
+        assert len(rows) == 1
+        assert rows[0]["title"] == "Fix, then ship"
+        assert rows[0]["description"] == "line1\nline2"
+
+        empty = client.get("/tasks/export?format=csv&status=done", headers=auth_headers)
+        assert empty.text.strip() == ",".join(task_export.EXPORT_FIELDS)
+
+
+class TestTaskImport:
+    """Tests for POST /tasks/import."""
+
+    CSV = (
+        "task,estimated_hours,actual_hours,notes,assignee,status\n"
+        "Project Setup,0.5,0.3,Git init + scaffold,testuser,done\n"
+        ",1.0,1.0,no title,,\n"
+        "Auth,1.5,abc,bad hours,,\n"
+        "Ghost work,1,1,,nobody,\n"
+        '"Models, schema",1.5,0.8,"SQLAlchemy models\nand seed",,\n'
+    )
+
+    def _upload(self, client, auth_headers, body):
+        files = {"file": ("estimates.csv", body.encode(), "text/csv")}
+        return client.post("/tasks/import", files=files, headers=auth_headers)
+
+    def test_import_reports_row_errors(self, client, auth_headers, test_user, db_session,
+                                       monkeypatch):
+        """Valid rows are imported across batches; bad rows are reported by line."""
+        monkeypatch.setattr(task_import, "IMPORT_BATCH", 1)
+        response = self._upload(client, auth_headers, self.CSV)
+        assert response.status_code == 200
+        data = response.json()
+        assert data["created"] == 2 and data["failed"] == 3
+        assert [e["line"] for e in data["errors"]] == [3, 4, 5]
+        assert "nobody" in data["errors"][2]["error"]
+
+        tasks = {t["title"]: t for t in client.get("/tasks/", headers=auth_headers).json()["tasks"]}
+        setup = tasks["Project Setup"]
+        assert setup["status"] == "done" and setup["total_minutes"] == 18
+        assert setup["assignee_id"] == test_user.id
+        assert tasks["Models, schema"]["description"] == "SQLAlchemy models\nand seed"
+
+        # Imports feed the ledger, status history and change feed like any other write
+        assert db_session.scalar(select(func.sum(TimeEntry.minutes))) == 18 + 48
+        assert db_session.scalar(select(func.count()).select_from(TaskStatusEvent)) == 2
+        changes = client.get("/tasks/changes", headers=auth_headers).json()["changes"]
+        assert [c["op"] for c in changes] == ["create", "create"]
+
+    def test_import_rejects_out_of_range_hours(self, client, auth_headers):
+        """Infinite or huge hours are row errors, not a 500 halfway through."""
+        response = self._upload(client, auth_headers, (
+            "task,actual_hours\n"
+            "Forever,inf\n"
+            "Huge,1e30\n"
+            "Fine,2\n"
+        ))
+        assert response.status_code == 200
+        data = response.json()
+        assert data["created"] == 1 and data["failed"] == 2
+        assert [e["line"] for e in data["errors"]] == [2, 3]
+        assert "finite" in data["errors"][0]["error"]
+        assert "at most" in data["errors"][1]["error"]
+
+    def test_import_rejects_files_without_task_column(self, client, auth_headers):
+        response = self._upload(client, auth_headers, "title,hours\nA,1\n")
+        assert response.status_code == 400
+
+
+class TestIdempotency:
+    """Tests for the Idempotency-Key header on task writes."""
+
+    def test_retried_create_returns_original(self, client, auth_headers):
+        """A retry with the same key replays the response instead of creating a task."""
+        headers = {**auth_headers, "Idempotency-Key": "create-1"}
+        first = client.post("/tasks/", json={"title": "Once"}, headers=headers)
+        retry = client.post("/tasks/", json={"title": "Once"}, headers=headers)
+
+        assert first.status_code == retry.status_code == 201
+        assert retry.json() == first.json()
+        assert retry.headers["idempotent-replayed"] == "true"
+        assert client.get("/tasks/", headers=auth_headers).json()["total"] == 1
+
+        reused = client.post("/tasks/", json={"title": "Other"}, headers=headers)
+        assert reused.status_code == 422
+        fresh = client.post("/tasks/", json={"title": "Once"},
+                            headers={**auth_headers, "Idempotency-Key": "create-2"})
+        assert fresh.json()["id"] != first.json()["id"]
+
+    def test_retried_log_time_counts_once(self, client, auth_headers, sample_task):
+        headers = {**auth_headers, "Idempotency-Key": "log-1"}
+        replays = client.get("/metrics").json()["idempotency"]["replays_total"]
+        for _ in range(3):
+            response = client.post(
+                f"/tasks/{sample_task.id}/log-time", json={"minutes": 15}, headers=headers
+            )
+            assert response.json()["total_minutes"] == 15
+
+        # Failures are not stored: the key stays usable for a retry
+        missing = client.post("/tasks/999/log-time", json={"minutes": 5},
+                              headers={**auth_headers, "Idempotency-Key": "log-2"})
+        assert missing.status_code == 404
+        stats = client.get("/metrics").json()["idempotency"]
+        assert stats["replays_total"] == replays + 2
+        assert stats["size"] == 1 and stats["in_flight"] == 0
+
+    def test_in_flight_duplicate_waits_for_original(self):
+        """A concurrent retry gets the first request's response, not a second run."""
+        store = IdempotencyStore(maxsize=1, ttl=60, max_body_bytes=10, wait_timeout=5)
+
+        async def scenario():
+            assert await store.begin("k", "fp") is None
+            retry = asyncio.create_task(store.begin("k", "fp"))
+            await asyncio.sleep(0.01)
+            assert not retry.done() and store.stats()["waits_total"] == 1
+            store.finish("k", Response(content=b"{}", status_code=201))
+            return await retry
+
+        stored = asyncio.run(scenario())
+        assert stored.status_code == 201 and stored.body == b"{}"
+
+        # Bounded: oversized bodies are skipped, the LRU evicts past maxsize
+        asyncio.run(store.begin("big", "fp"))
+        store.finish("big", Response(content=b"x" * 11))
+        asyncio.run(store.begin("k2", "fp"))
+        store.finish("k2", Response(content=b"{}"))
+        stats = store.stats()
+        assert stats["not_stored_too_large_total"] == 1
+        assert stats["evictions_total"] == 1 and stats["size"] == 1
+
@@ -0,0 +1,79 @@
+"""Unit tests for user management and the cached auth principal."""
+
+
+class TestPrincipalCache:
+    """The authenticated user is cached, but user writes invalidate it."""
+
+    def test_update_user_refreshes_principal(self, client, auth_headers, test_user):
+        """Renaming yourself is visible on the very next authenticated call."""
+        assert client.get("/auth/me", headers=auth_headers).json()["username"] == "testuser"
+
+        response = client.put(
+            f"/users/{test_user.id}",
+            json={"username": "renamed"},
+            headers=auth_headers,
+        )
+        assert response.status_code == 200
+
+        response = client.get("/auth/me", headers=auth_headers)
+        assert response.json()["username"] == "renamed"
+
+    def test_deleted_user_token_rejected(self, client, auth_headers, admin_headers, test_user):
+        """Deleting a user evicts their cached principal, so the token stops working."""
+        assert client.get("/auth/me", headers=auth_headers).status_code == 200
+
+        response = client.delete(f"/users/{test_user.id}", headers=admin_headers)
+        assert response.status_code == 204
+
+        assert client.get("/auth/me", headers=auth_headers).status_code == 401
+
+    def test_cached_principal_skips_lookup(self, client, auth_headers, db_session, test_user):
+        """A warm principal is served without reading the users table."""
+        assert client.get("/auth/me", headers=auth_headers).status_code == 200
+
+        # Change the row behind the cache's back — the snapshot is still served.
+        test_user.email = "changed@example.com"
+        db_session.commit()
+
+        response = client.get("/auth/me", headers=auth_headers)
+        assert response.json()["email"] == "test@example.com"
+
+
+class TestUserDirectoryETag:
+    """Tests for conditional GETs on /users/directory."""
+
+    def test_directory_not_modified_until_users_change(
+        self, client, auth_headers, admin_headers, test_user
+    ):
+        """Unchanged polls get 304; renaming a user produces a new tag."""
+        etag = client.get("/users/directory", headers=auth_headers).headers["etag"]
+        conditional = {**auth_headers, "If-None-Match": etag}
+        assert client.get("/users/directory", headers=conditional).status_code == 304
+
+        client.put(f"/users/{test_user.id}", json={"username": "renamed"}, headers=admin_headers)
+        response = client.get("/users/directory", headers=conditional)
+        assert response.status_code == 200
+        assert "renamed" in [u["username"] for u in response.json()]
+
+
+class TestDeleteUser:
+    """Deleting a user is visible to task caches and sync clients."""
+
+    def test_unassigned_tasks_reach_change_feed(self, client, admin_headers, test_user):
+        """Tasks unassigned by the delete get a feed row and a new list ETag."""
+        task = client.post(
+            "/tasks/", json={"title": "Owned", "assignee_id": test_user.id}, headers=admin_headers
+        ).json()
+        listed = client.get("/tasks/", headers=admin_headers)
+        cursor = client.get("/tasks/changes", headers=admin_headers).json()["cursor"]
+
+        assert client.delete(f"/users/{test_user.id}", headers=admin_headers).status_code == 204
+
+        again = client.get(
+            "/tasks/", headers={**admin_headers, "If-None-Match": listed.headers["etag"]}
+        )
+        assert again.status_code == 200
+        assert again.json()["tasks"][0]["assignee_id"] is None
+        changes = client.get(f"/tasks/changes?since={cursor}", headers=admin_headers).json()
+        assert [(c["task_id"], c["op"]) for c in changes["changes"]] == [(task["id"], "update")]
+        assert changes["changes"][0]["task"]["assignee_id"] is None